@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""主屏像素通道基准：luma 默认路径 vs NumPy RGB565 快速通道（不需要硬件）。
+
+用法：
+  python scripts/bench_lcd_rgb565.py [--frames 50]
+
+两条路径都只计「像素转换 + 按 spidev 的调用方式切块」的 CPU 时间，SPI 写出用空操作代替：
+- luma：image.convert("RGB").tobytes() → list → 每 4096 字节切一次 list 交给 writebytes
+- rgb565：to_rgb565() 一次向量化转换 → memoryview 整块交给 writebytes2
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 便于未安装时从项目根运行
+root = Path(__file__).resolve().parents[1]
+src = root / "src"
+if src.is_dir() and str(src) not in sys.path:
+    sys.path.insert(0, str(src))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+from rascode.hardware.display.rgb565 import rgb565_available, to_rgb565, window_bytes  # noqa: E402
+
+WIDTH, HEIGHT = 240, 320
+TRANSFER_SIZE = 4096  # luma spi 默认 transfer_size
+
+
+def _make_frame(i: int) -> Image.Image:
+    img = Image.new("RGB", (WIDTH, HEIGHT), "black")
+    draw = ImageDraw.Draw(img)
+    for row in range(20):
+        draw.text((0, row * 14), f"line {row:02d} frame {i:05d}", fill="white")
+    draw.rectangle((0, 300, (i * 7) % WIDTH, 319), fill=(0, 128, 255))
+    return img
+
+
+def _luma_path(img: Image.Image) -> int:
+    data = list(img.convert("RGB").tobytes())
+    n = 0
+    for i in range(0, len(data), TRANSFER_SIZE):
+        n += len(data[i : i + TRANSFER_SIZE])
+    return n
+
+
+def _rgb565_path(img: Image.Image) -> int:
+    payload = window_bytes(to_rgb565(img), (0, 0, WIDTH, HEIGHT))
+    return len(payload[:])
+
+
+def _bench(name: str, fn, frames: list[Image.Image]) -> float:
+    fn(frames[0])  # 预热
+    start = time.perf_counter()
+    total = 0
+    for img in frames:
+        total += fn(img)
+    elapsed = time.perf_counter() - start
+    per_frame_ms = elapsed * 1000 / len(frames)
+    print(f"{name:<8} {per_frame_ms:8.2f} ms/frame  {total // len(frames):7d} bytes/frame")
+    return per_frame_ms
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=50)
+    args = parser.parse_args()
+
+    frames = [_make_frame(i) for i in range(args.frames)]
+    luma_ms = _bench("luma", _luma_path, frames)
+    if not rgb565_available():
+        print("未安装 numpy，跳过 rgb565 路径。", file=sys.stderr)
+        return 1
+    fast_ms = _bench("rgb565", _rgb565_path, frames)
+    print(f"speedup  {luma_ms / fast_ms:8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
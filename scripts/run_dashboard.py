@@ -1,32 +1,97 @@
-"""仅双 OLED 仪表盘：左屏系统状态，右屏时间与网络。
+"""仅双 OLED 仪表盘：左屏系统状态与 CPU 趋势，右屏时间、网络与接口速率。
 
 前提：I²C 已开启，已安装 luma.oled；HAT 双 OLED 地址 0x3C / 0x3D。
+若显示守护进程（python -m rascode.daemon）在运行，则经守护进程写屏，不直接占用设备。
+各数据按自己的周期刷新并对齐到整秒（见 rascode.services.scheduler），屏幕只在数据变化时重画。
+数据持续平稳时自动降低刷新频率，空闲超时后调暗 OLED（环境变量见 run_triple_screen.py）。
 """
 
 from __future__ import annotations
 
-import time
+from typing import Any, Mapping
 
-from rascode.hardware.display import DualOledDisplay, OledDisplayId
-from rascode.services import SystemMonitor
-from rascode.services.monitoring import format_stats_for_oled
-from rascode.services.network_info import collect_network_info, format_time_network_for_oled
+from rascode import display_backend
+from rascode.hardware.display import OledDisplayId, ScreenCompositor, create_oled_display
+from rascode.panels import (
+    clock_source,
+    dashboard_adaptive,
+    network_layout,
+    stats_layout,
+    update_network_layout,
+    update_stats_layout,
+)
+from rascode.services import MetricsCollector, SystemMonitor
+from rascode.services.monitoring import format_stats_for_oled, significant_stats_change
+from rascode.services.network_info import (
+    InterfaceRateTracker,
+    format_rates_for_oled,
+    format_time_network_for_oled,
+    significant_rates_change,
+)
+from rascode.services.network_watch import shared_network_watcher
+from rascode.services.scheduler import DashboardScheduler, Screen, Source, quiet_change
+
+_RIGHT_INPUTS = ("time", "net", "rates")
+
+
+def _left_lines(v: Mapping[str, Any]) -> list[str]:
+    return format_stats_for_oled(v["stats"])
+
+
+def _right_lines(v: Mapping[str, Any]) -> list[str]:
+    # TIME/IP/IF 三行之下按流量列出最多 3 个接口的收发速率
+    return format_time_network_for_oled(v["net"], v["time"]) + format_rates_for_oled(v["rates"])
 
 
 def main() -> None:
     monitor = SystemMonitor()
-    display = DualOledDisplay()
+    collector = MetricsCollector(capacity=128)
+    tracker = InterfaceRateTracker()
+    sources = [
+        clock_source(),
+        Source("stats", 2.0, monitor.collect, significant=significant_stats_change),
+        Source("history", 1.0, collector.sample_once, significant=quiet_change),
+        # 网络状态由 netlink 事件驱动刷新，这里只读缓存
+        Source("net", 1.0, shared_network_watcher().info),
+        Source("rates", 2.0, tracker.sample, significant=significant_rates_change),
+    ]
+
+    if display_backend.daemon_available():
+        # 守护进程持有设备时，本进程只负责采集与格式化
+        show_left, show_right = display_backend.show_left_oled, display_backend.show_right_oled
+        screens = [
+            Screen("left", ("stats",), lambda v: show_left(_left_lines(v))),
+            Screen("right", _RIGHT_INPUTS, lambda v: show_right(_right_lines(v))),
+        ]
+        DashboardScheduler(sources, screens, adaptive=dashboard_adaptive()).run()
+        return
+
+    display = create_oled_display()
     display.init()
+    compositor = ScreenCompositor(oled=display)
+    # 版面只重画变化的行，并把脏区直接交给页段写入；左屏 4 行文本之下画最近 128 秒 CPU 使用率
+    left = stats_layout(collector.series["cpu"])
+    right = network_layout()
+
+    def draw_left(v: Mapping[str, Any]) -> None:
+        update_stats_layout(left, v["stats"], v["history"])
+        compositor.stage_oled_frame(OledDisplayId.LEFT, *left.compose())
 
+    def draw_right(v: Mapping[str, Any]) -> None:
+        update_network_layout(right, v["net"], v["time"], v["rates"])
+        compositor.stage_oled_frame(OledDisplayId.RIGHT, *right.compose())
+
+    screens = [
+        Screen("left", ("stats", "history"), draw_left),
+        Screen("right", _RIGHT_INPUTS, draw_right),
+    ]
     try:
-        while True:
-            display.show_lines(OledDisplayId.LEFT, format_stats_for_oled(monitor.collect()))
-            display.show_lines(OledDisplayId.RIGHT, format_time_network_for_oled(collect_network_info()))
-            time.sleep(1.0)
-    except KeyboardInterrupt:
+        adaptive = dashboard_adaptive(display)
+        DashboardScheduler(sources, screens, compositor.commit, adaptive=adaptive).run()
+    finally:
+        compositor.close()
         display.shutdown()
 
 
 if __name__ == "__main__":
     main()
-
@@ -6,14 +6,26 @@
 from __future__ import annotations
 
 import sys
-import time
 from datetime import datetime
 
-from rascode.hardware.display import LcdHatMainDisplay
+from rascode.hardware.display import create_main_display
+from rascode.services.scheduler import DashboardScheduler, Screen, Source
+
+
+def _lines(now: datetime) -> list[str]:
+    return [
+        "Rascode Main LCD",
+        "----------------",
+        "",
+        now.strftime("  %Y-%m-%d"),
+        now.strftime("  %H:%M:%S"),
+        "",
+        "Ctrl+C exit",
+    ]
 
 
 def main() -> None:
-    lcd = LcdHatMainDisplay()
+    lcd = create_main_display()
     try:
         lcd.init()
     except RuntimeError as e:
@@ -23,23 +35,13 @@ def main() -> None:
             sys.exit(1)
         raise
 
+    # 对齐整秒刷新，时钟不漂移、不跳秒
+    scheduler = DashboardScheduler(
+        [Source("time", 1.0, datetime.now)],
+        [Screen("main", ("time",), lambda v: lcd.show_lines(_lines(v["time"])))],
+    )
     try:
-        while True:
-            now = datetime.now()
-            lcd.show_lines(
-                [
-                    "Rascode Main LCD",
-                    "----------------",
-                    "",
-                    now.strftime("  %Y-%m-%d"),
-                    now.strftime("  %H:%M:%S"),
-                    "",
-                    "Ctrl+C exit",
-                ]
-            )
-            time.sleep(1.0)
-    except KeyboardInterrupt:
-        pass
+        scheduler.run()
     finally:
         lcd.shutdown()
 
@@ -1,32 +1,101 @@
-"""三联屏仪表盘：主 LCD 显示标题，左 OLED 系统状态，右 OLED 时间与网络。
+"""三联屏仪表盘：主 LCD 标题与 CPU/内存趋势，左 OLED 系统状态，右 OLED 时间、网络与接口速率。
 
 前提：已开启 SPI 与 I²C，并安装 luma.oled、luma.lcd、spidev 及 rpi-lgpio（或 RPi.GPIO）。无需 root。
 主屏花屏时可仅用双 OLED：RASCODE_DISABLE_MAIN_LCD=1 python scripts/run_triple_screen.py
+若显示守护进程（python -m rascode.daemon）在运行，则只采集数据并经守护进程写屏，不直接占用设备。
+无硬件时可用虚拟屏运行与剖析：RASCODE_DISPLAY_BACKEND=virtual python scripts/run_triple_screen.py
+各数据按自己的周期刷新并对齐到整秒（见 rascode.services.scheduler），屏幕只在数据变化时重画。
+数据持续平稳时自动降低刷新频率，MCP 写屏或指标明显变化时恢复；RASCODE_DASHBOARD_ADAPTIVE=0 关闭，
+RASCODE_OLED_DIM_AFTER / RASCODE_OLED_BLANK_AFTER 设置空闲多少秒后调暗 / 关闭 OLED。
 """
 
 from __future__ import annotations
 
 import os
 import sys
-import time
+from typing import Any, Mapping
 
-from rascode.hardware.display import DualOledDisplay, OledDisplayId, LcdHatMainDisplay
-from rascode.services import SystemMonitor
-from rascode.services.monitoring import format_stats_for_oled
-from rascode.services.network_info import collect_network_info, format_time_network_for_oled
+from rascode import display_backend
+from rascode.hardware.display import (
+    OledDisplayId,
+    ScreenCompositor,
+    create_main_display,
+    create_oled_display,
+)
+from rascode.panels import (
+    clock_source,
+    dashboard_adaptive,
+    main_layout,
+    network_layout,
+    stats_layout,
+    update_main_layout,
+    update_network_layout,
+    update_stats_layout,
+)
+from rascode.services import MetricsCollector, SystemMonitor
+from rascode.services.monitoring import (
+    ProcessCpuMeter,
+    format_stats_for_oled,
+    significant_stats_change,
+)
+from rascode.services.network_info import (
+    InterfaceRateTracker,
+    format_rates_for_oled,
+    format_time_network_for_oled,
+    significant_rates_change,
+)
+from rascode.services.network_watch import shared_network_watcher
+from rascode.services.scheduler import DashboardScheduler, Screen, Source, quiet_change
+
+_RIGHT_INPUTS = ("time", "net", "rates")
 
 
 def _main_lcd_disabled() -> bool:
     return os.environ.get("RASCODE_DISABLE_MAIN_LCD", "").strip() in ("1", "true", "yes")
 
 
+def _left_lines(v: Mapping[str, Any]) -> list[str]:
+    return format_stats_for_oled(v["stats"])
+
+
+def _right_lines(v: Mapping[str, Any]) -> list[str]:
+    # TIME/IP/IF 三行之下按流量列出最多 3 个接口的收发速率
+    return format_time_network_for_oled(v["net"], v["time"]) + format_rates_for_oled(v["rates"])
+
+
+def _run_as_client(sources: list[Source]) -> None:
+    """守护进程持有设备时，本进程只负责采集与格式化。"""
+    print("检测到显示守护进程，以客户端方式运行。", file=sys.stderr)
+    display_backend.show_main_text(["Rascode Dashboard", ""])
+    show_left, show_right = display_backend.show_left_oled, display_backend.show_right_oled
+    screens = [
+        Screen("left", ("stats",), lambda v: show_left(_left_lines(v))),
+        Screen("right", _RIGHT_INPUTS, lambda v: show_right(_right_lines(v))),
+    ]
+    DashboardScheduler(sources, screens, adaptive=dashboard_adaptive()).run()
+
+
 def main() -> None:
-    oled = DualOledDisplay()
     monitor = SystemMonitor()
+    collector = MetricsCollector(capacity=240)
+    tracker = InterfaceRateTracker()
+    # 时间、历史曲线每秒刷新；系统状态与接口速率每 2 秒；网络状态读 netlink 驱动的缓存
+    sources = [
+        clock_source(),
+        Source("stats", 2.0, monitor.collect, significant=significant_stats_change),
+        Source("history", 1.0, collector.sample_once, significant=quiet_change),
+        Source("net", 1.0, shared_network_watcher().info),
+        Source("rates", 2.0, tracker.sample, significant=significant_rates_change),
+    ]
+    if display_backend.daemon_available():
+        _run_as_client(sources)
+        return
+
+    oled = create_oled_display()
     lcd = None
 
     if not _main_lcd_disabled():
-        lcd = LcdHatMainDisplay()
+        lcd = create_main_display()
         try:
             lcd.init()
         except RuntimeError as e:
@@ -39,19 +108,40 @@ def main() -> None:
         print("主屏已禁用，仅运行双 OLED 仪表盘。", file=sys.stderr)
 
     oled.init()
+    # 三块屏渲染后一次提交：主屏走 SPI、双 OLED 走 I²C，两条总线并行
+    compositor = ScreenCompositor(lcd, oled)
+    # 各屏由版面组成：只重画变化的小部件，脏区直接交给局部刷新，不再整帧比对
+    left = stats_layout()
+    right = network_layout()
+
+    def draw_left(v: Mapping[str, Any]) -> None:
+        update_stats_layout(left, v["stats"])
+        compositor.stage_oled_frame(OledDisplayId.LEFT, *left.compose())
+
+    def draw_right(v: Mapping[str, Any]) -> None:
+        update_network_layout(right, v["net"], v["time"], v["rates"])
+        compositor.stage_oled_frame(OledDisplayId.RIGHT, *right.compose())
+
+    screens = [
+        Screen("left", ("stats",), draw_left),
+        Screen("right", _RIGHT_INPUTS, draw_right),
+    ]
+    if lcd is not None:
+        main_view = main_layout(collector)
+        # 主屏右下角显示仪表盘进程自身的 CPU 占用（10 秒平均）
+        sources.append(Source("self", 10.0, ProcessCpuMeter().sample, significant=quiet_change))
+
+        def draw_main(v: Mapping[str, Any]) -> None:
+            update_main_layout(main_view, collector, v["stats"], v["history"], v["self"])
+            compositor.stage_main_frame(*main_view.compose())
+
+        screens.append(Screen("main", ("history", "stats", "self"), draw_main))
 
     try:
-        while True:
-            if lcd is not None:
-                lcd.show_lines(["Rascode Dashboard", ""])
-            stats = monitor.collect()
-            oled.show_lines(OledDisplayId.LEFT, format_stats_for_oled(stats))
-            net = collect_network_info()
-            oled.show_lines(OledDisplayId.RIGHT, format_time_network_for_oled(net))
-            time.sleep(1.0)
-    except KeyboardInterrupt:
-        pass
+        adaptive = dashboard_adaptive(oled)
+        DashboardScheduler(sources, screens, compositor.commit, adaptive=adaptive).run()
     finally:
+        compositor.close()
         if lcd is not None:
             lcd.shutdown()
         oled.shutdown()
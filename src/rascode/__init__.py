@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-from importlib import metadata
-
 
 def get_version() -> str:
     """返回当前包版本。"""
+    from importlib import metadata  # 延迟导入，避免拖慢 MCP 服务启动
+
     try:
         return metadata.version("rascode")
     except metadata.PackageNotFoundError:
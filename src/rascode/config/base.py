@@ -26,6 +26,7 @@ class AppConfig:
     env: AppEnvironment
     log_level: str
     project_root: Path
+    display_backend: str = "hardware"  # hardware：真实 SPI/I²C；virtual：内存中的虚拟屏
 
 
 def _detect_env() -> AppEnvironment:
@@ -48,5 +49,13 @@ def load_config() -> AppConfig:
     env = _detect_env()
     log_level = os.getenv("RASCODE_LOG_LEVEL", "INFO")
     project_root = Path(__file__).resolve().parents[3]
-    return AppConfig(env=env, log_level=log_level, project_root=project_root)
+    display_backend = os.getenv("RASCODE_DISPLAY_BACKEND", "hardware").strip().lower()
+    if display_backend not in {"hardware", "virtual"}:
+        display_backend = "hardware"
+    return AppConfig(
+        env=env,
+        log_level=log_level,
+        project_root=project_root,
+        display_backend=display_backend,
+    )
 
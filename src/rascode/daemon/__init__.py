@@ -0,0 +1,6 @@
+"""显示守护进程：常驻持有三联屏设备，经本地 Unix 套接字提供渲染命令。"""
+
+from .client import DisplayClient, default_socket_path
+from .server import DisplayDaemon
+
+__all__ = ["DisplayClient", "DisplayDaemon", "default_socket_path"]
@@ -0,0 +1,5 @@
+"""python -m rascode.daemon 入口。"""
+
+from .server import main
+
+main()
@@ -0,0 +1,118 @@
+"""显示守护进程客户端：display_backend、MCP 服务与仪表盘脚本通过它访问屏幕。"""
+
+from __future__ import annotations
+
+import os
+import socket
+import threading
+from pathlib import Path
+from typing import Optional
+
+from .protocol import (
+    Opcode,
+    ProtocolError,
+    Screen,
+    ScreenName,
+    encode,
+    encode_batch,
+    encode_lines,
+    read_frame,
+    screen_from_name,
+)
+
+
+def default_socket_path() -> Path:
+    """守护进程套接字路径：RASCODE_DISPLAY_SOCKET > $XDG_RUNTIME_DIR > /tmp。"""
+    env = os.environ.get("RASCODE_DISPLAY_SOCKET", "").strip()
+    if env:
+        return Path(env)
+    runtime = os.environ.get("XDG_RUNTIME_DIR", "").strip()
+    base = Path(runtime) if runtime else Path("/tmp")
+    return base / "rascode-display.sock"
+
+
+class DisplayClient:
+    """到守护进程的长连接；线程安全，连接断开后下次调用自动重连。"""
+
+    def __init__(self, socket_path: Optional[Path] = None, timeout: float = 10.0) -> None:
+        self._path = Path(socket_path) if socket_path is not None else default_socket_path()
+        self._timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+
+    @property
+    def socket_path(self) -> Path:
+        return self._path
+
+    def probe(self) -> bool:
+        """能否连上守护进程（已连接时直接返回 True）；套接字文件残留而守护进程已退出时为 False。"""
+        with self._lock:
+            try:
+                self._connect()
+                return True
+            except OSError:
+                return False
+
+    def ping(self) -> str:
+        return self.request(Opcode.PING)
+
+    def show_lines(self, screen: ScreenName, lines: list[str]) -> str:
+        return self.request(Opcode.SHOW_LINES, screen_from_name(screen), encode_lines(lines))
+
+    def show_screens(self, screens: dict[str, list[str]]) -> str:
+        """一次请求刷新多块屏（main/left/right 的任意子集）。"""
+        payload = encode_batch({screen_from_name(k): v for k, v in screens.items()})
+        return self.request(Opcode.BATCH, Screen.ALL, payload)
+
+    def timings(self, reset: bool = False) -> str:
+        """守护进程内的分阶段耗时报告。"""
+        return self.request(Opcode.TIMINGS, Screen.ALL, b"\x01" if reset else b"")
+
+    def clear(self, screen: ScreenName) -> str:
+        return self.request(Opcode.CLEAR, screen_from_name(screen))
+
+    def restore_dashboard(self) -> str:
+        return self.request(Opcode.RESTORE)
+
+    def request(self, opcode: Opcode, screen: Screen = Screen.ALL, payload: bytes = b"") -> str:
+        """发送一个请求并返回守护进程的结果字符串；协议/连接错误抛出 ProtocolError。"""
+        frame = encode(opcode, screen, payload)
+        with self._lock:
+            for attempt in (0, 1):
+                try:
+                    sock = self._connect()
+                    sock.sendall(frame)
+                    op, _, body = read_frame(sock)
+                    break
+                except (OSError, EOFError, ProtocolError) as e:
+                    self._close_locked()
+                    # 守护进程重启后旧连接失效，重连一次
+                    if attempt == 1:
+                        raise ProtocolError(f"守护进程通信失败: {e}") from e
+        text = body.decode("utf-8", errors="replace")
+        if op == Opcode.ERROR:
+            raise ProtocolError(text)
+        return text
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+
+    def _connect(self) -> socket.socket:
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self._timeout)
+            try:
+                sock.connect(str(self._path))
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+        return self._sock
+
+    def _close_locked(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
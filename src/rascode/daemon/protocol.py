@@ -0,0 +1,132 @@
+"""显示守护进程的本地 IPC 协议：定长头 + 负载的紧凑二进制帧。
+
+帧格式（网络字节序）::
+
+    magic(2s) = b"RC" | opcode(B) | screen(B) | length(I) | payload(length 字节)
+
+请求的负载按操作码解释（文本行为 UTF-8、以 "\\n" 分隔；BATCH 为若干
+``screen(B) | length(I) | 文本行`` 段依次拼接）；响应统一使用
+RESULT（负载为后端返回的字符串，如 "ok"）或 ERROR（负载为错误说明）。
+"""
+
+from __future__ import annotations
+
+import socket
+import struct
+from enum import IntEnum
+from typing import Literal
+
+MAGIC = b"RC"
+HEADER = struct.Struct("!2sBBI")
+BATCH_SECTION = struct.Struct("!BI")
+MAX_PAYLOAD = 64 * 1024
+
+
+class Opcode(IntEnum):
+    """请求与响应操作码。"""
+
+    PING = 0x01
+    SHOW_LINES = 0x02
+    CLEAR = 0x03
+    RESTORE = 0x04
+    BATCH = 0x05
+    TIMINGS = 0x06  # 负载为 b"\x01" 时读取后清零
+    RESULT = 0x80
+    ERROR = 0x81
+
+
+class Screen(IntEnum):
+    """目标屏幕编码。"""
+
+    MAIN = 0
+    LEFT = 1
+    RIGHT = 2
+    ALL = 3
+
+
+ScreenName = Literal["main", "left", "right", "all"]
+
+
+class ProtocolError(RuntimeError):
+    """帧格式错误或连接中断。"""
+
+
+def screen_from_name(name: str) -> Screen:
+    try:
+        return Screen[name.upper()]
+    except KeyError:
+        raise ProtocolError(f"未知屏幕: {name}") from None
+
+
+def encode(opcode: Opcode, screen: Screen = Screen.ALL, payload: bytes = b"") -> bytes:
+    """编码一帧。"""
+    if len(payload) > MAX_PAYLOAD:
+        raise ProtocolError(f"负载过大: {len(payload)} > {MAX_PAYLOAD}")
+    return HEADER.pack(MAGIC, int(opcode), int(screen), len(payload)) + payload
+
+
+def encode_lines(lines: list[str]) -> bytes:
+    return "\n".join(line.replace("\n", " ") for line in lines).encode("utf-8")
+
+
+def decode_lines(payload: bytes) -> list[str]:
+    if not payload:
+        return []
+    return payload.decode("utf-8").split("\n")
+
+
+def encode_batch(screens: dict[Screen, list[str]]) -> bytes:
+    """编码 BATCH 负载：每块屏一段。"""
+    parts = []
+    for screen, lines in screens.items():
+        body = encode_lines(lines)
+        parts.append(BATCH_SECTION.pack(int(screen), len(body)) + body)
+    return b"".join(parts)
+
+
+def decode_batch(payload: bytes) -> dict[Screen, list[str]]:
+    screens: dict[Screen, list[str]] = {}
+    offset = 0
+    while offset < len(payload):
+        if offset + BATCH_SECTION.size > len(payload):
+            raise ProtocolError("BATCH 段头不完整")
+        code, length = BATCH_SECTION.unpack_from(payload, offset)
+        offset += BATCH_SECTION.size
+        if offset + length > len(payload):
+            raise ProtocolError("BATCH 段长度越界")
+        try:
+            screen = Screen(code)
+        except ValueError as e:
+            raise ProtocolError(str(e)) from None
+        screens[screen] = decode_lines(payload[offset : offset + length])
+        offset += length
+    return screens
+
+
+def read_frame(sock: socket.socket) -> tuple[Opcode, Screen, bytes]:
+    """读取一帧；对端关闭连接时抛出 EOFError。"""
+    header = _recv_exact(sock, HEADER.size, allow_eof=True)
+    magic, opcode, screen, length = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ProtocolError("魔数不匹配")
+    if length > MAX_PAYLOAD:
+        raise ProtocolError(f"负载过大: {length}")
+    try:
+        op, scr = Opcode(opcode), Screen(screen)
+    except ValueError as e:
+        raise ProtocolError(str(e)) from None
+    return op, scr, _recv_exact(sock, length) if length else b""
+
+
+def _recv_exact(sock: socket.socket, n: int, allow_eof: bool = False) -> bytes:
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        r = sock.recv_into(view[got:], n - got)
+        if r == 0:
+            if allow_eof and got == 0:
+                raise EOFError
+            raise ProtocolError("连接在帧中途关闭")
+        got += r
+    return bytes(buf)
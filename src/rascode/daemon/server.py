@@ -0,0 +1,172 @@
+"""显示守护进程：常驻持有三联屏设备，经 Unix 套接字为 MCP 服务与仪表盘提供渲染命令。
+
+设备只在守护进程启动时初始化一次（含 LCD 复位等待与双清屏），之后所有客户端的
+请求都跳过初始化；所有写屏请求经 display_backend 的命令队列串行执行（同屏更新合并），
+多个进程不再争用同一块屏。
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Optional
+
+from rascode import display_backend
+from rascode.utils.logging import get_logger
+
+from .client import default_socket_path
+from .protocol import (
+    Opcode,
+    ProtocolError,
+    Screen,
+    decode_batch,
+    decode_lines,
+    encode,
+    read_frame,
+)
+
+logger = get_logger("rascode.daemon")
+
+
+def dispatch(opcode: Opcode, screen: Screen, payload: bytes) -> str:
+    """把一条请求交给本地显示后端的命令队列执行，返回结果字符串。"""
+    backend = display_backend
+    if opcode == Opcode.PING:
+        return "pong"
+    if opcode == Opcode.SHOW_LINES:
+        lines = decode_lines(payload)
+        if screen == Screen.MAIN:
+            return backend._queued("main", lambda: backend._local_show_main_text(lines))
+        if screen == Screen.LEFT:
+            return backend._queued("left", lambda: backend._local_show_left_oled(lines))
+        if screen == Screen.RIGHT:
+            return backend._queued("right", lambda: backend._local_show_right_oled(lines))
+        raise ProtocolError("SHOW_LINES 需要指定 main/left/right")
+    if opcode == Opcode.BATCH:
+        screens = {k.name.lower(): v for k, v in decode_batch(payload).items()}
+        return backend._queued_batch(screens)
+    if opcode == Opcode.TIMINGS:
+        return backend._local_timing_report(reset=payload == b"\x01")
+    if opcode == Opcode.CLEAR:
+        name = screen.name.lower()
+        clear = backend._local_clear_screen
+        return backend._queued(None, lambda: clear(name), name)  # type: ignore[arg-type]
+    if opcode == Opcode.RESTORE:
+        return backend._queued(None, backend._local_restore_dashboard)
+    raise ProtocolError(f"不支持的操作码: {opcode.name}")
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """每个连接一个线程；同一连接上可连续发送多条请求。"""
+
+    server: "_UnixServer"
+
+    def handle(self) -> None:
+        sock: socket.socket = self.request
+        while True:
+            try:
+                opcode, screen, payload = read_frame(sock)
+            except EOFError:
+                return
+            except (OSError, ProtocolError) as e:
+                logger.warning("丢弃异常连接: %s", e)
+                return
+            try:
+                result = dispatch(opcode, screen, payload)
+                reply = encode(Opcode.RESULT, screen, result.encode("utf-8"))
+            except Exception as e:
+                reply = encode(Opcode.ERROR, screen, str(e).encode("utf-8"))
+            try:
+                sock.sendall(reply)
+            except OSError:
+                return
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path, _Handler)
+
+
+class DisplayDaemon:
+    """显示守护进程。"""
+
+    def __init__(self, socket_path: Optional[Path] = None, init_devices: bool = True) -> None:
+        self._path = Path(socket_path) if socket_path is not None else default_socket_path()
+        self._init_devices = init_devices
+        self._server: Optional[_UnixServer] = None
+
+    @property
+    def socket_path(self) -> Path:
+        return self._path
+
+    def start(self) -> None:
+        """绑定套接字并初始化设备（不阻塞）。"""
+        display_backend.use_local_devices()
+        if self._init_devices and not display_backend._ensure_displays():
+            logger.warning("设备初始化失败: %s", display_backend._init_error)
+        self._remove_stale_socket()
+        self._server = _UnixServer(str(self._path))
+        os.chmod(self._path, 0o660)
+        logger.info("显示守护进程已监听 %s", self._path)
+
+    def serve_forever(self) -> None:
+        if self._server is None:
+            self.start()
+        try:
+            self._server.serve_forever()  # type: ignore[union-attr]
+        finally:
+            self._cleanup()
+
+    def shutdown(self) -> None:
+        """停止服务（可在其他线程或信号处理中调用）。"""
+        if self._server is not None:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def _cleanup(self) -> None:
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+        try:
+            self._path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _remove_stale_socket(self) -> None:
+        """已有守护进程在监听时报错；遗留的套接字文件直接删除。"""
+        if not self._path.exists():
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self._path))
+        except OSError:
+            self._path.unlink()
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"显示守护进程已在运行：{self._path}")
+
+
+def main() -> None:
+    from rascode.config import load_config
+    from rascode.utils.logging import init_logging
+
+    init_logging(load_config())
+    daemon = DisplayDaemon()
+    daemon.start()
+    signal.signal(signal.SIGTERM, lambda *_: daemon.shutdown())
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        display_backend.clear_screen("all")
+
+
+if __name__ == "__main__":
+    main()
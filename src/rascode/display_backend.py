@@ -1,17 +1,142 @@
 """三联屏显示后端：唯一直接操作硬件的模块。
 
 供 MCP 服务与仪表盘脚本调用；需本机具备设备权限（rpi-lgpio + spidev）。
-环境变量 RASCODE_DISABLE_MAIN_LCD=1 时跳过主屏（仅用双 OLED），花屏时可使用。
+环境变量 RASCODE_DISABLE_MAIN_LCD=1 时跳过主屏（仅用双 OLED），花屏时可使用；
+RASCODE_DISPLAY_BACKEND=virtual 时使用虚拟屏，可在任意 Linux 主机上运行与剖析。
+
+若显示守护进程（python -m rascode.daemon）正在运行，本模块只作为瘦客户端，
+把请求经 Unix 套接字转发给守护进程，不再自行初始化设备；
+RASCODE_DISPLAY_DAEMON=0 可强制本进程直接操作硬件。
+
+本地写屏一律经 DisplayCommandQueue 执行：同一总线上的并发调用不会交错写入
+（主屏走 SPI 通道，双 OLED 走 I²C 通道，两条通道可同时传输），同一屏幕排队中的
+多次更新只保留最新一帧，清屏与恢复仪表盘按提交顺序生效。
+
+*_async 版本在专用线程池中执行同名同步操作并带超时，供异步调用方（MCP 服务）使用，
+不会阻塞事件循环。超时时间由 RASCODE_DISPLAY_TIMEOUT（秒，默认 10）控制。
+
+start_warm_up() 在后台线程中提前完成设备初始化（或连接守护进程），
+首次写屏调用会等待同一次初始化结束，而不是重新初始化。
 """
 from __future__ import annotations
 
+import asyncio
 import os
-from typing import Literal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Literal, Optional
+
+from rascode.display_queue import DisplayCommandQueue, QueueStats
+from rascode.utils.timing import format_summary, stage_timings
 
 _lcd = None
 _oled = None
+_compositor = None
 _displays_initialized = False
 _init_error: str | None = None
+_init_lock = threading.Lock()
+_local_only = False  # 守护进程自身置为 True，避免把请求转发给自己
+_client = None
+_queue: Optional[DisplayCommandQueue] = None
+_io_executor: Optional[ThreadPoolExecutor] = None
+
+# 各屏幕所在的总线通道；None 表示占用全部通道
+_SCREEN_LANES: dict[str, Optional[tuple[str, ...]]] = {
+    "main": ("spi",),
+    "left": ("i2c",),
+    "right": ("i2c",),
+    "all": None,
+}
+
+
+def use_local_devices() -> None:
+    """本进程直接持有设备（供守护进程调用），不再尝试连接守护进程。"""
+    global _local_only
+    _local_only = True
+
+
+def _daemon_disabled() -> bool:
+    return os.environ.get("RASCODE_DISPLAY_DAEMON", "").strip() in ("0", "false", "no")
+
+
+def _daemon_client():
+    """守护进程可连接时返回客户端，否则返回 None（走本地设备）。
+
+    只看套接字文件是否存在不够：守护进程异常退出会留下文件，连接被拒绝时同样走本地设备。
+    客户端保持长连接，已连接时探测不产生额外开销。
+    """
+    global _client
+    if _local_only or _daemon_disabled():
+        return None
+    from rascode.daemon.client import DisplayClient, default_socket_path
+
+    path = default_socket_path()
+    if not path.exists():
+        return None
+    if _client is None or _client.socket_path != path:
+        _client = DisplayClient(path)
+    return _client if _client.probe() else None
+
+
+def daemon_available() -> bool:
+    """显示守护进程是否可用（能连接且能应答）。"""
+    client = _daemon_client()
+    if client is None:
+        return False
+    try:
+        client.ping()
+        return True
+    except Exception:
+        return False
+
+
+def _remote(call: Callable[[], str]) -> str:
+    try:
+        return call()
+    except Exception as e:
+        return f"显示守护进程不可用：{e}"
+
+
+def _command_queue() -> DisplayCommandQueue:
+    global _queue
+    if _queue is None:
+        _queue = DisplayCommandQueue(lanes=("spi", "i2c"))
+    return _queue
+
+
+def _queued(
+    key: Optional[str],
+    fn: Callable[[], str],
+    screen: Optional[str] = None,
+    op: Optional[str] = None,
+) -> str:
+    """经命令队列执行本地写屏，并记录含排队等待的调用耗时。
+
+    key 为屏幕名时参与合并并走该屏所在通道；key 为 None 表示屏障，
+    占用 screen 所在的通道（未指定时占用全部通道）。op 为耗时统计中的阶段名。
+    """
+    lanes = _SCREEN_LANES.get(key or screen or "all")
+    start = time.perf_counter()
+    try:
+        return _command_queue().run(key, fn, lanes)
+    finally:
+        stage_timings.record("backend", op or key or "all", time.perf_counter() - start)
+
+
+def _queued_batch(screens: dict[str, list[str]]) -> str:
+    """批量写屏作为屏障，占用所涉屏幕的全部通道。"""
+    lanes = sorted({lane for name in screens for lane in _SCREEN_LANES.get(name) or ()})
+    start = time.perf_counter()
+    try:
+        return _command_queue().run(None, lambda: _local_show_screens(screens), lanes or None)
+    finally:
+        stage_timings.record("backend", "batch", time.perf_counter() - start)
+
+
+def queue_stats() -> QueueStats:
+    """本进程写屏命令队列的统计（排队深度、已执行数、被合并丢弃的帧数）。"""
+    return _command_queue().stats()
 
 
 def _main_lcd_disabled() -> bool:
@@ -19,27 +144,78 @@ def _main_lcd_disabled() -> bool:
 
 
 def _ensure_displays() -> bool:
-    global _lcd, _oled, _displays_initialized, _init_error
+    """首次调用时初始化设备。SPI/I²C 两条通道与预热线程可能同时到达，只初始化一次；
+    完成标记在初始化结束后才置位，其他通道不会看到初始化到一半的设备。
+    """
     if _displays_initialized:
         return _lcd is not None or _oled is not None
-    _displays_initialized = True
+    with _init_lock:  # 预热线程与首次调用可能同时到达，只初始化一次
+        if _displays_initialized:
+            return _lcd is not None or _oled is not None
+        return _init_displays_locked()
+
+
+def _init_displays_locked() -> bool:
+    global _lcd, _oled, _compositor, _displays_initialized, _init_error
     try:
-        from rascode.hardware.display import DualOledDisplay, LcdHatMainDisplay, OledDisplayId
+        from rascode.hardware.display import (
+            ScreenCompositor,
+            create_main_display,
+            create_oled_display,
+        )
 
+        # RASCODE_DISPLAY_BACKEND=virtual 时为内存中的虚拟屏
         if not _main_lcd_disabled():
-            _lcd = LcdHatMainDisplay()
+            _lcd = create_main_display()
             _lcd.init()
-        _oled = DualOledDisplay()
+        _oled = create_oled_display()
         _oled.init()
+        _compositor = ScreenCompositor(_lcd, _oled)
         return True
     except Exception as e:
         _init_error = str(e)
         _lcd = None
         _oled = None
+        _compositor = None
         return False
+    finally:
+        _displays_initialized = True
 
 
-def show_main_text(lines: list[str]) -> str:
+def warm_up() -> float:
+    """预热：守护进程可用时建立连接，否则初始化本地设备并准备共享采样器。返回耗时（秒）。"""
+    start = time.perf_counter()
+    if not daemon_available():
+        _ensure_displays()
+        from rascode.services.monitoring import shared_sampler
+
+        shared_sampler()  # 提前取得 CPU 基线，首次 restore_dashboard 即有有效的 CPU 使用率
+    return time.perf_counter() - start
+
+
+def start_warm_up() -> threading.Thread:
+    """在后台线程中执行 warm_up() 并记录耗时，立即返回线程对象。"""
+    from rascode.utils.logging import get_logger
+
+    logger = get_logger("rascode.display")
+
+    def run() -> None:
+        try:
+            seconds = warm_up()
+        except Exception as e:  # 预热失败不影响服务，首次调用时会返回具体错误
+            logger.warning("显示设备预热失败: %s", e)
+            return
+        if _init_error:
+            logger.warning("显示设备预热失败（%.0fms）: %s", seconds * 1000, _init_error)
+        else:
+            logger.info("显示设备预热完成，耗时 %.0fms", seconds * 1000)
+
+    thread = threading.Thread(target=run, name="rascode-display-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def _local_show_main_text(lines: list[str]) -> str:
     if _main_lcd_disabled():
         return "主屏已禁用（RASCODE_DISABLE_MAIN_LCD），仅双 OLED 可用。"
     if not _ensure_displays() or _lcd is None:
@@ -51,7 +227,7 @@ def show_main_text(lines: list[str]) -> str:
         return f"主屏写入失败: {e}"
 
 
-def show_left_oled(lines: list[str]) -> str:
+def _local_show_left_oled(lines: list[str]) -> str:
     if not _ensure_displays() or _oled is None:
         return f"左侧 OLED 不可用：{_init_error or '未初始化'}"
     try:
@@ -63,7 +239,7 @@ def show_left_oled(lines: list[str]) -> str:
         return f"左侧 OLED 写入失败: {e}"
 
 
-def show_right_oled(lines: list[str]) -> str:
+def _local_show_right_oled(lines: list[str]) -> str:
     if not _ensure_displays() or _oled is None:
         return f"右侧 OLED 不可用：{_init_error or '未初始化'}"
     try:
@@ -75,7 +251,42 @@ def show_right_oled(lines: list[str]) -> str:
         return f"右侧 OLED 写入失败: {e}"
 
 
-def clear_screen(screen: Literal["main", "left", "right", "all"]) -> str:
+def _local_show_screens(screens: dict[str, list[str]]) -> str:
+    if not _ensure_displays():
+        return f"显示不可用：{_init_error or '未初始化'}"
+    unknown = set(screens) - {"main", "left", "right"}
+    if unknown:
+        return f"未知屏幕: {', '.join(sorted(unknown))}"
+    try:
+        from rascode.hardware.display import OledDisplayId
+
+        # 先渲染全部屏幕，再由合成器一次并行提交，三块屏同步更新。
+        # 批量只占用所涉屏幕的通道，并发的批量各用独立的暂存区，不会提交或清掉彼此的帧
+        batch = _compositor.session()
+        unavailable = []
+        if "main" in screens:
+            if _lcd is None:
+                unavailable.append("main")
+            else:
+                batch.stage_main(screens["main"][:22])
+        for name, oled in (("left", OledDisplayId.LEFT), ("right", OledDisplayId.RIGHT)):
+            if name in screens:
+                if _oled is None:
+                    unavailable.append(name)
+                else:
+                    batch.stage_oled(oled, screens[name][:6])
+        if len(unavailable) == len(screens):
+            return f"批量写屏失败：所选屏幕均不可用（{', '.join(unavailable)}）"
+        report = batch.commit()
+        result = f"ok {report.summary()}"
+        if unavailable:
+            result += f"（不可用: {', '.join(unavailable)}）"
+        return result
+    except Exception as e:
+        return f"批量写屏失败: {e}"
+
+
+def _local_clear_screen(screen: Literal["main", "left", "right", "all"]) -> str:
     if not _ensure_displays():
         return f"显示不可用：{_init_error or '未初始化'}"
     try:
@@ -92,25 +303,166 @@ def clear_screen(screen: Literal["main", "left", "right", "all"]) -> str:
         return f"清屏失败: {e}"
 
 
-def restore_dashboard() -> str:
+def _local_restore_dashboard() -> str:
     if not _ensure_displays():
         return f"显示不可用：{_init_error or '未初始化'}"
     try:
-        from rascode.hardware.display import OledDisplayId
-        from rascode.services.monitoring import SystemMonitor, format_stats_for_oled
-        from rascode.services.network_info import collect_network_info, format_time_network_for_oled
+        from rascode.services.monitoring import format_stats_for_oled, shared_sampler
+        from rascode.services.network_info import format_time_network_for_oled
+        from rascode.services.network_watch import shared_network_watcher
 
-        monitor = SystemMonitor()
-        stats = monitor.collect()
+        start = time.perf_counter()
+        stats = shared_sampler().sample()
         left_lines = format_stats_for_oled(stats)
-        net = collect_network_info()
+        net = shared_network_watcher().info()
         right_lines = format_time_network_for_oled(net)
+        stage_timings.record("backend", "collect", time.perf_counter() - start)
 
+        # 三块屏先渲染，再由合成器并行提交（SPI 与 I²C 同时传输）
+        batch = _compositor.session()
         if _lcd is not None:
-            _lcd.show_lines(["Rascode Dashboard", ""])
+            batch.stage_main(["Rascode Dashboard", ""])
         if _oled is not None:
-            _oled.show_lines(OledDisplayId.LEFT, left_lines)
-            _oled.show_lines(OledDisplayId.RIGHT, right_lines)
+            batch.stage_left(left_lines)
+            batch.stage_right(right_lines)
+        batch.commit()
         return "ok"
     except Exception as e:
         return f"恢复仪表盘失败: {e}"
+
+
+# === 对外接口：守护进程在运行时转发，否则直接操作本地设备 ===
+
+
+def show_main_text(lines: list[str]) -> str:
+    client = _daemon_client()
+    if client is not None:
+        return _remote(lambda: client.show_lines("main", lines))
+    return _queued("main", lambda: _local_show_main_text(lines))
+
+
+def show_left_oled(lines: list[str]) -> str:
+    client = _daemon_client()
+    if client is not None:
+        return _remote(lambda: client.show_lines("left", lines))
+    return _queued("left", lambda: _local_show_left_oled(lines))
+
+
+def show_right_oled(lines: list[str]) -> str:
+    client = _daemon_client()
+    if client is not None:
+        return _remote(lambda: client.show_lines("right", lines))
+    return _queued("right", lambda: _local_show_right_oled(lines))
+
+
+def show_screens(
+    main: Optional[list[str]] = None,
+    left: Optional[list[str]] = None,
+    right: Optional[list[str]] = None,
+) -> str:
+    """一次刷新任意几块屏：先全部渲染，再一起提交，返回 "ok main=…ms left=…ms total=…ms"。"""
+    screens = {
+        name: lines
+        for name, lines in (("main", main), ("left", left), ("right", right))
+        if lines is not None
+    }
+    if not screens:
+        return "未指定任何屏幕内容"
+    client = _daemon_client()
+    if client is not None:
+        return _remote(lambda: client.show_screens(screens))
+    return _queued_batch(screens)
+
+
+def clear_screen(screen: Literal["main", "left", "right", "all"]) -> str:
+    client = _daemon_client()
+    if client is not None:
+        return _remote(lambda: client.clear(screen))
+    return _queued(None, lambda: _local_clear_screen(screen), screen, op="clear")
+
+
+def restore_dashboard() -> str:
+    client = _daemon_client()
+    if client is not None:
+        return _remote(client.restore_dashboard)
+    return _queued(None, _local_restore_dashboard, op="restore")
+
+
+def _local_timing_report(reset: bool = False) -> str:
+    report = format_summary(stage_timings.summary())
+    if reset:
+        stage_timings.reset()
+    return report
+
+
+def timing_report(reset: bool = False) -> str:
+    """各屏各阶段耗时（p50/p95/max）、帧率与带宽的文本报告；守护进程运行时取其数据。
+
+    结构化数据见 rascode.utils.timing.stage_timings.summary()。
+    """
+    client = _daemon_client()
+    if client is not None:
+        return _remote(lambda: client.timings(reset))
+    return _local_timing_report(reset)
+
+
+# === 异步接口：在专用线程池中执行，带超时 ===
+
+
+def _display_timeout() -> float:
+    try:
+        return float(os.environ.get("RASCODE_DISPLAY_TIMEOUT", "10"))
+    except ValueError:
+        return 10.0
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rascode-display-io")
+    return _io_executor
+
+
+async def _run_async(fn: Callable[..., str], *args: Any, timeout: Optional[float] = None) -> str:
+    """在线程池中执行同步写屏操作；超时返回提示字符串（已提交的命令仍会执行完）。"""
+    limit = _display_timeout() if timeout is None else timeout
+    loop = asyncio.get_running_loop()
+    try:
+        return await asyncio.wait_for(loop.run_in_executor(_get_io_executor(), fn, *args), limit)
+    except asyncio.TimeoutError:
+        return f"写屏超时（>{limit:g}s）"
+
+
+async def show_main_text_async(lines: list[str], timeout: Optional[float] = None) -> str:
+    return await _run_async(show_main_text, lines, timeout=timeout)
+
+
+async def show_left_oled_async(lines: list[str], timeout: Optional[float] = None) -> str:
+    return await _run_async(show_left_oled, lines, timeout=timeout)
+
+
+async def show_right_oled_async(lines: list[str], timeout: Optional[float] = None) -> str:
+    return await _run_async(show_right_oled, lines, timeout=timeout)
+
+
+async def show_screens_async(
+    main: Optional[list[str]] = None,
+    left: Optional[list[str]] = None,
+    right: Optional[list[str]] = None,
+    timeout: Optional[float] = None,
+) -> str:
+    return await _run_async(show_screens, main, left, right, timeout=timeout)
+
+
+async def timing_report_async(reset: bool = False, timeout: Optional[float] = None) -> str:
+    return await _run_async(timing_report, reset, timeout=timeout)
+
+
+async def clear_screen_async(
+    screen: Literal["main", "left", "right", "all"], timeout: Optional[float] = None
+) -> str:
+    return await _run_async(clear_screen, screen, timeout=timeout)
+
+
+async def restore_dashboard_async(timeout: Optional[float] = None) -> str:
+    return await _run_async(restore_dashboard, timeout=timeout)
@@ -0,0 +1,139 @@
+"""写屏命令队列：把并发的写屏请求串行化，并按屏幕合并尚未执行的更新。
+
+- 队列按总线分为若干通道（lane），每个通道一个工作线程：同一通道内的命令严格串行，
+  不同通道（如 SPI 主屏与 I²C 双 OLED）可以同时传输。
+- 普通更新带有屏幕键（main/left/right）。同一屏幕已有排队中的更新时，新请求直接替换
+  旧请求的内容（最新帧优先），旧调用方拿到的是替换后那条命令的执行结果。
+- 清屏、恢复仪表盘等作为「屏障」（键为 None）按提交顺序执行；屏障之后提交的更新
+  不会与屏障之前的更新合并。跨多个通道的屏障要等各通道都排到它时才执行一次，
+  因此在所有相关通道上都保持先后顺序。
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+
+@dataclass
+class QueueStats:
+    """命令队列统计快照。"""
+
+    depth: int = 0  # 当前排队（未开始执行）的命令数
+    executed: int = 0  # 已执行的命令数
+    superseded: int = 0  # 被同屏新请求替换而丢弃的更新数
+
+
+class _Entry:
+    __slots__ = ("key", "fn", "futures", "waiting", "done")
+
+    def __init__(
+        self, key: Optional[str], fn: Callable[[], str], future: Future, lanes: int
+    ) -> None:
+        self.key = key
+        self.fn = fn
+        self.futures = [future]
+        self.waiting = lanes  # 尚未排到该命令的通道数
+        self.done = False
+
+
+class DisplayCommandQueue:
+    """按总线分通道的写屏命令队列，线程安全。"""
+
+    def __init__(
+        self, lanes: Iterable[str] = ("default",), name: str = "rascode-display-queue"
+    ) -> None:
+        self._name = name
+        self._cond = threading.Condition()
+        self._lanes: dict[str, deque[_Entry]] = {lane: deque() for lane in lanes}
+        self._threads: dict[str, threading.Thread] = {}
+        self._executed = 0
+        self._superseded = 0
+
+    @property
+    def lanes(self) -> tuple[str, ...]:
+        return tuple(self._lanes)
+
+    def submit(
+        self,
+        key: Optional[str],
+        fn: Callable[[], str],
+        lanes: Optional[Iterable[str]] = None,
+    ) -> Future:
+        """提交一条命令。
+
+        key 为 None 表示屏障（不参与合并）；lanes 为 None 表示占用全部通道。
+        """
+        targets = tuple(lanes) if lanes is not None else tuple(self._lanes)
+        future: Future = Future()
+        with self._cond:
+            if key is not None and len(targets) == 1:
+                for entry in reversed(self._lanes[targets[0]]):
+                    if entry.key is None:
+                        break
+                    if entry.key == key:
+                        entry.fn = fn
+                        entry.futures.append(future)
+                        self._superseded += 1
+                        return future
+            entry = _Entry(key, fn, future, len(targets))
+            for lane in targets:
+                self._lanes[lane].append(entry)
+                self._ensure_worker(lane)
+            self._cond.notify_all()
+        return future
+
+    def run(
+        self,
+        key: Optional[str],
+        fn: Callable[[], str],
+        lanes: Optional[Iterable[str]] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """提交并等待执行结果。"""
+        return self.submit(key, fn, lanes).result(timeout)
+
+    def stats(self) -> QueueStats:
+        with self._cond:
+            pending = {id(e) for q in self._lanes.values() for e in q}
+            return QueueStats(
+                depth=len(pending),
+                executed=self._executed,
+                superseded=self._superseded,
+            )
+
+    def _ensure_worker(self, lane: str) -> None:
+        thread = self._threads.get(lane)
+        if thread is None or not thread.is_alive():
+            thread = threading.Thread(
+                target=self._run, args=(lane,), name=f"{self._name}-{lane}", daemon=True
+            )
+            self._threads[lane] = thread
+            thread.start()
+
+    def _run(self, lane: str) -> None:
+        queue = self._lanes[lane]
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: bool(queue))
+                entry = queue.popleft()
+                entry.waiting -= 1
+                if entry.waiting > 0:
+                    # 跨通道屏障：等最后一个排到它的通道执行完
+                    self._cond.wait_for(lambda e=entry: e.done)
+                    continue
+            try:
+                result = entry.fn()
+            except Exception as e:
+                for fut in entry.futures:
+                    fut.set_exception(e)
+            else:
+                for fut in entry.futures:
+                    fut.set_result(result)
+            with self._cond:
+                entry.done = True
+                self._executed += 1
+                self._cond.notify_all()
@@ -3,12 +3,38 @@
 from .base import BaseDisplay
 from .oled_dual import DualOledDisplay, OledDisplayId
 from .lcd_hat_main import LcdHatMainDisplay, LcdConfig
+from .compositor import CommitError, CommitReport, ScreenCompositor
+from .factory import create_main_display, create_oled_display, virtual_displays_enabled
+from .layout import (
+    GaugeWidget,
+    IconWidget,
+    Layout,
+    ProgressWidget,
+    SparklineWidget,
+    TextWidget,
+    Widget,
+)
+from .widgets import Sparkline
 
 __all__ = [
     "BaseDisplay",
+    "CommitError",
+    "CommitReport",
+    "ScreenCompositor",
     "DualOledDisplay",
     "OledDisplayId",
     "LcdHatMainDisplay",
     "LcdConfig",
+    "Sparkline",
+    "Layout",
+    "Widget",
+    "TextWidget",
+    "GaugeWidget",
+    "ProgressWidget",
+    "SparklineWidget",
+    "IconWidget",
+    "create_main_display",
+    "create_oled_display",
+    "virtual_displays_enabled",
 ]
 
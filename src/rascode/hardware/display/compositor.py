@@ -0,0 +1,202 @@
+"""三联屏合成提交：先渲染三块屏，再并行推送到 SPI 主屏与 I²C 双 OLED。
+
+主屏（SPI）与双 OLED（I²C）在不同总线上，可以同时传输；两块 OLED 共用一条 I²C
+总线，在同一个工作线程里背靠背写入。一次 commit 的耗时约为两条总线中较慢的一条，
+而不是三块屏之和。
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+from PIL import Image
+
+from .base import DisplayError
+from .framebuffer import Rect
+from .lcd_hat_main import LcdHatMainDisplay
+from .oled_dual import DualOledDisplay, OledDisplayId
+
+
+@dataclass
+class CommitReport:
+    """一次合成提交的耗时报告（秒）。"""
+
+    screens: dict[str, float] = field(default_factory=dict)
+    total_s: float = 0.0
+    errors: dict[str, str] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        """单行摘要，例如 "main=12.1ms left=3.0ms right=2.9ms total=12.4ms"。"""
+        parts = [f"{name}={seconds * 1000:.1f}ms" for name, seconds in self.screens.items()]
+        parts.append(f"total={self.total_s * 1000:.1f}ms")
+        return " ".join(parts)
+
+
+class CommitError(DisplayError):
+    """合成提交中有屏幕写入失败；report 含成功屏幕的耗时与失败屏幕的错误。"""
+
+    def __init__(self, message: str, report: CommitReport) -> None:
+        super().__init__(message)
+        self.report = report
+
+
+class ScreenCompositor:
+    """暂存三块屏的帧，commit() 时一次性并行提交。
+
+    暂存区属于单个调用方；并发的调用方各用 session() 取得自己的合成器。
+    """
+
+    def __init__(
+        self,
+        lcd: Optional[LcdHatMainDisplay] = None,
+        oled: Optional[DualOledDisplay] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> None:
+        self._lcd = lcd
+        self._oled = oled
+        self._main: Optional[Image.Image] = None
+        self._main_dirty: Optional[list[Rect]] = None
+        self._oleds: dict[OledDisplayId, Image.Image] = {}
+        self._oled_dirty: dict[OledDisplayId, Optional[list[Rect]]] = {}
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def session(self) -> "ScreenCompositor":
+        """返回共用同一组屏幕与提交线程池、但暂存区独立的合成器（不需要 close）。"""
+        return ScreenCompositor(self._lcd, self._oled, executor=self._get_executor())
+
+    # === 暂存（在调用线程渲染） ===
+
+    def stage_main(self, lines: list[str]) -> None:
+        self._main = self._require_lcd().render_lines(lines)
+        self._main_dirty = None
+
+    def stage_main_image(self, image: Any) -> None:
+        self._main = self._require_lcd().render_image(image)
+        self._main_dirty = None
+
+    def stage_main_frame(self, frame: Image.Image, dirty: Optional[list[Rect]] = None) -> None:
+        """暂存已按主屏尺寸渲染好的帧（如 Layout.compose() 的结果），dirty 为脏区提示。"""
+        self._require_lcd()
+        had_frame = self._main is not None
+        self._main = frame
+        self._main_dirty = _merge_dirty(had_frame, self._main_dirty, dirty)
+
+    def stage_oled(self, oled: OledDisplayId, lines: Iterable[str]) -> None:
+        self._oleds[oled] = self._require_oled().render_lines(oled, lines)
+        self._oled_dirty[oled] = None
+
+    def stage_oled_image(self, oled: OledDisplayId, image: Any) -> None:
+        self._oleds[oled] = self._require_oled().render_image(oled, image)
+        self._oled_dirty[oled] = None
+
+    def stage_oled_frame(
+        self, oled: OledDisplayId, frame: Image.Image, dirty: Optional[list[Rect]] = None
+    ) -> None:
+        """暂存已按 OLED 尺寸渲染好的单色帧，dirty 为脏区提示。"""
+        self._require_oled()
+        had_frame = oled in self._oleds
+        self._oleds[oled] = frame
+        self._oled_dirty[oled] = _merge_dirty(had_frame, self._oled_dirty.get(oled), dirty)
+
+    def stage_left(self, lines: Iterable[str]) -> None:
+        self.stage_oled(OledDisplayId.LEFT, lines)
+
+    def stage_right(self, lines: Iterable[str]) -> None:
+        self.stage_oled(OledDisplayId.RIGHT, lines)
+
+    # === 提交 ===
+
+    def commit(self) -> CommitReport:
+        """提交所有暂存帧并清空暂存区；任一屏失败时在全部结束后抛出 CommitError（DisplayError）。"""
+        main, self._main = self._main, None
+        main_dirty, self._main_dirty = self._main_dirty, None
+        oleds, self._oleds = self._oleds, {}
+        oled_dirty, self._oled_dirty = self._oled_dirty, {}
+        report = CommitReport()
+        start = time.perf_counter()
+        jobs: list[tuple[str, Any]] = []
+        if main is not None:
+            jobs.append(("main", lambda: self._commit_main(main, main_dirty)))
+        if oleds:
+            jobs.append(("oled", lambda: self._commit_oleds(oleds, oled_dirty)))
+
+        if len(jobs) > 1:
+            executor = self._get_executor()
+            futures: list[tuple[str, Future]] = [(name, executor.submit(fn)) for name, fn in jobs]
+            results = [(name, _result(fut)) for name, fut in futures]
+        else:
+            results = [(name, _call(fn)) for name, fn in jobs]
+
+        for name, (timings, error) in results:
+            report.screens.update(timings)
+            if error is not None:
+                report.errors[name] = error
+        report.total_s = time.perf_counter() - start
+        if report.errors:
+            detail = "; ".join(f"{k}: {v}" for k, v in report.errors.items())
+            raise CommitError(f"提交失败: {detail}", report)
+        return report
+
+    def close(self) -> None:
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _commit_main(
+        self, image: Image.Image, dirty: Optional[list[Rect]] = None
+    ) -> dict[str, float]:
+        start = time.perf_counter()
+        self._lcd.commit_frame(image, dirty)  # type: ignore[union-attr]
+        return {"main": time.perf_counter() - start}
+
+    def _commit_oleds(
+        self,
+        frames: dict[OledDisplayId, Image.Image],
+        dirty: Optional[dict[OledDisplayId, Optional[list[Rect]]]] = None,
+    ) -> dict[str, float]:
+        timings = self._oled.commit_pair(frames, dirty)  # type: ignore[union-attr]
+        return {oled.value: seconds for oled, seconds in timings.items()}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="rascode-commit")
+        return self._executor
+
+    def _require_lcd(self) -> LcdHatMainDisplay:
+        if self._lcd is None:
+            raise DisplayError("主屏不可用。")
+        return self._lcd
+
+    def _require_oled(self) -> DualOledDisplay:
+        if self._oled is None:
+            raise DisplayError("双 OLED 不可用。")
+        return self._oled
+
+
+def _call(fn) -> tuple[dict[str, float], Optional[str]]:
+    try:
+        return fn(), None
+    except Exception as e:
+        return {}, str(e)
+
+
+def _result(fut: Future) -> tuple[dict[str, float], Optional[str]]:
+    try:
+        return fut.result(), None
+    except Exception as e:
+        return {}, str(e)
+
+
+def _merge_dirty(
+    had_frame: bool, previous: Optional[list[Rect]], new: Optional[list[Rect]]
+) -> Optional[list[Rect]]:
+    """同一屏在一次提交前被多次暂存时，脏区取并集；任一次没有提示则整帧比对。"""
+    if not had_frame:
+        return new
+    if previous is None or new is None:
+        return None
+    return previous + new
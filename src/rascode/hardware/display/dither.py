@@ -0,0 +1,90 @@
+"""OLED 单色图像转换：缩放到屏幕尺寸后做阈值 / 有序（Bayer）/ 误差扩散抖动。
+
+阈值与 Bayer 抖动用 NumPy 整帧向量化完成；误差扩散（Floyd–Steinberg）逐像素依赖
+前一像素的误差，无法按帧向量化，直接使用 Pillow 的 C 实现，同样没有 Python 逐像素循环。
+转换结果按「源图指纹 + 参数」缓存，重复的图标或动画帧只转换一次。
+"""
+
+from __future__ import annotations
+
+from typing import Literal
+
+from PIL import Image, ImageOps
+
+from rascode.utils.lru import CacheStats, LruCache
+
+from .base import DisplayError
+from .framebuffer import frame_digest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - 仅在未安装 numpy 时触发
+    np = None  # type: ignore[assignment]
+
+DitherMethod = Literal["threshold", "bayer", "floyd-steinberg"]
+DITHER_METHODS: tuple[str, ...] = ("threshold", "bayer", "floyd-steinberg")
+
+# 1bpp 128×64 一帧 1KB，默认可缓存约 256 帧
+_cache: LruCache[Image.Image] = LruCache(
+    256 * 1024, cost=lambda im: (im.width + 7) // 8 * im.height
+)
+
+
+def _bayer_matrix(n: int) -> "np.ndarray":
+    """n×n（n 为 2 的幂）Bayer 矩阵，取值 0..n²-1。"""
+    m = np.zeros((1, 1), dtype=np.int32)
+    while m.shape[0] < n:
+        m = np.block([[4 * m, 4 * m + 2], [4 * m + 3, 4 * m + 1]])
+    return m
+
+
+def _fit(image: Image.Image, size: tuple[int, int]) -> Image.Image:
+    """转灰度并等比缩放到 size，空余部分补黑。"""
+    gray = image.convert("L")
+    if gray.size == size:
+        return gray
+    return ImageOps.pad(gray, size, color=0)
+
+
+def dither(
+    image: Image.Image,
+    size: tuple[int, int] = (128, 64),
+    method: DitherMethod = "floyd-steinberg",
+    threshold: int = 128,
+) -> Image.Image:
+    """把任意 PIL 图像转换为 size 大小的 1bpp 图像（不经缓存）。"""
+    gray = _fit(image, size)
+    if method == "floyd-steinberg":
+        return gray.convert("1", dither=Image.Dither.FLOYDSTEINBERG)
+    if method == "threshold":
+        if np is None:
+            return gray.point(lambda v: 255 if v >= threshold else 0).convert(
+                "1", dither=Image.Dither.NONE
+            )
+        return Image.fromarray(np.asarray(gray) >= threshold)
+    if method == "bayer":
+        if np is None:
+            raise DisplayError("Bayer 抖动需要 numpy：pip install numpy")
+        w, h = size
+        bayer = _bayer_matrix(8)
+        # 阈值取各格中心：(m + 0.5) / 64 * 255
+        thresholds = ((bayer + 0.5) * (255.0 / 64)).astype(np.float32)
+        tiled = np.tile(thresholds, (h // 8 + 1, w // 8 + 1))[:h, :w]
+        return Image.fromarray(np.asarray(gray, dtype=np.float32) > tiled)
+    raise DisplayError(f"未知的抖动方式: {method}，可选 {', '.join(DITHER_METHODS)}")
+
+
+def dither_cached(
+    image: Image.Image,
+    size: tuple[int, int] = (128, 64),
+    method: DitherMethod = "floyd-steinberg",
+    threshold: int = 128,
+) -> Image.Image:
+    """同 dither()，结果按源图指纹与参数缓存。"""
+    key = (frame_digest(image), size, method, threshold)
+    return _cache.get_or_create(key, lambda: dither(image, size, method, threshold))
+
+
+def dither_cache_stats() -> CacheStats:
+    """单色转换缓存命中统计。"""
+    return _cache.stats()
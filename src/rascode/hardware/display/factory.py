@@ -0,0 +1,37 @@
+"""按配置创建显示设备：真实硬件或虚拟屏（RASCODE_DISPLAY_BACKEND=virtual）。"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from rascode.config import load_config
+
+from .lcd_hat_main import LcdConfig, LcdHatMainDisplay
+from .oled_dual import DualOledDisplay, OledConfig
+
+
+def virtual_displays_enabled() -> bool:
+    """当前配置是否使用虚拟屏。"""
+    return load_config().display_backend == "virtual"
+
+
+def create_main_display(
+    config: Optional[LcdConfig] = None, virtual: Optional[bool] = None
+) -> LcdHatMainDisplay:
+    """创建主屏（未初始化）；virtual 为 None 时按配置选择。"""
+    if virtual_displays_enabled() if virtual is None else virtual:
+        from .virtual import VirtualLcdDisplay
+
+        return VirtualLcdDisplay(config)
+    return LcdHatMainDisplay(config)
+
+
+def create_oled_display(
+    config: Optional[OledConfig] = None, virtual: Optional[bool] = None
+) -> DualOledDisplay:
+    """创建双 OLED（未初始化）；virtual 为 None 时按配置选择。"""
+    if virtual_displays_enabled() if virtual is None else virtual:
+        from .virtual import VirtualDualOledDisplay
+
+        return VirtualDualOledDisplay(config)
+    return DualOledDisplay(config)
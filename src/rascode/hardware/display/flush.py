@@ -0,0 +1,81 @@
+"""后台刷屏线程：调用方只负责渲染，总线传输交给专用线程。
+
+采用「最新帧优先」：线程忙于传输时到来的新帧会替换尚未开始传输的旧帧，
+调用方立即返回，慢总线不会积压。需要确认画面已上屏时调用 flush()/wait_idle()。
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable, Optional
+
+from PIL import Image
+
+from .base import DisplayError
+
+
+class LatestFrameFlusher:
+    """单帧槽位的后台提交线程。"""
+
+    def __init__(self, commit: Callable[[Image.Image], None], name: str = "rascode-flush") -> None:
+        self._commit = commit
+        self._cond = threading.Condition()
+        self._pending: Optional[Image.Image] = None
+        self._busy = False
+        self._stopped = False
+        self._error: Optional[BaseException] = None
+        self.frames_superseded = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, frame: Image.Image) -> None:
+        """提交一帧；若上一帧尚未开始传输则直接替换。"""
+        with self._cond:
+            if self._stopped:
+                raise DisplayError("刷屏线程已停止。")
+            if self._pending is not None:
+                self.frames_superseded += 1
+            self._pending = frame
+            self._cond.notify_all()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """等待所有已提交帧传输完毕；超时返回 False。"""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._pending is None and not self._busy, timeout=timeout
+            )
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """等待上屏；超时或最近一次传输出错时抛出 DisplayError。"""
+        if not self.wait_idle(timeout):
+            raise DisplayError(f"等待主屏刷新超时（{timeout}s）。")
+        with self._cond:
+            error, self._error = self._error, None
+        if error is not None:
+            raise DisplayError(f"主屏后台刷新失败: {error}") from error
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """传完已提交的帧后停止线程。"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or self._stopped)
+                frame = self._pending
+                if frame is None:
+                    return
+                self._pending = None
+                self._busy = True
+            try:
+                self._commit(frame)
+            except Exception as e:  # 交由 flush() 转交给调用方
+                with self._cond:
+                    self._error = e
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
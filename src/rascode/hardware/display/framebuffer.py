@@ -0,0 +1,187 @@
+"""影子帧缓冲、帧指纹与脏矩形计算。
+
+显示适配层在提交一帧前与「上一帧已提交内容」做比对：指纹相同直接跳过，
+否则只把变化的区域送上总线。
+矩形统一使用 (x0, y0, x1, y1) 表示，x1/y1 为开区间，与 luma 的 set_window 一致。
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Optional
+
+from PIL import Image, ImageChops
+
+Rect = tuple[int, int, int, int]
+# OLED 页段：(page, col_start, col_end)，col_end 为开区间
+PageSegment = tuple[int, int, int]
+
+
+@dataclass
+class FrameStats:
+    """单块屏的帧传输统计。"""
+
+    frames_sent: int = 0
+    frames_skipped: int = 0
+    frames_superseded: int = 0  # 异步刷屏时尚未传输就被新帧替换的帧数
+    full_frames: int = 0
+    partial_frames: int = 0
+    bytes_sent: int = 0
+    bytes_saved: int = 0
+    last_bytes_sent: int = 0
+    last_bytes_saved: int = 0
+
+    def record(self, sent: int, full: int, partial: bool) -> None:
+        """记录一次提交：sent 为实际字节数，full 为整帧传输所需字节数。"""
+        saved = max(full - sent, 0)
+        self.frames_sent += 1
+        if partial:
+            self.partial_frames += 1
+        else:
+            self.full_frames += 1
+        self.bytes_sent += sent
+        self.bytes_saved += saved
+        self.last_bytes_sent = sent
+        self.last_bytes_saved = saved
+
+    def record_skip(self) -> None:
+        """记录一次因指纹相同而跳过的提交。"""
+        self.frames_skipped += 1
+        self.last_bytes_sent = 0
+        self.last_bytes_saved = 0
+
+
+def frame_digest(image: Image.Image) -> bytes:
+    """计算渲染结果的指纹（模式 + 尺寸 + 调色板 + 像素）。
+
+    "P"/"PA" 图像的像素只是调色板索引，调色板不同而索引相同的两帧显示内容不同。
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{image.mode}:{image.width}x{image.height}".encode())
+    palette = image.getpalette() if image.mode in ("P", "PA") else None
+    if palette is not None:
+        h.update(b"palette:" + bytes(palette))
+    h.update(image.tobytes())
+    return h.digest()
+
+
+def dirty_rects(old: Optional[Image.Image], new: Image.Image, band_rows: int = 16) -> list[Rect]:
+    """比较两帧，返回需要重传的矩形列表。
+
+    按 band_rows 行为一条带逐带求包围盒，相邻的脏带合并成一个矩形；
+    这样「顶部时钟 + 底部状态行」这类分散变化不会退化成一个覆盖整屏的大框。
+    old 为 None 或尺寸/模式不一致时返回整屏。
+    """
+    width, height = new.size
+    if old is None or old.size != new.size or old.mode != new.mode:
+        return [(0, 0, width, height)]
+    diff = ImageChops.difference(old, new)
+    bbox = diff.getbbox()
+    if bbox is None:
+        return []
+    band_rows = max(1, band_rows)
+    x0, y0, x1, y1 = bbox
+    rects: list[Rect] = []
+    current: Optional[list[int]] = None
+    for top in range(y0, y1, band_rows):
+        bottom = min(top + band_rows, y1)
+        band = diff.crop((x0, top, x1, bottom)).getbbox()
+        if band is None:
+            if current is not None:
+                rects.append(tuple(current))  # type: ignore[arg-type]
+                current = None
+            continue
+        bx0, by0, bx1, by1 = band
+        if current is None:
+            current = [x0 + bx0, top + by0, x0 + bx1, top + by1]
+        else:
+            current[0] = min(current[0], x0 + bx0)
+            current[2] = max(current[2], x0 + bx1)
+            current[3] = top + by1
+    if current is not None:
+        rects.append(tuple(current))  # type: ignore[arg-type]
+    return rects
+
+
+def pack_pages(image: Image.Image) -> bytearray:
+    """把 1bpp 图像打包为 SSD1306 的页格式：每页 8 行，每列一个字节，低位在上。"""
+    width, height = image.size
+    pages = height // 8
+    # 顺时针旋转后每行对应原图一列，自下而上每 8 像素正好是一页的一个字节（高位在下）
+    col_major = image.convert("1").transpose(Image.Transpose.ROTATE_270).tobytes()
+    out = bytearray(width * pages)
+    for page in range(pages):
+        out[page * width : (page + 1) * width] = col_major[pages - 1 - page :: pages]
+    return out
+
+
+def unpack_pages(packed: bytes, width: int, height: int) -> Image.Image:
+    """pack_pages 的逆变换：把页格式缓冲还原为 1bpp 图像。"""
+    pages = height // 8
+    col_major = bytearray(width * pages)
+    for page in range(pages):
+        col_major[pages - 1 - page :: pages] = packed[page * width : (page + 1) * width]
+    image = Image.frombytes("1", (height, width), bytes(col_major))
+    return image.transpose(Image.Transpose.ROTATE_90)
+
+
+def page_segments(old: bytes, new: bytes, width: int, merge_gap: int = 6) -> list[PageSegment]:
+    """逐页比较两份页格式缓冲，返回需要重写的列区间。
+
+    同一页内间隔不超过 merge_gap 列的变化合并为一段，避免为零星几列多付一次寻址命令。
+    """
+    segments: list[PageSegment] = []
+    for page in range(len(new) // width):
+        start = page * width
+        end = start + width
+        if old[start:end] == new[start:end]:
+            continue
+        seg_start = -1
+        last = -1
+        for col in range(width):
+            if old[start + col] == new[start + col]:
+                continue
+            if seg_start < 0:
+                seg_start = col
+            elif col - last - 1 > merge_gap:
+                segments.append((page, seg_start, last + 1))
+                seg_start = col
+            last = col
+        segments.append((page, seg_start, last + 1))
+    return segments
+
+
+def clip_rect(rect: Rect, size: tuple[int, int]) -> Optional[Rect]:
+    """把矩形裁剪到画布内；完全落在画布外时返回 None。"""
+    x0, y0, x1, y1 = rect
+    width, height = size
+    x0, y0 = max(x0, 0), max(y0, 0)
+    x1, y1 = min(x1, width), min(y1, height)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1, y1)
+
+
+def rect_segments(
+    rects: list[Rect], width: int, height: int, merge_gap: int = 6
+) -> list[PageSegment]:
+    """把像素矩形换算为 OLED 页段：矩形覆盖的每一页取其列区间，同页重叠或相近的区间合并。"""
+    spans: dict[int, list[tuple[int, int]]] = {}
+    for rect in rects:
+        clipped = clip_rect(rect, (width, height))
+        if clipped is None:
+            continue
+        x0, y0, x1, y1 = clipped
+        for page in range(y0 // 8, (y1 - 1) // 8 + 1):
+            spans.setdefault(page, []).append((x0, x1))
+    segments: list[PageSegment] = []
+    for page in sorted(spans):
+        merged: list[list[int]] = []
+        for c0, c1 in sorted(spans[page]):
+            if merged and c0 - merged[-1][1] <= merge_gap:
+                merged[-1][1] = max(merged[-1][1], c1)
+            else:
+                merged.append([c0, c1])
+        segments.extend((page, c0, c1) for c0, c1 in merged)
+    return segments
@@ -0,0 +1,291 @@
+"""声明式版面：固定矩形上的小部件各自带脏标记与渲染缓存，只重绘变化的部分。
+
+以 list[str] 整屏重画时，任何一行变化都要重新渲染整帧，再由 dirty_rects 逐像素比对
+找回变化区域。Layout 把屏幕划分为固定矩形上的小部件（文本、仪表、趋势图、图标、
+进度条）：
+
+- update() 只在小部件的「显示键」变化时置脏（如进度条只在填充像素数变化时）；
+- compose() 只重新渲染脏的小部件，贴到常驻的整帧上，并返回这些小部件的矩形；
+- 返回的矩形交给 commit_frame(frame, dirty=...)，显示层据此直接传输，省去整帧比对。
+
+用法::
+
+    layout = Layout((128, 64), mode="1")
+    layout.add("cpu", TextWidget((0, 0, 128, 10)))
+    layout.add("load", ProgressWidget((0, 54, 128, 64)))
+    layout.update(cpu="CPU: 12.0%", load=12.0)
+    frame, dirty = layout.compose()
+    oled.commit_frame(OledDisplayId.LEFT, frame, dirty=dirty)
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Hashable, Iterable, Mapping, Optional
+
+from PIL import Image, ImageDraw
+
+from rascode.utils.timing import stage_timings
+
+from .base import DisplayError
+from .framebuffer import Rect
+from .text import TextRenderer
+from .widgets import Sparkline, _Series
+
+_UNSET = object()
+
+
+class Widget:
+    """固定矩形上的小部件基类。子类实现 _draw，可覆写 _display_key 决定哪些值变化需要重画。"""
+
+    def __init__(self, rect: Rect, fill: Any = None) -> None:
+        x0, y0, x1, y1 = rect
+        if x1 <= x0 or y1 <= y0:
+            raise DisplayError(f"小部件矩形无效: {rect}")
+        self.rect = rect
+        self.fill = fill  # None 表示使用版面的前景色
+        self.dirty = True
+        self._value: Any = None
+        self._key: Any = _UNSET
+        self._tile: Optional[Image.Image] = None
+
+    @property
+    def size(self) -> tuple[int, int]:
+        x0, y0, x1, y1 = self.rect
+        return x1 - x0, y1 - y0
+
+    @property
+    def value(self) -> Any:
+        return self._value
+
+    def update(self, value: Any) -> bool:
+        """设置新值；显示键变化时置脏并返回 True。"""
+        self._value = value
+        key = self._display_key(value)
+        if key == self._key:
+            return False
+        self._key = key
+        self.dirty = True
+        return True
+
+    def invalidate(self) -> None:
+        self.dirty = True
+
+    def render(self, layout: "Layout") -> Image.Image:
+        """返回小部件的位图；只在脏或尚无缓存时重新绘制。"""
+        if self._tile is None or self.dirty:
+            tile = Image.new(layout.mode, self.size, layout.background)
+            self._draw(tile, self._value, layout)
+            self._tile = tile
+            self.dirty = False
+        return self._tile
+
+    def _display_key(self, value: Any) -> Hashable:
+        return value
+
+    def _draw(self, tile: Image.Image, value: Any, layout: "Layout") -> None:
+        raise NotImplementedError
+
+
+class TextWidget(Widget):
+    """一行或多行文本；值为 str 或 str 序列。"""
+
+    def __init__(
+        self,
+        rect: Rect,
+        line_height: int = 10,
+        max_chars: Optional[int] = None,
+        fill: Any = None,
+    ) -> None:
+        super().__init__(rect, fill)
+        self.line_height = line_height
+        self.max_chars = max_chars
+
+    def _display_key(self, value: Any) -> Hashable:
+        if value is None:
+            return ()
+        return (value,) if isinstance(value, str) else tuple(value)
+
+    def _draw(self, tile: Image.Image, value: Any, layout: "Layout") -> None:
+        lines = self._display_key(value)
+        layout.text.draw_lines(tile, lines, self.line_height, layout.color(self), self.max_chars)
+
+
+def _fraction(value: Optional[float], lo: float, hi: float) -> float:
+    if value is None or value != value:
+        return 0.0
+    span = hi - lo if hi > lo else 1.0
+    return min(max((value - lo) / span, 0.0), 1.0)
+
+
+class ProgressWidget(Widget):
+    """水平进度条：外框加按比例填充的内条，只在填充像素数变化时重画。"""
+
+    def __init__(self, rect: Rect, lo: float = 0.0, hi: float = 100.0, fill: Any = None) -> None:
+        super().__init__(rect, fill)
+        self.lo = lo
+        self.hi = hi
+
+    def _display_key(self, value: Any) -> Hashable:
+        inner = self.size[0] - 4
+        return round(_fraction(value, self.lo, self.hi) * inner)
+
+    def _draw(self, tile: Image.Image, value: Any, layout: "Layout") -> None:
+        w, h = tile.size
+        color = layout.color(self)
+        draw = ImageDraw.Draw(tile)
+        draw.rectangle((0, 0, w - 1, h - 1), outline=color)
+        filled = self._display_key(value)
+        if filled > 0 and h > 4:
+            draw.rectangle((2, 2, 1 + filled, h - 3), fill=color)
+
+
+class GaugeWidget(Widget):
+    """半圆仪表：上半圆外框，从左侧起按比例填充扇形，按整度数判断是否重画。"""
+
+    def __init__(self, rect: Rect, lo: float = 0.0, hi: float = 100.0, fill: Any = None) -> None:
+        super().__init__(rect, fill)
+        self.lo = lo
+        self.hi = hi
+
+    def _display_key(self, value: Any) -> Hashable:
+        return round(_fraction(value, self.lo, self.hi) * 180)
+
+    def _draw(self, tile: Image.Image, value: Any, layout: "Layout") -> None:
+        w, h = tile.size
+        # 外接正方形的上半部分即半圆；受限于宽高中较小的一边
+        r = min(w // 2, h) - 1
+        cx = w // 2
+        box = (cx - r, h - 1 - r, cx + r, h - 1 + r)
+        color = layout.color(self)
+        draw = ImageDraw.Draw(tile)
+        degrees = self._display_key(value)
+        if degrees > 0:
+            draw.pieslice(box, 180, 180 + degrees, fill=color)
+        draw.arc(box, 180, 360, fill=color)
+        draw.line((cx - r, h - 1, cx + r, h - 1), fill=color)
+
+
+class SparklineWidget(Widget):
+    """指标趋势图：值为数据的版本号（如 MetricsCollector.sample_once() 的返回值），变化时重画。"""
+
+    def __init__(
+        self,
+        rect: Rect,
+        series: _Series,
+        lo: float = 0.0,
+        hi: Optional[float] = 100.0,
+        filled: bool = False,
+        fill: Any = None,
+    ) -> None:
+        super().__init__(rect, fill)
+        self.series = series
+        self._lo = lo
+        self._hi = hi
+        self._filled = filled
+        self._sparkline: Optional[Sparkline] = None
+
+    def _draw(self, tile: Image.Image, value: Any, layout: "Layout") -> None:
+        if self._sparkline is None:
+            w, h = self.size
+            self._sparkline = Sparkline(w, h, self._lo, self._hi, layout.color(self), self._filled)
+        self._sparkline.draw(tile, (0, 0), self.series)
+
+
+class IconWidget(Widget):
+    """图标：值为 icons 中的键，None 或未知键时留空。图标为 "1"/"L" 遮罩，按前景色着色。"""
+
+    def __init__(self, rect: Rect, icons: Mapping[Hashable, Image.Image], fill: Any = None) -> None:
+        super().__init__(rect, fill)
+        self.icons = dict(icons)
+
+    def _draw(self, tile: Image.Image, value: Any, layout: "Layout") -> None:
+        icon = self.icons.get(value)
+        if icon is None:
+            return
+        w = min(icon.width, tile.width)
+        h = min(icon.height, tile.height)
+        mask = icon if (w, h) == icon.size else icon.crop((0, 0, w, h))
+        tile.paste(layout.color(self), (0, 0, w, h), mask)
+
+
+class Layout:
+    """一块屏的版面：按名称管理小部件，compose() 返回整帧与本次重绘的矩形。
+
+    mode 与屏幕一致（OLED 为 "1"，主屏为 "RGB"）；name 用于 stage_timings 的屏幕名。
+    """
+
+    def __init__(
+        self,
+        size: tuple[int, int],
+        mode: str = "1",
+        fill: Any = 255,
+        background: Any = 0,
+        text: Optional[TextRenderer] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        self.size = size
+        self.mode = mode
+        self.fill = fill
+        self.background = background
+        self.name = name
+        self.text = text or TextRenderer(mode="1" if mode == "1" else "L")
+        self._widgets: dict[str, Widget] = {}
+        self._frame = Image.new(mode, size, background)
+
+    def add(self, name: str, widget: Widget) -> Widget:
+        """加入小部件；矩形必须落在屏幕内且名称不重复。"""
+        x0, y0, x1, y1 = widget.rect
+        if x0 < 0 or y0 < 0 or x1 > self.size[0] or y1 > self.size[1]:
+            raise DisplayError(f"小部件 {name} 超出屏幕范围: {widget.rect}")
+        if name in self._widgets:
+            raise DisplayError(f"小部件 {name} 已存在。")
+        self._widgets[name] = widget
+        return widget
+
+    def __getitem__(self, name: str) -> Widget:
+        return self._widgets[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._widgets
+
+    def widgets(self) -> Iterable[tuple[str, Widget]]:
+        return self._widgets.items()
+
+    def color(self, widget: Widget) -> Any:
+        return self.fill if widget.fill is None else widget.fill
+
+    def update(self, **values: Any) -> list[str]:
+        """批量设置小部件的值，返回因此变脏的小部件名。"""
+        changed = []
+        for name, value in values.items():
+            widget = self._widgets.get(name)
+            if widget is None:
+                raise DisplayError(f"未知的小部件: {name}")
+            if widget.update(value):
+                changed.append(name)
+        return changed
+
+    def dirty_rects(self) -> list[Rect]:
+        """当前脏小部件的矩形。"""
+        return [w.rect for w in self._widgets.values() if w.dirty]
+
+    def invalidate(self) -> None:
+        """全部置脏，下一次 compose() 重绘整屏。"""
+        for widget in self._widgets.values():
+            widget.invalidate()
+
+    def compose(self) -> tuple[Image.Image, list[Rect]]:
+        """只重绘脏的小部件，返回 (整帧副本, 重绘的矩形)。没有变化时矩形列表为空。"""
+        t0 = time.perf_counter()
+        rects: list[Rect] = []
+        frame = self._frame
+        for widget in self._widgets.values():
+            if not widget.dirty:
+                continue
+            frame.paste(widget.render(self), widget.rect[:2])
+            rects.append(widget.rect)
+        if self.name is not None:
+            stage_timings.record(self.name, "render", time.perf_counter() - t0)
+        # 返回副本：异步刷屏线程可能仍持有上一帧
+        return frame.copy(), rects
@@ -9,8 +9,10 @@
 from __future__ import annotations
 
 import os
+import threading
 import time
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field, replace
 from typing import Any, Optional
 
 from PIL import Image
@@ -18,13 +20,29 @@ from PIL import Image
 try:
     from luma.core.interface.serial import spi
     from luma.lcd.device import st7789
-    from luma.core.render import canvas
 except ImportError:  # pragma: no cover - 仅在未安装依赖时触发
     spi = None  # type: ignore[assignment]
     st7789 = None  # type: ignore[assignment]
-    canvas = None  # type: ignore[assignment]
+
+from rascode.utils.lru import CacheStats
+from rascode.utils.timing import stage_timings
 
 from .base import BaseDisplay, DisplayError
+from .flush import LatestFrameFlusher
+from .framebuffer import FrameStats, Rect, clip_rect, dirty_rects, frame_digest
+from .rgb565 import COLMOD_RGB565, SpidevWriter, rgb565_available, to_rgb565, window_bytes
+from .text import TextRenderer
+
+# luma 的 st7789 以 COLMOD=0x06（18bit）发送，每像素 3 字节；RGB565 快速通道为 2 字节
+_BYTES_PER_PIXEL = 3
+_BYTES_PER_PIXEL_RGB565 = 2
+# 每个地址窗口的命令开销：CASET(1+4) + RASET(1+4) + RAMWR(1)
+_WINDOW_OVERHEAD_BYTES = 11
+# ST7789 垂直滚动：VSCRDEF 定义滚动区，VSCSAD 设置滚动起始行，NORON 退出滚动模式
+_VSCRDEF = 0x33
+_VSCSAD = 0x37
+_NORON = 0x13
+_VSCSAD_OVERHEAD_BYTES = 3
 
 
 def _default_spi_speed_hz() -> int:
@@ -38,6 +56,11 @@ def _default_spi_speed_hz() -> int:
     return 2_000_000  # 默认 2MHz，尽量减轻花屏
 
 
+def _default_rgb565() -> bool:
+    """环境变量 RASCODE_LCD_RGB565=1 启用 NumPy RGB565 快速通道。"""
+    return os.environ.get("RASCODE_LCD_RGB565", "").strip() in ("1", "true", "yes")
+
+
 @dataclass
 class LcdConfig:
     """2 寸 ST7789 主屏配置。"""
@@ -52,13 +75,29 @@ class LcdConfig:
     rotation: int = 0  # 取值通常为 0/90/180/270
     reset_hold_s: float = 0.1  # 复位低电平保持时间
     reset_release_s: float = 0.15  # 复位释放后等待再初始化
+    partial_update: bool = True  # 与影子帧缓冲比对，只传变化区域
+    partial_band_rows: int = 16  # 脏矩形按多少行为一条带切分
+    rgb565: Optional[bool] = None  # None 表示用 _default_rgb565()；需要 numpy，否则回退 luma 路径
+    spi_block_size: int = 0  # RGB565 直写时单次 writebytes2 的字节数，0 表示整块交给 spidev
+    async_flush: bool = False  # 渲染后交给后台线程传输，调用方立即返回（最新帧优先）
+    console_line_height: int = 14  # 控制台模式下每行像素高度
+
+
+@dataclass
+class _ConsoleState:
+    """控制台模式状态：显存中的行槽位按环形使用，硬件滚动决定哪一槽显示在顶部。"""
+
+    rows: int
+    line_height: int
+    count: int = 0  # 累计写入的行数
+    lines: deque = field(default_factory=deque)  # 当前可见行（最多 rows 行）
 
 
 class LcdHatMainDisplay(BaseDisplay):
     """HAT 主屏显示封装。"""
 
     def __init__(self, config: Optional[LcdConfig] = None) -> None:
-        if spi is None or st7789 is None or canvas is None:
+        if spi is None or st7789 is None:
             raise DisplayError(
                 "未找到 luma.lcd 相关依赖。\n"
                 "请在树莓派上安装：\n"
@@ -67,25 +106,41 @@ class LcdHatMainDisplay(BaseDisplay):
             )
         raw = config or LcdConfig()
         speed = raw.spi_speed_hz or _default_spi_speed_hz()
-        self._config = LcdConfig(
-            width=raw.width,
-            height=raw.height,
-            spi_port=raw.spi_port,
-            spi_device=raw.spi_device,
-            spi_speed_hz=speed,
-            gpio_dc=raw.gpio_dc,
-            gpio_rst=raw.gpio_rst,
-            rotation=raw.rotation,
-            reset_hold_s=raw.reset_hold_s,
-            reset_release_s=raw.reset_release_s,
-        )
+        use_rgb565 = _default_rgb565() if raw.rgb565 is None else raw.rgb565
+        self._config = replace(raw, spi_speed_hz=speed, rgb565=use_rgb565 and rgb565_available())
         self._device = None
+        self._writer: Optional[SpidevWriter] = None  # 仅 RGB565 模式下使用
+        self._shadow: Optional[Image.Image] = None  # 上一帧已提交内容（设备坐标）
+        self._digest: Optional[bytes] = None  # 上一帧已提交内容的指纹
+        self._stats = FrameStats()
+        self._text = TextRenderer(mode="L")
+        self._bus_lock = threading.RLock()  # 串行化 SPI 传输（调用线程与刷屏线程之间）
+        self._flusher: Optional[LatestFrameFlusher] = None
+        self._console: Optional[_ConsoleState] = None
 
     @classmethod
     def from_config(cls, config: LcdConfig) -> "LcdHatMainDisplay":
         return cls(config=config)
 
     def init(self) -> None:
+        self._device = self._create_device()
+        # 与官方 C 例程对齐：luma 默认 MADCTL=0x70，Waveshare 2 寸屏用 0x00，否则易花屏
+        self._device.command(0x36, 0x00)  # MADCTL: 与 LCD_2inch.c 一致
+        if self._config.rgb565:
+            self._device.command(0x3A, COLMOD_RGB565)  # COLMOD: 16bit/pixel
+            self._writer = SpidevWriter(
+                self._device._serial_interface, block_size=self._config.spi_block_size
+            )
+        time.sleep(0.1)
+        self._invalidate()
+        self.clear()
+        time.sleep(0.05)
+        self._invalidate()  # 强制第二次整屏发送
+        self.clear()  # 再清一次，减少首帧花屏
+        if self._config.async_flush and self._flusher is None:
+            self._flusher = LatestFrameFlusher(self._commit, name="rascode-lcd-flush")
+
+    def _create_device(self):
         serial = spi(
             port=self._config.spi_port,
             device=self._config.spi_device,
@@ -96,61 +151,250 @@ class LcdHatMainDisplay(BaseDisplay):
             reset_release_time=self._config.reset_release_s,
             spi_mode=0,  # 与官方说明一致：第一下降沿采样
         )
-        self._device = st7789(
+        return st7789(
             serial,
             width=self._config.width,
             height=self._config.height,
             rotate=self._config.rotation,
         )
-        # 与官方 C 例程对齐：luma 默认 MADCTL=0x70，Waveshare 2 寸屏用 0x00，否则易花屏
-        self._device.command(0x36, 0x00)  # MADCTL: 与 LCD_2inch.c 一致
-        time.sleep(0.1)
-        self.clear()
-        time.sleep(0.05)
-        self.clear()  # 再清一次，减少首帧花屏
+
+    def transfer_stats(self) -> FrameStats:
+        """返回帧传输统计（副本），含发送/跳过/被新帧替换的帧数与节省的字节数。"""
+        stats = replace(self._stats)
+        if self._flusher is not None:
+            stats.frames_superseded = self._flusher.frames_superseded
+        return stats
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """等待后台刷屏线程空闲；同步模式下立即返回 True。"""
+        if self._flusher is None:
+            return True
+        return self._flusher.wait_idle(timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """确保已提交的帧已经上屏；后台传输出错或超时抛出 DisplayError。"""
+        if self._flusher is not None:
+            self._flusher.flush(timeout)
+
+    def text_cache_stats(self) -> CacheStats:
+        """文本行缓存命中统计。"""
+        return self._text.stats()
+
+    def _invalidate(self) -> None:
+        """丢弃影子帧与指纹，下一帧整屏发送。"""
+        self._shadow = None
+        self._digest = None
 
     def clear(self) -> None:
         if self._device is None:
             return
         # 用黑色填充整屏
-        with canvas(self._device) as draw:  # type: ignore[misc]
-            draw.rectangle(
-                (0, 0, self._config.width, self._config.height),
-                fill="black",
-                outline="black",
-            )
-        self._device.show()  # type: ignore[attr-defined]
+        self._submit(Image.new("RGB", self._device.size, "black"))
 
     def shutdown(self) -> None:
         self.clear()
+        if self._flusher is not None:
+            self._flusher.stop()
+            self._flusher = None
 
     def show_lines(self, lines: list[str], line_height: int = 14) -> None:
         """在主屏上显示多行文本（等宽、白字黑底）。"""
+        self._submit(self.render_lines(lines, line_height))
+
+    def render_lines(self, lines: list[str], line_height: int = 14) -> Image.Image:
+        """只渲染不传输：返回一帧多行文本图像（等宽、白字黑底）。"""
         if self._device is None:
             raise DisplayError("LCD 未初始化，请先调用 init()。")
-        with canvas(self._device) as draw:  # type: ignore[misc]
-            draw.rectangle(
-                (0, 0, self._config.width, self._config.height),
-                fill="black",
-                outline="black",
-            )
-            for i, line in enumerate(lines):
-                y = i * line_height
-                if y >= self._config.height:
-                    break
-                # 截断过长行，避免溢出
-                draw.text((0, y), line[:42], fill="white")  # type: ignore[attr-defined]
-        self._device.show()  # type: ignore[attr-defined]
+        t0 = time.perf_counter()
+        image = Image.new("RGB", self._device.size, "black")
+        # 截断过长行，避免溢出；行位图来自缓存，重复的行不再重新栅格化
+        self._text.draw_lines(image, lines, line_height, fill="white", max_chars=42)
+        stage_timings.record("main", "render", time.perf_counter() - t0)
+        return image
+
+    def commit_frame(self, image: Image.Image, dirty: Optional[list[Rect]] = None) -> None:
+        """把已渲染的一帧送上屏幕，返回时已上屏（异步模式下会等待刷屏线程）。
+
+        dirty 为调用方已知的全部变化区域（如 Layout.compose() 的返回值）：给出时直接按
+        这些矩形传输，省去指纹与整帧比对。异步模式下帧可能被合并，此提示会被忽略。
+        """
+        self._submit(image, dirty)
+        self.flush()
 
     def show_image(self, image: Any) -> None:
         """显示一张 PIL Image 图像，自动缩放/旋转以适配屏幕。"""
+        self._submit(self.render_image(image))
+
+    def render_image(self, image: Any) -> Image.Image:
+        """只转换不传输：把 PIL Image 转为 RGB 并缩放到屏幕尺寸。"""
         if self._device is None:
             raise DisplayError("LCD 未初始化，请先调用 init()。")
         if not isinstance(image, Image.Image):
             raise DisplayError("LcdHatMainDisplay 目前仅支持 PIL.Image.Image 类型。")
 
         # 调整尺寸以适配屏幕
-        img = image.convert("RGB")
-        img = img.resize((self._config.width, self._config.height))
-        self._device.display(img)  # type: ignore[call-arg]
+        t0 = time.perf_counter()
+        img = image.convert("RGB").resize(self._device.size)
+        stage_timings.record("main", "convert", time.perf_counter() - t0)
+        return img
+
+    def _submit(self, image: Image.Image, dirty: Optional[list[Rect]] = None) -> None:
+        """异步模式交给刷屏线程（替换未传输的旧帧），否则在当前线程直接传输。"""
+        if self._flusher is not None:
+            # 被替换的旧帧的脏区会丢失，只能由刷屏线程整帧比对
+            self._flusher.submit(image)
+        else:
+            self._commit(image, dirty)
+
+    def _commit(self, image: Image.Image, dirty: Optional[list[Rect]] = None) -> None:
+        """把一帧送上 SPI：指纹相同则跳过，否则与影子帧比对，只按地址窗口重传脏矩形。"""
+        with self._bus_lock:
+            self._commit_locked(image, dirty)
+
+    def _hint_usable(self, image: Image.Image) -> bool:
+        """脏区提示以帧坐标给出，只在未旋转且影子帧与本帧同尺寸时可直接使用。"""
+        shadow = self._shadow
+        return (
+            self._config.partial_update
+            and self._config.rotation == 0
+            and shadow is not None
+            and shadow.size == image.size
+            and shadow.mode == image.mode
+        )
+
+    def _commit_locked(self, image: Image.Image, dirty: Optional[list[Rect]] = None) -> None:
+        if self._console is not None:
+            self._exit_console_locked()
+        t0 = time.perf_counter()
+        device = self._device
+        hinted = dirty is not None and self._hint_usable(image)
+        digest = None if hinted else frame_digest(image)
+        if (hinted and not dirty) or (not hinted and digest == self._digest):
+            self._stats.record_skip()
+            stage_timings.record("main", "diff", time.perf_counter() - t0)
+            stage_timings.record_frame("main", 0)
+            return
+        frame = device.preprocess(image)  # 旋转到设备坐标，地址窗口以设备坐标为准
+        width, height = frame.size
+        bpp = _BYTES_PER_PIXEL_RGB565 if self._writer is not None else _BYTES_PER_PIXEL
+        full_bytes = width * height * bpp + _WINDOW_OVERHEAD_BYTES
+        if hinted:
+            rects = [r for r in (clip_rect(r, frame.size) for r in dirty) if r is not None]
+        elif self._config.partial_update:
+            rects = dirty_rects(self._shadow, frame, self._config.partial_band_rows)
+        else:
+            rects = [(0, 0, width, height)]
+        t1 = time.perf_counter()
+        # RGB565 模式下整帧只做一次向量化转换，各窗口按切片取字节
+        pixels = to_rgb565(frame) if self._writer is not None and rects else None
+        t2 = time.perf_counter()
+        sent = 0
+        try:
+            for rect in rects:
+                sent += self._write_window(frame, rect, pixels)
+        except Exception:
+            # 写到一半失败时显存内容未知：丢弃影子帧，下一帧不再只按提示传输
+            self._invalidate()
+            raise
+        self._shadow = frame
+        self._digest = digest  # 按提示传输时为 None，下一次不带提示的提交会重新比对
+        partial = rects != [(0, 0, width, height)]
+        self._stats.record(sent, full_bytes, partial)
+        if rects:
+            device.show()
+        t3 = time.perf_counter()
+        stage_timings.record("main", "diff", t1 - t0)
+        if pixels is not None:
+            stage_timings.record("main", "pack", t2 - t1)
+        stage_timings.record("main", "transfer", t3 - t2)
+        stage_timings.record_frame("main", sent)
+
+    def _write_window(self, frame: Image.Image, rect: Rect, pixels: Any = None) -> int:
+        """设置列/行地址窗口并写入该区域像素，返回总线字节数。"""
+        x0, y0, x1, y1 = rect
+        self._device.set_window(x0, y0, x1, y1)
+        if pixels is not None:
+            return self._writer.write(window_bytes(pixels, rect)) + _WINDOW_OVERHEAD_BYTES
+        payload = frame.crop(rect).tobytes()
+        self._device.data(list(payload))
+        return len(payload) + _WINDOW_OVERHEAD_BYTES
+
+    # === 控制台模式（硬件垂直滚动） ===
+
+    def append_line(self, text: str, fill: Any = "white") -> None:
+        """控制台模式追加一行：只写一条行带并更新滚动起始行，不重传整屏。
+
+        首次调用时进入控制台模式（清屏并定义滚动区）；之后的 show_lines/show_image/clear
+        会自动退出控制台模式并整屏重绘。仅支持 rotation=0（行方向与面板扫描方向一致）。
+        """
+        if self._device is None:
+            raise DisplayError("LCD 未初始化，请先调用 init()。")
+        if self._config.rotation != 0:
+            raise DisplayError("控制台模式仅支持 rotation=0。")
+        self.wait_idle()  # 先让已提交的普通帧上屏，保证顺序
+        with self._bus_lock:
+            if self._console is None:
+                self._enter_console_locked()
+            self._append_locked(text[:42], fill)
+
+    def scroll(self, lines: int = 1) -> None:
+        """控制台向上滚动 lines 行（底部补空行）。"""
+        for _ in range(max(lines, 0)):
+            self.append_line("")
+
+    def console_lines(self) -> list[str]:
+        """控制台当前可见的行（自上而下）；非控制台模式返回空列表。"""
+        console = self._console
+        return list(console.lines) if console is not None else []
+
+    def _enter_console_locked(self) -> None:
+        lh = self._config.console_line_height
+        height = self._device.height
+        rows = height // lh
+        self._commit_locked(Image.new("RGB", self._device.size, "black"))
+        # 滚动区只覆盖整行槽位，余下的底部行作为固定区保持黑色
+        vsa = rows * lh
+        bfa = height - vsa
+        self._device.command(_VSCRDEF, 0, 0, vsa >> 8, vsa & 0xFF, bfa >> 8, bfa & 0xFF)
+        self._device.command(_VSCSAD, 0, 0)
+        self._console = _ConsoleState(rows=rows, line_height=lh, lines=deque(maxlen=rows))
+        # 进入后显存与影子帧不再一一对应，退出时需整屏重绘
+        self._invalidate()
+
+    def _append_locked(self, text: str, fill: Any) -> None:
+        console = self._console
+        lh = console.line_height
+        width = self._device.width
+        band = Image.new("RGB", (width, lh), "black")
+        if text:
+            self._text.draw_lines(band, [text], lh, fill=fill)
+        slot = console.count % console.rows
+        sent = self._write_region(0, slot * lh, band)
+        console.count += 1
+        console.lines.append(text)
+        if console.count >= console.rows:
+            # 最旧的一行所在槽位滚到顶部
+            top = (console.count % console.rows) * lh
+            self._device.command(_VSCSAD, top >> 8, top & 0xFF)
+            sent += _VSCSAD_OVERHEAD_BYTES
+        bpp = _BYTES_PER_PIXEL_RGB565 if self._writer is not None else _BYTES_PER_PIXEL
+        full = width * self._device.height * bpp + _WINDOW_OVERHEAD_BYTES
+        self._stats.record(sent, full, partial=True)
+
+    def _exit_console_locked(self) -> None:
+        self._device.command(_VSCSAD, 0, 0)
+        self._device.command(_NORON)
+        self._console = None
+        self._invalidate()
+
+    def _write_region(self, x0: int, y0: int, image: Image.Image) -> int:
+        """把 image 整块写到设备坐标 (x0, y0) 起的窗口，返回总线字节数。"""
+        rect = (0, 0, image.width, image.height)
+        pixels = to_rgb565(image) if self._writer is not None else None
+        self._device.set_window(x0, y0, x0 + image.width, y0 + image.height)
+        if pixels is not None:
+            return self._writer.write(window_bytes(pixels, rect)) + _WINDOW_OVERHEAD_BYTES
+        payload = image.tobytes()
+        self._device.data(list(payload))
+        return len(payload) + _WINDOW_OVERHEAD_BYTES
 
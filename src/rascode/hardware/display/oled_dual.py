@@ -7,20 +7,40 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, replace
 from enum import Enum
-from typing import Any, Iterable, List, Optional
+from typing import Any, Iterable, List, Mapping, Optional
+
+from PIL import Image
 
 try:
     from luma.core.interface.serial import i2c as luma_i2c
     from luma.oled.device import ssd1306
-    from luma.core.render import canvas
 except ImportError:  # pragma: no cover - 仅在未安装依赖时触发
     luma_i2c = None  # type: ignore[assignment]
     ssd1306 = None  # type: ignore[assignment]
-    canvas = None  # type: ignore[assignment]
+
+from rascode.utils.lru import CacheStats
+from rascode.utils.timing import stage_timings
 
 from .base import BaseDisplay, DisplayError
+from .dither import DitherMethod, dither_cached
+from .framebuffer import (
+    FrameStats,
+    Rect,
+    frame_digest,
+    pack_pages,
+    page_segments,
+    rect_segments,
+)
+from .text import TextRenderer
+
+# 每次写入的寻址命令开销：COLUMNADDR(3) + PAGEADDR(3)
+_SEGMENT_OVERHEAD_BYTES = 6
+# luma.oled 初始化 SSD1306 时写入的对比度
+DEFAULT_CONTRAST = 0xCF
 
 
 class OledDisplayId(str, Enum):
@@ -42,6 +62,9 @@ class OledConfig:
     addr_right: int = 0x3D
     width: int = 128
     height: int = 64
+    partial_update: bool = True  # 与页格式影子缓冲比对，只写变化的页段
+    merge_gap: int = 6  # 同一页内相距不超过该列数的变化合并为一段
+    dither: str = "floyd-steinberg"  # show_image 默认抖动方式：threshold / bayer / floyd-steinberg
 
 
 class DualOledDisplay(BaseDisplay):
@@ -51,7 +74,7 @@ class DualOledDisplay(BaseDisplay):
     """
 
     def __init__(self, config: Optional[OledConfig] = None) -> None:
-        if luma_i2c is None or ssd1306 is None or canvas is None:
+        if luma_i2c is None or ssd1306 is None:
             raise DisplayError(
                 "luma.oled 未安装，无法使用 DualOledDisplay。"
                 "请先执行：sudo apt-get install python3-luma.oled 或 pip install luma.oled"
@@ -59,6 +82,18 @@ class DualOledDisplay(BaseDisplay):
         self._config = config or OledConfig()
         self._left = None
         self._right = None
+        self._digests: dict[OledDisplayId, Optional[bytes]] = {
+            OledDisplayId.LEFT: None,
+            OledDisplayId.RIGHT: None,
+        }
+        self._stats = {OledDisplayId.LEFT: FrameStats(), OledDisplayId.RIGHT: FrameStats()}
+        # 每块屏已写入 GDDRAM 的页格式影子缓冲
+        self._shadows: dict[OledDisplayId, Optional[bytearray]] = {
+            OledDisplayId.LEFT: None,
+            OledDisplayId.RIGHT: None,
+        }
+        self._text = TextRenderer(mode="1")
+        self._bus_lock = threading.RLock()  # 两块屏共用一条 I²C 总线
 
     @classmethod
     def from_config(cls, config: OledConfig) -> "DualOledDisplay":
@@ -66,35 +101,98 @@ class DualOledDisplay(BaseDisplay):
 
     def init(self) -> None:
         """初始化两块 OLED 设备。"""
-        serial_left = luma_i2c(port=self._config.i2c_port, address=self._config.addr_left)
-        serial_right = luma_i2c(port=self._config.i2c_port, address=self._config.addr_right)
-        self._left = ssd1306(serial_left, width=self._config.width, height=self._config.height)
-        self._right = ssd1306(serial_right, width=self._config.width, height=self._config.height)
+        self._left = self._create_device(OledDisplayId.LEFT)
+        self._right = self._create_device(OledDisplayId.RIGHT)
+        for oled in OledDisplayId:
+            self._invalidate(oled)
         self.clear()
 
+    def _invalidate(self, oled: OledDisplayId) -> None:
+        """丢弃影子缓冲与指纹，下一帧整屏写入。"""
+        self._digests[oled] = None
+        self._shadows[oled] = None
+
+    def _create_device(self, oled: OledDisplayId):
+        addr = self._config.addr_left if oled == OledDisplayId.LEFT else self._config.addr_right
+        serial = luma_i2c(port=self._config.i2c_port, address=addr)
+        return ssd1306(serial, width=self._config.width, height=self._config.height)
+
     def clear(self) -> None:
         """两块屏全部清空。"""
-        for dev in (self._left, self._right):
+        for oled, dev in ((OledDisplayId.LEFT, self._left), (OledDisplayId.RIGHT, self._right)):
             if dev is not None:
-                dev.clear()
-                dev.show()
+                self.clear_oled(oled)
 
     def clear_oled(self, oled: OledDisplayId) -> None:
         """只清空指定一侧的 OLED。"""
         dev = self._get_device(oled)
-        dev.clear()
-        dev.show()
+        self._commit(oled, Image.new(dev.mode, dev.size))
+
+    def transfer_stats(self, oled: OledDisplayId) -> FrameStats:
+        """返回指定 OLED 的帧传输统计（副本）。"""
+        return replace(self._stats[oled])
+
+    def text_cache_stats(self) -> CacheStats:
+        """两块屏共用的文本行缓存命中统计。"""
+        return self._text.stats()
+
+    def set_contrast(self, level: int, oled: Optional[OledDisplayId] = None) -> None:
+        """设置对比度（0–255，调低可减缓 OLED 老化）；oled 为 None 时两块屏一起设置。"""
+        level = min(max(int(level), 0), 255)
+        with self._bus_lock:
+            for side in self._sides(oled):
+                self._get_device(side).contrast(level)
+
+    def set_power(self, on: bool, oled: Optional[OledDisplayId] = None) -> None:
+        """开/关显示（SSD1306 的 display on/off）。关闭期间显存与影子缓冲保留，重新打开无需重绘。"""
+        with self._bus_lock:
+            for side in self._sides(oled):
+                device = self._get_device(side)
+                if on:
+                    device.show()
+                else:
+                    device.hide()
+
+    def _sides(self, oled: Optional[OledDisplayId]) -> tuple[OledDisplayId, ...]:
+        return tuple(OledDisplayId) if oled is None else (oled,)
 
     def shutdown(self) -> None:
         """目前不需要特别释放，保留接口。"""
         self.clear()
 
     def show_image(self, image: Any) -> None:
-        """占位：当前不做通用图像显示，仅支持文本 API。
+        """显示图像：image 为 (OledDisplayId, PIL.Image) 元组，使用配置中的默认抖动方式。"""
+        if not (isinstance(image, tuple) and len(image) == 2):
+            raise DisplayError("DualOledDisplay.show_image 需要 (OledDisplayId, PIL.Image) 元组。")
+        oled, img = image
+        self.show_oled_image(oled, img)
 
-        如果后续需要，可将 image 视为 (OledDisplayId, PIL.Image) 的元组。
-        """
-        raise DisplayError("DualOledDisplay.show_image 暂未实现通用图像显示。")
+    def show_oled_image(
+        self,
+        oled: OledDisplayId,
+        image: Image.Image,
+        dither: Optional[DitherMethod] = None,
+        threshold: int = 128,
+    ) -> None:
+        """在指定 OLED 上显示任意 PIL 图像（缩放到 128×64 并转为单色）。"""
+        self._commit(oled, self.render_image(oled, image, dither, threshold))
+
+    def render_image(
+        self,
+        oled: OledDisplayId,
+        image: Image.Image,
+        dither: Optional[DitherMethod] = None,
+        threshold: int = 128,
+    ) -> Image.Image:
+        """只转换不传输：返回适配指定 OLED 的单色图像；相同源图命中转换缓存。"""
+        if not isinstance(image, Image.Image):
+            raise DisplayError("DualOledDisplay 目前仅支持 PIL.Image.Image 类型。")
+        device = self._get_device(oled)
+        method = dither or self._config.dither
+        t0 = time.perf_counter()
+        frame = dither_cached(image, device.size, method, threshold)  # type: ignore[arg-type]
+        stage_timings.record(oled.value, "convert", time.perf_counter() - t0)
+        return frame
 
     # === 文本显示便捷方法 ===
 
@@ -103,15 +201,126 @@ class DualOledDisplay(BaseDisplay):
 
         为减少依赖复杂字体，这里使用默认等宽字体。
         """
+        self._commit(oled, self.render_lines(oled, lines))
+
+    def render_lines(self, oled: OledDisplayId, lines: Iterable[str]) -> Image.Image:
+        """只渲染不传输：返回指定 OLED 的一帧文本图像。"""
         device = self._get_device(oled)
         # 行高简单设为 10 像素，可根据字体调整
         line_height = 10
-        with canvas(device) as draw:  # type: ignore[misc]
-            for idx, line in enumerate(lines):
-                y = idx * line_height
-                if y >= self._config.height:
-                    break
-                draw.text((0, y), line, fill=255)
+        t0 = time.perf_counter()
+        image = Image.new(device.mode, device.size)
+        self._text.draw_lines(image, lines, line_height, fill=255)
+        stage_timings.record(oled.value, "render", time.perf_counter() - t0)
+        return image
+
+    def commit_frame(
+        self, oled: OledDisplayId, image: Image.Image, dirty: Optional[list[Rect]] = None
+    ) -> None:
+        """把已渲染的一帧写到指定 OLED。
+
+        dirty 为调用方已知的全部变化区域（如 Layout.compose() 的返回值）：给出时只比对
+        这些矩形覆盖的页段，省去指纹与整帧逐页比对。
+        """
+        self._commit(oled, image, dirty)
+
+    def commit_pair(
+        self,
+        frames: dict[OledDisplayId, Image.Image],
+        dirty: Optional[Mapping[OledDisplayId, list[Rect]]] = None,
+    ) -> dict[OledDisplayId, float]:
+        """在一次总线占用内背靠背写入多块屏，返回每块屏耗时（秒）。dirty 按屏给出脏区提示。"""
+        timings: dict[OledDisplayId, float] = {}
+        hints = dirty or {}
+        with self._bus_lock:
+            for oled, image in frames.items():
+                start = time.perf_counter()
+                self._commit(oled, image, hints.get(oled))
+                timings[oled] = time.perf_counter() - start
+        return timings
+
+    def _commit(
+        self, oled: OledDisplayId, image: Image.Image, dirty: Optional[list[Rect]] = None
+    ) -> None:
+        """把一帧写到指定 OLED。
+
+        与上一帧指纹相同则跳过；否则打包为页格式，与影子缓冲逐页比对，
+        只按列/页寻址写入变化的段。
+        """
+        with self._bus_lock:
+            self._commit_locked(oled, image, dirty)
+
+    def _commit_locked(
+        self, oled: OledDisplayId, image: Image.Image, dirty: Optional[list[Rect]] = None
+    ) -> None:
+        screen = oled.value
+        stats = self._stats[oled]
+        t0 = time.perf_counter()
+        shadow = self._shadows[oled]
+        # 影子缓冲存在时才能只写提示的区域；提示以帧坐标给出，OLED 不做旋转
+        hinted = dirty is not None and shadow is not None and self._config.partial_update
+        digest = None if hinted else frame_digest(image)
+        if (hinted and not dirty) or (not hinted and digest == self._digests[oled]):
+            stats.record_skip()
+            stage_timings.record(screen, "diff", time.perf_counter() - t0)
+            stage_timings.record_frame(screen, 0)
+            return
+        device = self._get_device(oled)
+        frame = device.preprocess(image)
+        width = frame.width
+        packed = pack_pages(frame)
+        full = len(packed) + _SEGMENT_OVERHEAD_BYTES
+        segments = None
+        if hinted and len(shadow) == len(packed):
+            # 只比对提示区域覆盖的页段，内容未变的段（如文本重画出相同像素）不写
+            candidates = rect_segments(dirty, width, frame.height, self._config.merge_gap)
+            segments = [
+                (page, c0, c1)
+                for page, c0, c1 in candidates
+                if shadow[page * width + c0 : page * width + c1]
+                != packed[page * width + c0 : page * width + c1]
+            ]
+        elif shadow is not None and self._config.partial_update:
+            segments = page_segments(shadow, packed, width, self._config.merge_gap)
+        t1 = time.perf_counter()
+        try:
+            if segments is None:
+                sent = self._write_segment(
+                    device, packed, width, 0, len(packed) // width - 1, 0, width
+                )
+            else:
+                sent = 0
+                for page, c0, c1 in segments:
+                    sent += self._write_segment(device, packed, width, page, page, c0, c1)
+        except Exception:
+            # 写到一半失败时 GDDRAM 内容未知：丢弃影子缓冲，下一帧不再只按提示写入
+            self._invalidate(oled)
+            raise
+        self._shadows[oled] = packed
+        self._digests[oled] = digest
+        stats.record(sent, full, partial=segments is not None)
+        t2 = time.perf_counter()
+        stage_timings.record(screen, "diff", t1 - t0)
+        stage_timings.record(screen, "transfer", t2 - t1)
+        stage_timings.record_frame(screen, sent)
+
+    @staticmethod
+    def _write_segment(
+        device: Any, packed: bytearray, width: int, page0: int, page1: int, c0: int, c1: int
+    ) -> int:
+        """以列/页寻址写入 [page0, page1] × [c0, c1) 区域，返回总线字节数。"""
+        const = device._const
+        colstart = device._colstart
+        device.command(
+            const.COLUMNADDR, colstart + c0, colstart + c1 - 1,
+            const.PAGEADDR, page0, page1,
+        )  # fmt: skip
+        if page0 == page1:
+            payload = packed[page0 * width + c0 : page0 * width + c1]
+        else:
+            payload = packed[page0 * width : (page1 + 1) * width]
+        device.data(list(payload))
+        return len(payload) + _SEGMENT_OVERHEAD_BYTES
 
     def _get_device(self, oled: OledDisplayId):
         if oled == OledDisplayId.LEFT:
@@ -0,0 +1,75 @@
+"""主屏 RGB565 快速通道：NumPy 向量化像素转换 + spidev 直写。
+
+luma 的 st7789 默认以 18bit（每像素 3 字节）发送，且每帧先把字节转成 Python list
+再按 4096 字节切块写出，在 Pi Zero 上这部分 CPU 开销比渲染本身还大。
+本模块把整帧一次性转换为大端 RGB565（每像素 2 字节），并以 memoryview 直接交给
+spidev.writebytes2，避免中间 list 与逐块拷贝。未安装 numpy 时不可用，由调用方回退。
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from PIL import Image
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - 仅在未安装 numpy 时触发
+    np = None  # type: ignore[assignment]
+
+# COLMOD (3Ah) 参数：0x05 = 16bit/pixel（RGB565）
+COLMOD_RGB565 = 0x05
+
+
+def rgb565_available() -> bool:
+    """当前环境是否可用 RGB565 快速通道（需要 numpy）。"""
+    return np is not None
+
+
+def to_rgb565(image: Image.Image) -> "np.ndarray":
+    """把 RGB 图像整帧转换为 (h, w) 的大端 uint16 数组。"""
+    if np is None:
+        raise RuntimeError("RGB565 快速通道需要 numpy：pip install numpy")
+    rgb = np.asarray(image.convert("RGB"), dtype=np.uint16)
+    packed = ((rgb[..., 0] & 0xF8) << 8) | ((rgb[..., 1] & 0xFC) << 3) | (rgb[..., 2] >> 3)
+    return packed.astype(">u2")
+
+
+def window_bytes(pixels: "np.ndarray", rect: tuple[int, int, int, int]) -> memoryview:
+    """取出地址窗口内的像素字节；整行宽的窗口为零拷贝视图。"""
+    x0, y0, x1, y1 = rect
+    block = np.ascontiguousarray(pixels[y0:y1, x0:x1])
+    return memoryview(block.view(np.uint8)).cast("B")
+
+
+class SpidevWriter:
+    """绕过 luma 的 list 转换，直接把像素缓冲写入 spidev。
+
+    serial 为 luma 的 spi 接口对象；若其底层 spidev 不支持 writebytes2
+    （旧版 spidev 或测试替身），回退到 serial.data()。
+    """
+
+    def __init__(self, serial: Any, block_size: int = 0) -> None:
+        self._serial = serial
+        spi_dev = getattr(serial, "_spi", None)
+        self._write = getattr(spi_dev, "writebytes2", None)
+        self._block_size = block_size
+
+    @property
+    def direct(self) -> bool:
+        """是否走 spidev 直写。"""
+        return self._write is not None
+
+    def write(self, payload: memoryview) -> int:
+        """写出像素数据（DC 拉高为数据模式），返回字节数。"""
+        n = len(payload)
+        if self._write is None:
+            self._serial.data(list(payload))
+            return n
+        serial = self._serial
+        if serial._DC:
+            serial._gpio.output(serial._DC, serial._data_mode)
+        step = self._block_size or n
+        for i in range(0, n, step):
+            self._write(payload[i : i + step])
+        return n
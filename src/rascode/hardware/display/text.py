@@ -0,0 +1,96 @@
+"""文本行渲染缓存：按 (文本, 字体, 颜色, 模式) 缓存整行位图。
+
+仪表盘上大部分行（"CPU:"、"MEM:"、"IP ..."）逐帧重复，没有必要每次都经
+ImageDraw.text 重新栅格化。整行仍由 ImageDraw.text 一次绘制（保留字距调整与
+负左侧轴，与直接绘制逐像素一致），结果放入有内存预算的 LRU；画面合成时只需一次 paste。
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+
+from PIL import Image, ImageDraw, ImageFont
+
+from rascode.utils.lru import CacheStats, LruCache
+
+# 行位图缓存默认预算：LCD 一整屏 22 行 × 240 × 14 的 L 位图约 74KB，留足余量
+DEFAULT_LINE_CACHE_BYTES = 256 * 1024
+
+
+def _font_key(font: Any) -> tuple:
+    """字体标识：同一字族/字形 + 字号视为同一字体；位图字体按对象区分。"""
+    getname = getattr(font, "getname", None)
+    if getname is None:
+        return (type(font).__name__, id(font))
+    return (*getname(), getattr(font, "size", None))
+
+
+class TextRenderer:
+    """由 LRU 缓存整行位图的文本渲染器。
+
+    mode 为行位图模式：彩色 LCD 用 "L"（保留抗锯齿），OLED 用 "1"。
+    """
+
+    def __init__(
+        self,
+        font: Optional[Any] = None,
+        mode: str = "L",
+        max_bytes: int = DEFAULT_LINE_CACHE_BYTES,
+    ) -> None:
+        self._font = font or ImageFont.load_default()
+        self._mode = mode
+        self._font_key = _font_key(self._font)
+        self._lines: LruCache[Image.Image] = LruCache(max_bytes, cost=_image_bytes)
+
+    @property
+    def font(self) -> Any:
+        return self._font
+
+    def render_line(self, text: str, fill: Any = 255) -> Image.Image:
+        """返回一行文本的位图（mode 与渲染器一致），作为 paste 的遮罩使用。"""
+        key = (text, self._font_key, fill, self._mode)
+        return self._lines.get_or_create(key, lambda: self._compose(text))
+
+    def draw_lines(
+        self,
+        image: Image.Image,
+        lines: Iterable[str],
+        line_height: int,
+        fill: Any = 255,
+        max_chars: Optional[int] = None,
+    ) -> None:
+        """把多行文本逐行贴到 image 上，超出画布高度的行忽略。"""
+        for idx, line in enumerate(lines):
+            y = idx * line_height
+            if y >= image.height:
+                break
+            if max_chars is not None:
+                line = line[:max_chars]
+            if not line:
+                continue
+            mask = self.render_line(line, fill)
+            w = min(mask.width, image.width)
+            h = min(mask.height, image.height - y)
+            if w <= 0 or h <= 0:
+                continue
+            if (w, h) != mask.size:
+                mask = mask.crop((0, 0, w, h))
+            image.paste(fill, (0, y, w, y + h), mask)
+
+    def stats(self) -> CacheStats:
+        """行缓存命中统计。"""
+        return self._lines.stats()
+
+    def _compose(self, text: str) -> Image.Image:
+        # 以原点绘制整行：越过左边界的像素（负左侧轴）与直接绘制在 x=0 时一样被裁掉
+        probe = ImageDraw.Draw(Image.new(self._mode, (1, 1)))
+        _, _, right, bottom = probe.textbbox((0, 0), text, font=self._font)
+        line = Image.new(self._mode, (max(int(right), 1), max(int(bottom), 1)), 0)
+        ImageDraw.Draw(line).text((0, 0), text, fill=255, font=self._font)
+        return line
+
+
+def _image_bytes(image: Image.Image) -> int:
+    if image.mode == "1":
+        return (image.width + 7) // 8 * image.height
+    return image.width * image.height * len(image.getbands())
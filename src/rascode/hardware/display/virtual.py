@@ -0,0 +1,392 @@
+"""虚拟显示设备：在任意 Linux 主机上运行、测试与剖析三联屏，无需 SPI/I²C 硬件。
+
+虚拟串行接口替代 luma 的 spi / i2c 对象，挂在真实的 luma st7789 / ssd1306 设备类之下，
+因此 LcdHatMainDisplay / DualOledDisplay 的全部代码路径（局部刷新、RGB565、页段写入、
+硬件滚动）照常执行。接口按收到的命令与数据模拟控制器显存，framebuffer() 返回面板上
+实际显示的内容；同时统计总线事务数与字节数，并按 BusModel 估算传输耗时。
+
+选择方式：环境变量 RASCODE_DISPLAY_BACKEND=virtual（见 rascode.config 与 factory 模块），
+或直接构造 VirtualLcdDisplay / VirtualDualOledDisplay。RASCODE_VIRTUAL_REALTIME=1 时
+按总线模型真实等待，使端到端耗时接近实机。
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from PIL import Image, ImageOps
+
+try:
+    from luma.lcd.device import st7789
+except ImportError:  # pragma: no cover - 仅在未安装依赖时触发
+    st7789 = None  # type: ignore[assignment]
+
+try:
+    from luma.oled.device import ssd1306
+except ImportError:  # pragma: no cover - 仅在未安装依赖时触发
+    ssd1306 = None  # type: ignore[assignment]
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - 仅在未安装 numpy 时触发
+    np = None  # type: ignore[assignment]
+
+from .framebuffer import unpack_pages
+from .lcd_hat_main import LcdConfig, LcdHatMainDisplay
+from .oled_dual import DualOledDisplay, OledConfig, OledDisplayId
+
+# ST7789 命令
+_CASET = 0x2A
+_RASET = 0x2B
+_RAMWR = 0x2C
+_COLMOD = 0x3A
+_VSCRDEF = 0x33
+_VSCSAD = 0x37
+_NORON = 0x13
+_DISPOFF = 0x28
+_DISPON = 0x29
+
+# SSD1306 带参数命令及其参数个数（参数与命令同在命令流中发送）
+_SSD1306_ARGS = {
+    0x20: 1, 0x21: 2, 0x22: 2, 0x26: 6, 0x27: 6, 0x29: 5, 0x2A: 5, 0x81: 1, 0x8D: 1,
+    0xA3: 2, 0xA8: 1, 0xD3: 1, 0xD5: 1, 0xD9: 1, 0xDA: 1, 0xDB: 1,
+}  # fmt: skip
+
+
+def _realtime() -> bool:
+    return os.environ.get("RASCODE_VIRTUAL_REALTIME", "").strip() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class BusModel:
+    """总线速度模型：估算一次传输在真实总线上需要的时间。"""
+
+    name: str
+    clock_hz: int
+    bits_per_byte: int = 8  # I²C 每字节含 ACK 共 9 位
+    overhead_bytes: int = 0  # 每个事务额外的协议字节（I²C 地址 + 控制字节）
+    max_transfer: int = 0  # 单次传输字节上限，超出按多个事务计（spidev 默认 4096）；0 表示不限
+    transaction_s: float = 0.0  # 每个事务的固定开销（系统调用、片选切换等，估计值）
+    realtime: bool = False  # True 时虚拟接口按估算耗时真实等待
+
+    def transactions(self, nbytes: int) -> int:
+        if self.max_transfer <= 0 or nbytes <= self.max_transfer:
+            return 1
+        return -(-nbytes // self.max_transfer)
+
+    def seconds(self, nbytes: int) -> float:
+        txns = self.transactions(nbytes)
+        bits = (nbytes + txns * self.overhead_bytes) * self.bits_per_byte
+        return bits / self.clock_hz + txns * self.transaction_s
+
+
+def spi_bus(clock_hz: int = 2_000_000) -> BusModel:
+    """主屏 SPI 总线模型（默认与 LcdConfig 相同的 2MHz）。"""
+    return BusModel(
+        "spi", clock_hz, max_transfer=4096, transaction_s=20e-6, realtime=_realtime()
+    )
+
+
+def i2c_bus(clock_hz: int = 400_000) -> BusModel:
+    """双 OLED 共用的 I²C 总线模型（fast mode 400kHz）。"""
+    return BusModel(
+        "i2c", clock_hz, bits_per_byte=9, overhead_bytes=2, transaction_s=50e-6,
+        realtime=_realtime(),
+    )  # fmt: skip
+
+
+@dataclass
+class BusStats:
+    """虚拟总线上观察到的流量。"""
+
+    transactions: int = 0
+    command_bytes: int = 0
+    data_bytes: int = 0
+    modeled_s: float = 0.0  # 按 BusModel 估算的累计传输时间
+
+    @property
+    def total_bytes(self) -> int:
+        return self.command_bytes + self.data_bytes
+
+    def __add__(self, other: "BusStats") -> "BusStats":
+        return BusStats(
+            self.transactions + other.transactions,
+            self.command_bytes + other.command_bytes,
+            self.data_bytes + other.data_bytes,
+            self.modeled_s + other.modeled_s,
+        )
+
+
+class _VirtualSerial:
+    """luma 串行接口替身的公共部分：流量统计与总线耗时模型。"""
+
+    def __init__(self, bus: BusModel) -> None:
+        self.bus = bus
+        self._stats = BusStats()
+
+    def stats(self) -> BusStats:
+        return replace(self._stats)
+
+    def reset_stats(self) -> None:
+        self._stats = BusStats()
+
+    def cleanup(self) -> None:
+        pass
+
+    def _account(self, nbytes: int, command: bool) -> None:
+        stats = self._stats
+        seconds = self.bus.seconds(nbytes)
+        stats.transactions += self.bus.transactions(nbytes)
+        if command:
+            stats.command_bytes += nbytes
+        else:
+            stats.data_bytes += nbytes
+        stats.modeled_s += seconds
+        if self.bus.realtime:
+            time.sleep(seconds)
+
+
+def _rgb565_to_rgb888(data: bytes) -> bytes:
+    """大端 RGB565 → RGB888（低位补零，与面板实际显示的量化结果一致）。"""
+    if np is not None:
+        v = np.frombuffer(data, dtype=">u2").astype(np.uint16)
+        out = np.empty((v.size, 3), dtype=np.uint8)
+        out[:, 0] = (v >> 8) & 0xF8
+        out[:, 1] = (v >> 3) & 0xFC
+        out[:, 2] = (v << 3) & 0xF8
+        return out.tobytes()
+    out = bytearray()
+    for i in range(0, len(data), 2):
+        v = data[i] << 8 | data[i + 1]
+        out += bytes(((v >> 8) & 0xF8, (v >> 3) & 0xFC, (v << 3) & 0xF8))
+    return bytes(out)
+
+
+class VirtualSt7789(_VirtualSerial):
+    """ST7789 显存模拟：CASET/RASET 地址窗口、RAMWR 写入、COLMOD 像素格式与垂直滚动。
+
+    按 MADCTL=0x00 的寻址方向建模（LcdHatMainDisplay.init 会设置该值）。
+    """
+
+    def __init__(self, width: int = 240, height: int = 320, bus: Optional[BusModel] = None):
+        super().__init__(bus or spi_bus())
+        self.width = width
+        self.height = height
+        self.ram = bytearray(width * height * 3)  # RGB888
+        self.display_on = False
+        self._cmd: Optional[int] = None
+        self._params = bytearray()
+        self._window = (0, 0, width - 1, height - 1)  # 含两端
+        self._ptr = 0
+        self._pending = b""  # 跨 data() 调用未凑满一个像素的字节
+        self._bytes_per_pixel = 3  # COLMOD 0x06；0x05 时为 2
+        self._scroll: Optional[tuple[int, int, int]] = None  # (TFA, VSA, 起始行)
+        self._scroll_area = (0, height)
+
+    def command(self, *cmd: int) -> None:
+        self._account(len(cmd), command=True)
+        for c in cmd:
+            self._cmd = c
+            self._params = bytearray()
+            if c == _RAMWR:
+                self._ptr = 0
+                self._pending = b""
+            elif c == _NORON:
+                self._scroll = None
+            elif c == _DISPON:
+                self.display_on = True
+            elif c == _DISPOFF:
+                self.display_on = False
+
+    def data(self, data) -> None:
+        payload = bytes(data)
+        self._account(len(payload), command=False)
+        if self._cmd == _RAMWR:
+            self._write_pixels(payload)
+            return
+        self._params += payload
+        p = self._params
+        if self._cmd == _CASET and len(p) >= 4:
+            x0, x1 = p[0] << 8 | p[1], p[2] << 8 | p[3]
+            self._window = (x0, self._window[1], x1, self._window[3])
+        elif self._cmd == _RASET and len(p) >= 4:
+            y0, y1 = p[0] << 8 | p[1], p[2] << 8 | p[3]
+            self._window = (self._window[0], y0, self._window[2], y1)
+        elif self._cmd == _COLMOD and len(p) >= 1:
+            self._bytes_per_pixel = 2 if p[0] & 0x07 == 0x05 else 3
+        elif self._cmd == _VSCRDEF and len(p) >= 6:
+            self._scroll_area = (p[0] << 8 | p[1], p[2] << 8 | p[3])
+        elif self._cmd == _VSCSAD and len(p) >= 2:
+            tfa, vsa = self._scroll_area
+            self._scroll = (tfa, vsa, p[0] << 8 | p[1])
+
+    def _write_pixels(self, payload: bytes) -> None:
+        bpp = self._bytes_per_pixel
+        buf = self._pending + payload
+        usable = len(buf) - len(buf) % bpp
+        self._pending = buf[usable:]
+        rgb = buf[:usable] if bpp == 3 else _rgb565_to_rgb888(buf[:usable])
+        x0, y0, x1, y1 = self._window
+        w = x1 - x0 + 1
+        total = w * (y1 - y0 + 1)
+        n = len(rgb) // 3
+        pos = 0
+        while pos < n:
+            row, col = divmod(self._ptr, w)
+            if w == self.width and col == 0:
+                k = min(n - pos, total - self._ptr)  # 整行宽窗口：一次写入多行
+            else:
+                k = min(w - col, n - pos)
+            y = y0 + row
+            if y < self.height:
+                start = (y * self.width + x0 + col) * 3
+                end = min(start + k * 3, len(self.ram))
+                self.ram[start:end] = rgb[pos * 3 : pos * 3 + (end - start)]
+            pos += k
+            self._ptr = (self._ptr + k) % total
+
+    def framebuffer(self) -> Image.Image:
+        """面板当前显示的 RGB 图像（已按垂直滚动起始行重排）。"""
+        image = Image.frombytes("RGB", (self.width, self.height), bytes(self.ram))
+        if self._scroll is None:
+            return image
+        tfa, vsa, start = self._scroll
+        offset = (start - tfa) % vsa if vsa else 0
+        if not offset:
+            return image
+        area = image.crop((0, tfa, self.width, tfa + vsa))
+        shown = image.copy()
+        shown.paste(area.crop((0, offset, self.width, vsa)), (0, tfa))
+        shown.paste(area.crop((0, 0, self.width, offset)), (0, tfa + vsa - offset))
+        return shown
+
+
+class VirtualSsd1306(_VirtualSerial):
+    """SSD1306/SSD1315 GDDRAM 模拟：水平寻址模式下的列/页窗口写入、对比度与开关显示。"""
+
+    def __init__(self, width: int = 128, height: int = 64, bus: Optional[BusModel] = None):
+        super().__init__(bus or i2c_bus())
+        self.width = width
+        self.height = height
+        self.pages = height // 8
+        self.gddram = bytearray(width * self.pages)
+        self.contrast = 0x7F
+        self.display_on = False
+        self.inverted = False
+        self._columns = (0, width - 1)
+        self._page_range = (0, self.pages - 1)
+        self._col = 0
+        self._page = 0
+        self._op: Optional[int] = None
+        self._args: list[int] = []
+
+    def command(self, *cmd: int) -> None:
+        self._account(len(cmd), command=True)
+        for b in cmd:
+            self._feed(b)
+
+    def _feed(self, b: int) -> None:
+        if self._op is not None:
+            self._args.append(b)
+            if len(self._args) == _SSD1306_ARGS[self._op]:
+                op, self._op = self._op, None
+                self._apply(op, self._args)
+            return
+        if b in _SSD1306_ARGS:
+            self._op = b
+            self._args = []
+        elif b == 0xAE:
+            self.display_on = False
+        elif b == 0xAF:
+            self.display_on = True
+        elif b in (0xA6, 0xA7):
+            self.inverted = b == 0xA7
+
+    def _apply(self, op: int, args: list[int]) -> None:
+        if op == 0x21:
+            self._columns = (args[0], args[1])
+            self._col = args[0]
+        elif op == 0x22:
+            self._page_range = (args[0], args[1])
+            self._page = args[0]
+        elif op == 0x81:
+            self.contrast = args[0]
+
+    def data(self, data) -> None:
+        payload = bytes(data)
+        self._account(len(payload), command=False)
+        c0, c1 = self._columns
+        p0, p1 = self._page_range
+        pos = 0
+        while pos < len(payload):
+            k = min(c1 - self._col + 1, len(payload) - pos)
+            start = self._page * self.width + self._col
+            self.gddram[start : start + k] = payload[pos : pos + k]
+            pos += k
+            self._col += k
+            if self._col > c1:
+                self._col = c0
+                self._page = p0 if self._page >= p1 else self._page + 1
+
+    def framebuffer(self) -> Image.Image:
+        """面板当前显示的 1bpp 图像；关闭显示时为全黑。"""
+        if not self.display_on:
+            return Image.new("1", (self.width, self.height))
+        image = unpack_pages(self.gddram, self.width, self.height)
+        return ImageOps.invert(image.convert("L")).convert("1") if self.inverted else image
+
+
+class VirtualLcdDisplay(LcdHatMainDisplay):
+    """虚拟主屏：接口与 LcdHatMainDisplay 相同，传输落在 VirtualSt7789 上。"""
+
+    def __init__(self, config: Optional[LcdConfig] = None, bus: Optional[BusModel] = None):
+        super().__init__(config)
+        cfg = self._config
+        self.serial = VirtualSt7789(cfg.width, cfg.height, bus or spi_bus(cfg.spi_speed_hz))
+
+    def _create_device(self):
+        return st7789(
+            self.serial,
+            width=self._config.width,
+            height=self._config.height,
+            rotate=self._config.rotation,
+            backlight=lambda on: None,
+        )
+
+    def framebuffer(self) -> Image.Image:
+        return self.serial.framebuffer()
+
+    def bus_stats(self) -> BusStats:
+        return self.serial.stats()
+
+    def reset_bus_stats(self) -> None:
+        self.serial.reset_stats()
+
+
+class VirtualDualOledDisplay(DualOledDisplay):
+    """虚拟双 OLED：两块 VirtualSsd1306 共用一个 I²C 总线模型。"""
+
+    def __init__(self, config: Optional[OledConfig] = None, bus: Optional[BusModel] = None):
+        super().__init__(config)
+        cfg = self._config
+        bus = bus or i2c_bus()
+        self.serials = {oled: VirtualSsd1306(cfg.width, cfg.height, bus) for oled in OledDisplayId}
+
+    def _create_device(self, oled: OledDisplayId):
+        return ssd1306(self.serials[oled], width=self._config.width, height=self._config.height)
+
+    def framebuffer(self, oled: OledDisplayId) -> Image.Image:
+        return self.serials[oled].framebuffer()
+
+    def bus_stats(self, oled: Optional[OledDisplayId] = None) -> BusStats:
+        """指定一侧的流量；不指定时为整条 I²C 总线（两块屏之和）。"""
+        if oled is not None:
+            return self.serials[oled].stats()
+        return self.serials[OledDisplayId.LEFT].stats() + self.serials[OledDisplayId.RIGHT].stats()
+
+    def reset_bus_stats(self) -> None:
+        for serial in self.serials.values():
+            serial.reset_stats()
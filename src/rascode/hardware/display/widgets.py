@@ -0,0 +1,104 @@
+"""趋势图小部件：把指标环形缓冲（rascode.services.history.MetricRing）画到已渲染的帧上。
+
+每个小部件在构造时按宽度预分配取值缓冲与坐标列表，每帧只覆写其中的数值后交给
+ImageDraw 绘制：自动缩放按下标扫描，坐标列表整体传入（未用到的尾部以末点填充），
+重画时不切片、不分配新数组。OLED（"1" 模式）与 LCD（"RGB"）共用同一实现，
+颜色由 fill 决定。
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Optional, Protocol
+
+from PIL import Image, ImageDraw
+
+
+class _Series(Protocol):
+    def copy_last(self, out: array, n: Optional[int] = None) -> int: ...
+
+
+class Sparkline:
+    """折线（或 filled=True 时为柱状）趋势图，每个像素列对应一个采样点，最新的在最右侧。
+
+    lo/hi 为纵轴范围；hi 为 None 时按当前可见数据的最大值自动缩放（适合网络速率）。
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        lo: float = 0.0,
+        hi: Optional[float] = 100.0,
+        fill: Any = 255,
+        filled: bool = False,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.lo = lo
+        self.hi = hi
+        self.fill = fill
+        self.filled = filled
+        self._values = array("d", bytes(8 * width))
+        self._xy: list[float] = [0.0] * (2 * width)
+        self._bar: list[float] = [0.0] * 4  # 柱状模式下一列竖线的两个端点
+
+    def draw(self, image: Image.Image, origin: tuple[int, int], series: _Series) -> int:
+        """在 image 的 origin（左上角）处绘制，返回绘制的采样点数。"""
+        n = series.copy_last(self._values)
+        if n == 0:
+            return 0
+        values = self._values
+        lo = self.lo
+        hi = self.hi
+        if hi is None:
+            hi = lo
+            for k in range(n):  # 只看本次写入的 n 个值；缓冲尾部是上一帧留下的旧值
+                v = values[k]
+                if v > hi:  # NaN 的比较恒为 False
+                    hi = v
+        span = hi - lo if hi > lo else 1.0
+        x0 = origin[0] + self.width - n
+        bottom = origin[1] + self.height - 1
+        scale = (self.height - 1) / span
+        draw = ImageDraw.Draw(image)
+        xy = self._xy
+        points = 0
+        for k in range(n):
+            v = values[k]
+            if v != v:  # 缺失的采样：折线在此断开
+                if not self.filled and points > 1:
+                    self._stroke(draw, points)
+                points = 0
+                continue
+            y = bottom - (min(max(v, lo), lo + span) - lo) * scale
+            if self.filled:
+                bar = self._bar
+                bar[0] = bar[2] = x0 + k
+                bar[1] = bottom
+                bar[3] = round(y)
+                draw.line(bar, fill=self.fill)
+                continue
+            xy[2 * points] = x0 + k
+            xy[2 * points + 1] = round(y)
+            points += 1
+        if not self.filled:
+            self._stroke(draw, points)
+        return n
+
+    def _stroke(self, draw: ImageDraw.ImageDraw, points: int) -> None:
+        """画出坐标列表前 points 个点构成的折线（单点时画点）。
+
+        尾部以末点填充后整体传入：重复的末点只构成零长度线段，绘制结果与切片相同。
+        """
+        if points == 0:
+            return
+        xy = self._xy
+        x, y = xy[2 * points - 2], xy[2 * points - 1]
+        for i in range(2 * points, len(xy), 2):
+            xy[i] = x
+            xy[i + 1] = y
+        if points == 1:
+            draw.point(xy, fill=self.fill)
+        else:
+            draw.line(xy, fill=self.fill)
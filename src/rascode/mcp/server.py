@@ -1,95 +1,203 @@
 """三联屏 MCP 服务：暴露主 LCD、左/右 OLED 为 Agent 可调用的工具。
 
 直接使用 display_backend 操作硬件。需本机已安装 rpi-lgpio + spidev，用户具备设备访问权限（或加入 spi/i2c/gpio 组）。
+工具均为 async：写屏在 display_backend 的专用线程池中执行并带超时，慢速传输不会阻塞其他请求。
+
+启动顺序按耗时优化：模块本身只导入标准库；main() 先在后台线程中预热显示设备
+（LCD 复位等待等与后续导入并行），再加载 fastmcp 并注册工具。PIL、luma 只在预热线程
+或首次写屏时导入。各阶段耗时写入日志（stderr，不干扰 stdio 传输）。
 """
 
 from __future__ import annotations
 
-from typing import Literal
+import time
+
+_IMPORT_START = time.perf_counter()
+
+from typing import TYPE_CHECKING, Any, Literal, Optional  # noqa: E402
+
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
 
-from fastmcp import FastMCP
+_server: Optional["FastMCP"] = None
 
-mcp = FastMCP("rascode-triple-screen")
 
+def _note_activity() -> None:
+    """写屏类工具被调用：通知仪表盘结束自适应降频与熄屏（见 rascode.utils.activity）。"""
+    from rascode.utils.activity import touch_activity
 
-def _show_main_text(lines: list[str]) -> str:
-    from rascode.display_backend import show_main_text as backend_show
+    touch_activity()
 
-    return backend_show(lines)
 
+async def _show_main_text(lines: list[str]) -> str:
+    from rascode.display_backend import show_main_text_async as backend_show
 
-@mcp.tool()
-def show_main_text(lines: list[str]) -> str:
+    return await backend_show(lines)
+
+
+async def show_main_text(lines: list[str]) -> str:
     """在主屏（2 寸 LCD，240×320）上显示多行文本。最多约 20 行，每行建议不超过 42 个字符。
 
     Args:
         lines: 要显示的行列表，从上到下排列。
     """
-    return _show_main_text(lines)
+    _note_activity()
+    return await _show_main_text(lines)
 
 
-def _show_left_oled(lines: list[str]) -> str:
-    from rascode.display_backend import show_left_oled as backend_show
+async def _show_left_oled(lines: list[str]) -> str:
+    from rascode.display_backend import show_left_oled_async as backend_show
 
-    return backend_show(lines)
+    return await backend_show(lines)
 
 
-@mcp.tool()
-def show_left_oled(lines: list[str]) -> str:
+async def show_left_oled(lines: list[str]) -> str:
     """在左侧 0.96 寸 OLED（128×64）上显示多行文本。最多约 6 行，每行建议 16 字符内。
 
     Args:
         lines: 要显示的行列表。
     """
-    return _show_left_oled(lines)
+    _note_activity()
+    return await _show_left_oled(lines)
 
 
-def _show_right_oled(lines: list[str]) -> str:
-    from rascode.display_backend import show_right_oled as backend_show
+async def _show_right_oled(lines: list[str]) -> str:
+    from rascode.display_backend import show_right_oled_async as backend_show
 
-    return backend_show(lines)
+    return await backend_show(lines)
 
 
-@mcp.tool()
-def show_right_oled(lines: list[str]) -> str:
+async def show_right_oled(lines: list[str]) -> str:
     """在右侧 0.96 寸 OLED（128×64）上显示多行文本。最多约 6 行，每行建议 16 字符内。
 
     Args:
         lines: 要显示的行列表。
     """
-    return _show_right_oled(lines)
+    _note_activity()
+    return await _show_right_oled(lines)
 
 
-def _clear_screen(screen: Literal["main", "left", "right", "all"]) -> str:
-    from rascode.display_backend import clear_screen as backend_clear
+async def _show_screens(
+    main: Optional[list[str]] = None,
+    left: Optional[list[str]] = None,
+    right: Optional[list[str]] = None,
+) -> str:
+    from rascode.display_backend import show_screens_async as backend_show
 
-    return backend_clear(screen)
+    return await backend_show(main, left, right)
 
 
-@mcp.tool()
-def clear_screen(screen: Literal["main", "left", "right", "all"]) -> str:
+async def show_screens(
+    main: Optional[list[str]] = None,
+    left: Optional[list[str]] = None,
+    right: Optional[list[str]] = None,
+) -> str:
+    """一次调用同时刷新多块屏（只传需要更新的屏幕）。三块屏先全部渲染再一起提交，同步更新，
+    返回每块屏的写入耗时。
+
+    Args:
+        main: 主屏（240×320）文本行，最多约 20 行。
+        left: 左侧 OLED（128×64）文本行，最多约 6 行。
+        right: 右侧 OLED（128×64）文本行，最多约 6 行。
+    """
+    _note_activity()
+    return await _show_screens(main, left, right)
+
+
+async def _clear_screen(screen: Literal["main", "left", "right", "all"]) -> str:
+    from rascode.display_backend import clear_screen_async as backend_clear
+
+    return await backend_clear(screen)
+
+
+async def clear_screen(screen: Literal["main", "left", "right", "all"]) -> str:
     """清空指定屏幕。主屏和双 OLED 会变为黑屏。
 
     Args:
         screen: 要清空的屏幕：main（主 LCD）、left（左 OLED）、right（右 OLED）、all（三块全清）。
     """
-    return _clear_screen(screen)
+    _note_activity()
+    return await _clear_screen(screen)
 
 
-def _restore_dashboard() -> str:
-    from rascode.display_backend import restore_dashboard as backend_restore
+async def _restore_dashboard() -> str:
+    from rascode.display_backend import restore_dashboard_async as backend_restore
 
-    return backend_restore()
+    return await backend_restore()
 
 
-@mcp.tool()
-def restore_dashboard() -> str:
+async def restore_dashboard() -> str:
     """恢复默认仪表盘：左 OLED 显示系统状态（CPU/温度/内存/磁盘），右 OLED 显示时间与网络信息，主屏显示标题「Rascode Dashboard」。"""
-    return _restore_dashboard()
+    _note_activity()
+    return await _restore_dashboard()
+
+
+async def _display_timings(reset: bool = False) -> str:
+    from rascode.display_backend import timing_report_async as backend_timings
+
+    return await backend_timings(reset)
+
+
+async def display_timings(reset: bool = False) -> str:
+    """查看三联屏各阶段耗时：每块屏的渲染、像素转换、差异比较与总线传输的 p50/p95/max，
+    以及帧率与传输带宽。用于判断卡顿来自指标采集、渲染还是 SPI/I²C 传输。
+
+    Args:
+        reset: 为 true 时读取后清零统计。
+    """
+    return await _display_timings(reset)
+
+
+_TOOLS = (
+    show_main_text,
+    show_left_oled,
+    show_right_oled,
+    show_screens,
+    clear_screen,
+    restore_dashboard,
+    display_timings,
+)
+
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
+
+def create_server() -> "FastMCP":
+    """加载 fastmcp 并注册全部工具（只执行一次）。"""
+    global _server
+    if _server is None:
+        from fastmcp import FastMCP
+
+        server = FastMCP("rascode-triple-screen")
+        for tool in _TOOLS:
+            server.tool()(tool)
+        _server = server
+    return _server
+
+
+def __getattr__(name: str) -> Any:
+    # 兼容 `from rascode.mcp.server import mcp`：首次访问时才加载 fastmcp
+    if name == "mcp":
+        return create_server()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def main() -> None:
-    mcp.run()
+    from rascode import display_backend
+    from rascode.config import load_config
+    from rascode.utils.logging import get_logger, init_logging
+
+    init_logging(load_config())
+    logger = get_logger("rascode.mcp")
+    display_backend.start_warm_up()
+    start = time.perf_counter()
+    server = create_server()
+    logger.info(
+        "MCP 服务启动：模块导入 %.0fms，fastmcp 加载与工具注册 %.0fms，距导入开始 %.0fms",
+        _IMPORT_SECONDS * 1000,
+        (time.perf_counter() - start) * 1000,
+        (time.perf_counter() - _IMPORT_START) * 1000,
+    )
+    server.run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+"""仪表盘各屏的版面：把 OLED 的文本行与主屏的趋势图搬到 Layout 上。
+
+文本内容仍由 format_stats_for_oled / format_time_network_for_oled / format_rates_for_oled
+生成（守护进程客户端与 MCP 恢复仪表盘继续使用文本行），这里把每一行放进独立的
+TextWidget：时间每秒变化时只重画时间那一行，网络行只在网络状态变化时重画，
+compose() 返回的矩形交给 commit_frame(dirty=...) 只传输这些区域。
+oled_idle_handler() 把自适应刷新的空闲状态映射到 OLED 的对比度与开关；
+clock_source() 是各仪表盘脚本共用的时钟数据源。
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from PIL import Image, ImageDraw
+
+from rascode.hardware.display.layout import (
+    GaugeWidget,
+    IconWidget,
+    Layout,
+    ProgressWidget,
+    SparklineWidget,
+    TextWidget,
+)
+from rascode.hardware.display.oled_dual import DEFAULT_CONTRAST, DualOledDisplay
+from rascode.services.history import MetricsCollector
+from rascode.services.monitoring import SystemStats, format_stats_for_oled
+from rascode.services.network_info import (
+    InterfaceRates,
+    NetworkInfo,
+    format_rates_for_oled,
+    format_time_network_for_oled,
+)
+from rascode.services.scheduler import (
+    IDLE_BLANKED,
+    IDLE_DIMMED,
+    AdaptiveConfig,
+    AdaptiveRefresh,
+    Source,
+    quiet_change,
+)
+from rascode.utils.activity import ActivityProbe
+
+OLED_SIZE = (128, 64)
+MAIN_SIZE = (240, 320)
+# 与 DualOledDisplay.render_lines 的行高一致，版面与文本行渲染结果逐像素相同
+_OLED_LINE = 10
+_MAIN_LINE = 14
+# 空闲调暗时的 OLED 对比度
+DIM_CONTRAST = 0x10
+
+
+def _link_icons() -> dict[str, Image.Image]:
+    """8×8 的链路状态图标：UP 为实心圆，DOWN 为空心圆。"""
+    icons = {}
+    for name, fill in (("up", 255), ("down", None)):
+        icon = Image.new("1", (8, 8), 0)
+        ImageDraw.Draw(icon).ellipse((0, 0, 7, 7), fill=fill, outline=255)
+        icons[name] = icon
+    return icons
+
+
+def stats_layout(cpu_series: Any = None, name: Optional[str] = "left") -> Layout:
+    """左 OLED：四行系统状态（同 format_stats_for_oled），给出 cpu_series 时其下画 CPU 趋势图。"""
+    layout = Layout(OLED_SIZE, mode="1", name=name)
+    for row, key in enumerate(("cpu", "temp", "mem", "disk")):
+        layout.add(key, TextWidget((0, row * _OLED_LINE, 128, (row + 1) * _OLED_LINE)))
+    if cpu_series is not None:
+        layout.add("cpu_graph", SparklineWidget((0, 44, 128, 64), cpu_series))
+    return layout
+
+
+def update_stats_layout(layout: Layout, stats: SystemStats, history: Any = None) -> list[str]:
+    """填入系统状态；history 为趋势数据的版本号（sample_once() 的返回值）。返回变脏的小部件名。"""
+    cpu, temp, mem, disk = format_stats_for_oled(stats)
+    values: dict[str, Any] = {"cpu": cpu, "temp": temp, "mem": mem, "disk": disk}
+    if history is not None and "cpu_graph" in layout:
+        values["cpu_graph"] = history
+    return layout.update(**values)
+
+
+def network_layout(name: Optional[str] = "right") -> Layout:
+    """右 OLED：时间行与链路图标、IP/IF 两行（同 format_time_network_for_oled），其下为接口速率。"""
+    layout = Layout(OLED_SIZE, mode="1", name=name)
+    layout.add("time", TextWidget((0, 0, 116, _OLED_LINE)))
+    layout.add("link", IconWidget((120, 1, 128, 9), _link_icons()))
+    layout.add("net", TextWidget((0, _OLED_LINE, 128, 3 * _OLED_LINE)))
+    layout.add("rates", TextWidget((0, 3 * _OLED_LINE, 128, 6 * _OLED_LINE)))
+    return layout
+
+
+def update_network_layout(
+    layout: Layout,
+    net: NetworkInfo,
+    now: Optional[datetime] = None,
+    rates: Optional[dict[str, InterfaceRates]] = None,
+) -> list[str]:
+    """填入时间、网络状态与接口速率，返回变脏的小部件名。"""
+    time_line, *net_lines = format_time_network_for_oled(net, now)
+    return layout.update(
+        time=time_line,
+        link="up" if net.is_up else "down",
+        net=net_lines,
+        rates=format_rates_for_oled(rates) if rates is not None else (),
+    )
+
+
+def main_layout(collector: MetricsCollector, name: Optional[str] = "main") -> Layout:
+    """主屏：标题、CPU/内存趋势图及其标题行，底部为 CPU 仪表与磁盘进度条。"""
+    layout = Layout(MAIN_SIZE, mode="RGB", fill="white", background="black", name=name)
+    line = _MAIN_LINE
+    layout.add("title", TextWidget((0, 0, 240, line), line_height=line))
+    layout.add("cpu_title", TextWidget((0, 28, 240, 28 + line), line_height=line, max_chars=42))
+    series = collector.series
+    layout.add("cpu_graph", SparklineWidget((0, 44, 240, 124), series["cpu"], fill="lime"))
+    layout.add("mem_title", TextWidget((0, 126, 240, 126 + line), line_height=line, max_chars=42))
+    layout.add("mem_graph", SparklineWidget((0, 142, 240, 222), series["mem"], fill="cyan"))
+    layout.add("cpu_gauge", GaugeWidget((0, 232, 110, 287), fill="lime"))
+    layout.add("cpu_now", TextWidget((0, 292, 110, 292 + line), line_height=line))
+    layout.add("disk_now", TextWidget((124, 256, 240, 256 + line), line_height=line))
+    layout.add("disk_bar", ProgressWidget((124, 274, 240, 288)))
+    layout.add("self_cpu", TextWidget((124, 292, 240, 292 + line), line_height=line))
+    layout.update(title="Rascode Dashboard")
+    return layout
+
+
+def update_main_layout(
+    layout: Layout,
+    collector: MetricsCollector,
+    stats: Optional[SystemStats] = None,
+    history: Any = None,
+    self_cpu: Optional[float] = None,
+) -> list[str]:
+    """填入 60 秒统计标题与趋势图版本，stats 给出时更新仪表与进度条，self_cpu 为仪表盘进程自身的
+    CPU 占用。返回变脏的小部件名。
+    """
+    cpu = collector.window("cpu", seconds=60)
+    mem = collector.window("mem", seconds=60)
+    values: dict[str, Any] = {
+        "cpu_title": f"CPU 60s avg {cpu.avg:5.1f}% max {cpu.max:5.1f}%" if cpu.count else "CPU",
+        "mem_title": f"MEM 60s avg {mem.avg:5.1f}% max {mem.max:5.1f}%" if mem.count else "MEM",
+    }
+    if history is not None:
+        values["cpu_graph"] = values["mem_graph"] = history
+    if stats is not None:
+        values["cpu_gauge"] = stats.cpu_percent
+        values["cpu_now"] = f"CPU {stats.cpu_percent:5.1f}%"
+        values["disk_now"] = f"DSK {stats.disk_percent:5.1f}%"
+        values["disk_bar"] = stats.disk_percent
+    if self_cpu is not None:
+        values["self_cpu"] = f"SELF {self_cpu:5.1f}%"
+    return layout.update(**values)
+
+
+def clock_source(read: Callable[[], Any] = datetime.now) -> Source:
+    """时钟数据源：每秒刷新、不算作活动；显示到秒，空闲降频时也保持 1 秒周期。"""
+    return Source("time", 1.0, read, adaptive=False, significant=quiet_change)
+
+
+def oled_idle_handler(
+    oled: DualOledDisplay, dim_contrast: int = DIM_CONTRAST
+) -> Callable[[str], None]:
+    """AdaptiveRefresh 的 on_state：空闲时调暗或关闭两块 OLED，恢复活动时还原。"""
+
+    def on_state(state: str) -> None:
+        if state == IDLE_BLANKED:
+            oled.set_power(False)
+            return
+        oled.set_contrast(dim_contrast if state == IDLE_DIMMED else DEFAULT_CONTRAST)
+        oled.set_power(True)
+
+    return on_state
+
+
+def dashboard_adaptive(oled: Optional[DualOledDisplay] = None) -> Optional[AdaptiveRefresh]:
+    """仪表盘脚本用的自适应刷新：参数取自环境变量（见 AdaptiveConfig.from_env），
+    MCP 写屏时立即恢复全速；给出 oled 时空闲超时后调暗/关闭它。关闭自适应时返回 None。
+    """
+    config = AdaptiveConfig.from_env()
+    if config is None:
+        return None
+    on_state = oled_idle_handler(oled) if oled is not None else None
+    return AdaptiveRefresh(config, activity=ActivityProbe().poll, on_state=on_state)
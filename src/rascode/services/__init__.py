@@ -1,6 +1,38 @@
 """业务服务层入口。"""
 
-from .monitoring import SystemMonitor, SystemStats
-
-__all__ = ["SystemMonitor", "SystemStats"]
+from .history import MetricRing, MetricsCollector, WindowStats
+from .monitoring import (
+    MetricSource,
+    ProcessCpuMeter,
+    PsutilSource,
+    SamplerTtl,
+    SystemMonitor,
+    SystemSampler,
+    SystemStats,
+    shared_sampler,
+)
+from .network_watch import NetworkWatcher, shared_network_watcher
+from .procfs import ProcfsSource
+from .scheduler import AdaptiveConfig, AdaptiveRefresh, DashboardScheduler, Screen, Source
 
+__all__ = [
+    "AdaptiveConfig",
+    "AdaptiveRefresh",
+    "DashboardScheduler",
+    "MetricRing",
+    "MetricSource",
+    "MetricsCollector",
+    "NetworkWatcher",
+    "ProcessCpuMeter",
+    "ProcfsSource",
+    "PsutilSource",
+    "SamplerTtl",
+    "Screen",
+    "Source",
+    "SystemMonitor",
+    "SystemSampler",
+    "SystemStats",
+    "WindowStats",
+    "shared_network_watcher",
+    "shared_sampler",
+]
@@ -0,0 +1,197 @@
+"""系统指标历史：后台线程定时采样，写入定长环形缓冲，供趋势图与窗口统计查询。
+
+每个指标一条 MetricRing：时间戳与数值各一个 array('d')，容量固定，写入只是覆盖
+最旧的槽位，内存不随运行时间增长。没有数据的采样点（如读不到温度）记为 NaN，
+查询统计时跳过。
+
+用法::
+
+    collector = MetricsCollector(interval_s=1.0, capacity=600)
+    collector.start()
+    collector.window("cpu", seconds=60)  # WindowStats(count, min, max, avg)
+    collector.last("mem", 30)  # 最近 30 个采样值
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import psutil
+
+from .monitoring import SystemSampler, shared_sampler
+
+# 采集的指标：百分比、摄氏度，以及全部网卡合计的收发速率（字节/秒）
+METRICS: tuple[str, ...] = ("cpu", "temp", "mem", "disk", "net_rx", "net_tx")
+
+_NAN = float("nan")
+
+
+@dataclass
+class WindowStats:
+    """窗口内有效采样的统计。count 为 0 时其余字段为 NaN。"""
+
+    count: int
+    min: float
+    max: float
+    avg: float
+
+
+class MetricRing:
+    """单个指标的定长环形缓冲，线程安全。"""
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity 必须为正数")
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._index = 0  # 累计写入次数，下一次写入的槽位为 _index % capacity
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self._index, self.capacity)
+
+    def append(self, t: float, value: Optional[float]) -> None:
+        with self._lock:
+            i = self._index % self.capacity
+            self._times[i] = t
+            self._values[i] = _NAN if value is None else value
+            self._index += 1
+
+    def latest(self) -> Optional[float]:
+        """最近一次采样值；没有数据或该次采样缺失时返回 None。"""
+        with self._lock:
+            if self._index == 0:
+                return None
+            v = self._values[(self._index - 1) % self.capacity]
+        return None if math.isnan(v) else v
+
+    def last(self, n: int) -> list[float]:
+        """按时间顺序返回最近 n 个值（缺失的采样为 NaN）。"""
+        out = array("d", bytes(8 * min(n, self.capacity)))
+        return out[: self.copy_last(out)].tolist()
+
+    def copy_last(self, out: array, n: Optional[int] = None) -> int:
+        """把最近 n 个值（默认 len(out) 个）按时间顺序写入 out 开头，返回写入个数。
+
+        供每帧重绘的图表复用预分配缓冲，不分配新数组。
+        """
+        with self._lock:
+            n = min(len(out) if n is None else n, len(out), self._index, self.capacity)
+            start = self._index - n
+            for k in range(n):
+                out[k] = self._values[(start + k) % self.capacity]
+        return n
+
+    def window(
+        self,
+        seconds: Optional[float] = None,
+        n: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> WindowStats:
+        """最近 seconds 秒（相对 now，默认最新采样时间）或最近 n 个采样的统计。"""
+        with self._lock:
+            size = min(self._index, self.capacity)
+            if n is not None:
+                size = min(size, n)
+            if size and seconds is not None and now is None:
+                now = self._times[(self._index - 1) % self.capacity]
+            count = 0
+            lo, hi, total = math.inf, -math.inf, 0.0
+            for k in range(1, size + 1):
+                i = (self._index - k) % self.capacity
+                if seconds is not None and now - self._times[i] > seconds:
+                    break
+                v = self._values[i]
+                if v != v:  # NaN
+                    continue
+                count += 1
+                total += v
+                if v < lo:
+                    lo = v
+                if v > hi:
+                    hi = v
+        if count == 0:
+            return WindowStats(0, _NAN, _NAN, _NAN)
+        return WindowStats(count, lo, hi, total / count)
+
+
+class MetricsCollector:
+    """后台定时采集系统指标并写入各自的环形缓冲。"""
+
+    def __init__(
+        self,
+        sampler: Optional[SystemSampler] = None,
+        interval_s: float = 1.0,
+        capacity: int = 600,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._sampler = sampler or shared_sampler()
+        self.interval_s = interval_s
+        self._clock = clock
+        self.series: dict[str, MetricRing] = {name: MetricRing(capacity) for name in METRICS}
+        self._net_prev: Optional[tuple[float, int, int]] = None
+        self._samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample_once(self) -> int:
+        """采样一次并写入所有指标，返回累计采样次数（可作为调度器数据源的值）。"""
+        now = self._clock()
+        stats = self._sampler.sample()
+        rx, tx = self._net_rates(now)
+        s = self.series
+        s["cpu"].append(now, stats.cpu_percent)
+        s["temp"].append(now, stats.cpu_temp_c)
+        s["mem"].append(now, stats.mem_percent)
+        s["disk"].append(now, stats.disk_percent)
+        s["net_rx"].append(now, rx)
+        s["net_tx"].append(now, tx)
+        self._samples += 1
+        return self._samples
+
+    def last(self, name: str, n: int) -> list[float]:
+        return self.series[name].last(n)
+
+    def window(
+        self, name: str, seconds: Optional[float] = None, n: Optional[int] = None
+    ) -> WindowStats:
+        return self.series[name].window(seconds, n)
+
+    def start(self) -> None:
+        """启动后台采集线程（已在运行时不重复启动）。"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rascode-metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.sample_once()
+            self._stop.wait(self.interval_s)
+
+    def _net_rates(self, now: float) -> tuple[Optional[float], Optional[float]]:
+        """全部网卡合计收发速率；首次采样或计数回绕时返回 None。"""
+        io = psutil.net_io_counters()
+        if io is None:
+            return None, None
+        prev, self._net_prev = self._net_prev, (now, io.bytes_recv, io.bytes_sent)
+        if prev is None or now <= prev[0]:
+            return None, None
+        drx, dtx = io.bytes_recv - prev[1], io.bytes_sent - prev[2]
+        if drx < 0 or dtx < 0:
+            return None, None
+        dt = now - prev[0]
+        return drx / dt, dtx / dt
@@ -2,13 +2,23 @@
 
 主要用于在 OLED 上显示的轻量信息：
 CPU 使用率、CPU 温度、内存使用率、磁盘使用率等。
+
+进程内共享一个 SystemSampler（见 shared_sampler()）：各指标按各自的 TTL 缓存，
+脚本、display_backend 与 MCP 服务的多次调用不会重复读取；CPU 使用率由采样器自己
+保存上一次的 CPU 时间作为基线（构造时即取得），第一次采样也是有效的差值。
+
+指标来源可替换：默认优先使用常开文件描述符的 ProcfsSource（见 procfs.py），
+读不到 /proc 时退回 PsutilSource；设置 RASCODE_METRICS_SOURCE=psutil 可强制使用 psutil。
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Optional, Protocol
 
 import psutil
 
@@ -28,35 +38,198 @@ class SystemStats:
     disk_percent: float
 
 
+@dataclass
+class SamplerTtl:
+    """各指标缓存有效期（秒）。"""
+
+    cpu_s: float = 1.0
+    temp_s: float = 2.0
+    mem_s: float = 2.0
+    disk_s: float = 30.0
+
+
+class MetricSource(Protocol):
+    """系统指标来源。"""
+
+    def cpu_busy_total(self) -> tuple[float, float]: ...
+
+    def mem_percent(self) -> float: ...
+
+    def cpu_temp_c(self) -> Optional[float]: ...
+
+    def disk_percent(self, path: str) -> float: ...
+
+
+class PsutilSource:
+    """经 psutil 读取指标（跨平台的兜底实现）。"""
+
+    def cpu_busy_total(self) -> tuple[float, float]:
+        """(忙碌时间, 总时间)，口径与 psutil.cpu_percent 一致：idle 与 iowait 计为空闲。"""
+        t = psutil.cpu_times()
+        total = sum(t)
+        # guest 时间已计入 user/nice，避免重复计算
+        total -= getattr(t, "guest", 0.0) + getattr(t, "guest_nice", 0.0)
+        idle = t.idle + getattr(t, "iowait", 0.0)
+        return total - idle, total
+
+    def mem_percent(self) -> float:
+        return psutil.virtual_memory().percent
+
+    def cpu_temp_c(self) -> Optional[float]:
+        return _read_cpu_temp()
+
+    def disk_percent(self, path: str) -> float:
+        return psutil.disk_usage(path).percent
+
+
+def default_source() -> MetricSource:
+    """按 RASCODE_METRICS_SOURCE（auto|procfs|psutil，默认 auto）选择指标来源。"""
+    if os.environ.get("RASCODE_METRICS_SOURCE", "auto").strip().lower() == "psutil":
+        return PsutilSource()
+    from .procfs import ProcfsSource
+
+    source = ProcfsSource()
+    return source if source.pinned else source.fallback
+
+
+class SystemSampler:
+    """带 TTL 缓存的系统状态采样器，线程安全。"""
+
+    def __init__(
+        self,
+        disk_path: str = "/",
+        ttl: Optional[SamplerTtl] = None,
+        clock: Callable[[], float] = time.monotonic,
+        source: Optional[MetricSource] = None,
+    ) -> None:
+        self._disk_path = disk_path
+        self.ttl = ttl or SamplerTtl()
+        self._clock = clock
+        self.source = source or default_source()
+        self._lock = threading.Lock()
+        self._cache: dict[str, tuple[float, Any]] = {}
+        # CPU 基线：不依赖 psutil.cpu_percent 的全局状态，避免与其他调用方互相干扰
+        self._cpu_times = self.source.cpu_busy_total()
+        self._cpu_percent = 0.0
+
+    def sample(self) -> SystemStats:
+        """返回状态快照；各指标在 TTL 内直接使用缓存值。"""
+        with self._lock:
+            ttl = self.ttl
+            src = self.source
+            return SystemStats(
+                cpu_percent=self._cached("cpu", ttl.cpu_s, self._read_cpu_percent),
+                cpu_temp_c=self._cached("temp", ttl.temp_s, src.cpu_temp_c),
+                mem_percent=self._cached("mem", ttl.mem_s, src.mem_percent),
+                disk_percent=self._cached(
+                    "disk", ttl.disk_s, lambda: src.disk_percent(self._disk_path)
+                ),
+            )
+
+    def invalidate(self) -> None:
+        """丢弃缓存，下次采样重新读取全部指标。"""
+        with self._lock:
+            self._cache.clear()
+
+    def _cached(self, name: str, ttl: float, read: Callable[[], Any]) -> Any:
+        now = self._clock()
+        hit = self._cache.get(name)
+        if hit is not None and now - hit[0] < ttl:
+            return hit[1]
+        value = read()
+        self._cache[name] = (now, value)
+        return value
+
+    def _read_cpu_percent(self) -> float:
+        busy0, total0 = self._cpu_times
+        busy1, total1 = self.source.cpu_busy_total()
+        if total1 - total0 <= 0:
+            return self._cpu_percent  # 间隔过短没有新的时钟节拍，沿用上一次的值
+        self._cpu_times = (busy1, total1)
+        percent = (busy1 - busy0) / (total1 - total0) * 100
+        self._cpu_percent = round(min(100.0, max(0.0, percent)), 1)
+        return self._cpu_percent
+
+
+_samplers: dict[str, SystemSampler] = {}
+_samplers_lock = threading.Lock()
+
+
+def shared_sampler(disk_path: str = "/", ttl: Optional[SamplerTtl] = None) -> SystemSampler:
+    """进程内共享的采样器（按磁盘路径区分）；传入 ttl 时更新其缓存有效期。"""
+    with _samplers_lock:
+        sampler = _samplers.get(disk_path)
+        if sampler is None:
+            sampler = _samplers[disk_path] = SystemSampler(disk_path, ttl)
+        elif ttl is not None:
+            sampler.ttl = replace(ttl)
+        return sampler
+
+
 class SystemMonitor:
-    """收集树莓派系统状态的简单封装。"""
+    """收集树莓派系统状态的简单封装（数据来自共享采样器）。"""
 
     def __init__(self, disk_path: str = "/") -> None:
         self._disk_path = disk_path
 
     def collect(self) -> SystemStats:
-        """采集一次系统状态。"""
-        cpu_percent = psutil.cpu_percent(interval=None)
-        mem = psutil.virtual_memory()
-        disk = psutil.disk_usage(self._disk_path)
-        temp_c = _read_cpu_temp()
-        return SystemStats(
-            cpu_percent=cpu_percent,
-            cpu_temp_c=temp_c,
-            mem_percent=mem.percent,
-            disk_percent=disk.percent,
-        )
+        """采集一次系统状态（TTL 内返回共享缓存）。"""
+        return shared_sampler(self._disk_path).sample()
+
+
+def significant_stats_change(
+    old: Optional[SystemStats],
+    new: SystemStats,
+    cpu: float = 10.0,
+    mem: float = 5.0,
+    temp: float = 3.0,
+    disk: float = 1.0,
+) -> bool:
+    """两次状态之间是否有值得「唤醒」仪表盘的变化（各项阈值为百分点或摄氏度）。"""
+    if old is None:
+        return True
+    if (old.cpu_temp_c is None) != (new.cpu_temp_c is None):
+        return True
+    if old.cpu_temp_c is not None and abs(new.cpu_temp_c - old.cpu_temp_c) >= temp:
+        return True
+    return (
+        abs(new.cpu_percent - old.cpu_percent) >= cpu
+        or abs(new.mem_percent - old.mem_percent) >= mem
+        or abs(new.disk_percent - old.disk_percent) >= disk
+    )
+
+
+class ProcessCpuMeter:
+    """本进程（含全部线程）的 CPU 占用：两次 sample() 之间 user+system 时间占墙上时间的百分比。
+
+    100% 表示占满一个核。数据来自 os.times()，一次系统调用，不读 /proc。
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._last = (self._cpu_seconds(), clock())
+
+    @staticmethod
+    def _cpu_seconds() -> float:
+        t = os.times()
+        return t.user + t.system
+
+    def sample(self) -> float:
+        cpu, now = self._cpu_seconds(), self._clock()
+        last_cpu, last_now = self._last
+        self._last = (cpu, now)
+        elapsed = now - last_now
+        if elapsed <= 0:
+            return 0.0
+        return round(max(cpu - last_cpu, 0.0) / elapsed * 100, 1)
 
 
 def _read_cpu_temp() -> Optional[float]:
     """从标准路径读取 CPU 温度（单位 ℃）。"""
     for path in CPU_TEMP_PATHS:
         try:
-            if path.exists():
-                text = path.read_text().strip()
-                # 常见格式为 millidegree，例如 53000 表示 53.0℃
-                value = float(text) / 1000.0
-                return value
+            # 常见格式为 millidegree，例如 53000 表示 53.0℃；文件不存在时 read_text 抛 OSError
+            return float(path.read_text().strip()) / 1000.0
         except (OSError, ValueError):
             continue
     return None
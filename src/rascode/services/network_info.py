@@ -1,13 +1,25 @@
-"""网络与时间信息采集与格式化，用于右侧 OLED 显示。"""
+"""网络与时间信息采集与格式化，用于右侧 OLED 显示。
+
+InterfaceRateTracker 按接口跟踪收发速率：每次采样读取一次 /proc/net/dev（常开描述符，
+不可用时退回 psutil.net_io_counters(pernic=True)），与上一次计数作差。每个接口的上一次
+计数保存在首次出现时分配的 array 里，之后原地覆写。
+"""
 
 from __future__ import annotations
 
+import socket
+import time
+from array import array
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from pathlib import Path
+from typing import Callable, Iterable, Optional
 
 import psutil
-import socket
+
+from .procfs import open_pinned
+
+_WRAP_32 = 1 << 32
 
 
 @dataclass
@@ -19,46 +31,166 @@ class NetworkInfo:
     active_interface: Optional[str]
 
 
-def _get_ip_address() -> Optional[str]:
-    """获取首个非回环 IPv4 地址。"""
-    addrs = psutil.net_if_addrs()
-    stats = psutil.net_if_stats()
-    for iface, addr_list in addrs.items():
-        st = stats.get(iface)
-        if not st or not st.isup:
+def _first_ipv4(addrs: dict, stats: dict) -> tuple[Optional[str], Optional[str]]:
+    """(接口名, 地址)：首个处于 UP 状态的接口上的非回环 IPv4 地址。"""
+    for iface, st in stats.items():
+        if not st.isup:
             continue
-        for addr in addr_list:
+        for addr in addrs.get(iface, ()):
             if addr.family == socket.AF_INET and not addr.address.startswith("127."):
-                return addr.address
-    return None
+                return iface, addr.address
+    return None, None
 
 
 def collect_network_info() -> NetworkInfo:
-    addrs = psutil.net_if_addrs()
-    stats = psutil.net_if_stats()
-    ip = None
-    active_iface = None
-    is_up = False
+    """枚举一次网卡（地址与状态各一次系统调用），取首个可用的 IPv4 地址。
 
-    for iface, st in stats.items():
-        if not st.isup:
-            continue
-        # 跳过纯回环接口
-        addrs_list = addrs.get(iface, [])
-        for addr in addrs_list:
-            if addr.family == socket.AF_INET and not addr.address.startswith("127."):
-                ip = addr.address
-                active_iface = iface
-                is_up = True
-                break
-        if is_up:
-            break
+    需要按秒刷新时使用 network_watch.shared_network_watcher()：网络没有变化时
+    直接返回缓存，不再枚举。
+    """
+    iface, ip = _first_ipv4(psutil.net_if_addrs(), psutil.net_if_stats())
+    return NetworkInfo(ip_address=ip, is_up=ip is not None, active_interface=iface)
 
-    if ip is None:
-        ip = _get_ip_address()
-        is_up = ip is not None
 
-    return NetworkInfo(ip_address=ip, is_up=is_up, active_interface=active_iface)
+@dataclass
+class InterfaceRates:
+    """单个接口的收发速率。"""
+
+    name: str
+    rx_bytes_s: float
+    tx_bytes_s: float
+    rx_packets_s: float
+    tx_packets_s: float
+
+    @property
+    def total_bytes_s(self) -> float:
+        return self.rx_bytes_s + self.tx_bytes_s
+
+
+def _counter_delta(prev: int, cur: int) -> int:
+    """计数差值。计数变小时：上次值接近 32 位上限视为回绕，否则视为接口重建后计数清零。"""
+    if cur >= prev:
+        return cur - prev
+    if prev >= _WRAP_32 * 3 // 4 and prev < _WRAP_32:
+        return cur + _WRAP_32 - prev
+    return cur
+
+
+def _parse_net_dev(data: bytes) -> Iterable[tuple[str, int, int, int, int]]:
+    """解析 /proc/net/dev，逐个产出 (接口, rx 字节, rx 包, tx 字节, tx 包)。"""
+    for line in data.split(b"\n")[2:]:
+        name, sep, rest = line.partition(b":")
+        if not sep:
+            continue
+        f = rest.split()
+        if len(f) < 10:
+            continue
+        yield name.strip().decode(), int(f[0]), int(f[1]), int(f[8]), int(f[9])
+
+
+class InterfaceRateTracker:
+    """按接口计算收发字节/包速率，线程不安全（由单个采样循环调用）。
+
+    第一次 sample() 只记录基线，返回空结果；接口消失后再出现时同样先记录基线。
+    exclude 中的接口（默认回环）不统计。
+    """
+
+    def __init__(
+        self,
+        exclude: Iterable[str] = ("lo",),
+        clock: Callable[[], float] = time.monotonic,
+        net_dev: Optional[Path] = Path("/proc/net/dev"),
+    ) -> None:
+        self._exclude = frozenset(exclude)
+        self._clock = clock
+        self._file = open_pinned(net_dev, 4096, grow=True) if net_dev is not None else None
+        self._prev: dict[str, array] = {}  # 接口 -> [rx 字节, rx 包, tx 字节, tx 包]
+        self._prev_t: Optional[float] = None
+
+    def sample(self) -> dict[str, InterfaceRates]:
+        now = self._clock()
+        dt = now - self._prev_t if self._prev_t is not None else 0.0
+        self._prev_t = now
+        rates: dict[str, InterfaceRates] = {}
+        seen: set[str] = set()
+        for name, *counters in self._read():
+            if name in self._exclude:
+                continue
+            seen.add(name)
+            prev = self._prev.get(name)
+            if prev is None:
+                self._prev[name] = array("Q", counters)
+                continue
+            if dt > 0:
+                d = [_counter_delta(p, c) / dt for p, c in zip(prev, counters, strict=True)]
+                rates[name] = InterfaceRates(name, d[0], d[2], d[1], d[3])
+            for i, c in enumerate(counters):
+                prev[i] = c
+        # 本次没有出现的接口（已删除的 veth 等）丢弃基线：重新出现时先建立基线，
+        # 而不是把新计数当作一次清零整笔计入一个采样间隔
+        for name in self._prev.keys() - seen:
+            del self._prev[name]
+        return rates
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _read(self) -> Iterable[tuple[str, int, int, int, int]]:
+        if self._file is not None:
+            return _parse_net_dev(self._file.read())
+        counters = psutil.net_io_counters(pernic=True)
+        return (
+            (name, c.bytes_recv, c.packets_recv, c.bytes_sent, c.packets_sent)
+            for name, c in counters.items()
+        )
+
+
+def significant_rates_change(
+    old: Optional[dict[str, InterfaceRates]],
+    new: dict[str, InterfaceRates],
+    min_bytes_s: float = 16 * 1024,
+    ratio: float = 0.5,
+) -> bool:
+    """接口速率是否明显变化：接口增减，或某接口总速率变化超过 min_bytes_s 且超过原值的 ratio 倍。
+
+    空闲链路上几百字节每秒的起伏不算变化，避免后台流量让仪表盘一直保持全速刷新。
+    """
+    if old is None or old.keys() != new.keys():
+        return True
+    for name, rate in new.items():
+        before = old[name].total_bytes_s
+        delta = abs(rate.total_bytes_s - before)
+        if delta >= min_bytes_s and delta >= ratio * before:
+            return True
+    return False
+
+
+def _human_rate(value: float) -> str:
+    """紧凑的速率文本：最多 4 个字符，如 "999"、"1.2k"、"34k"、"5.6M"。"""
+    for unit, scale in (("G", 1e9), ("M", 1e6), ("k", 1e3)):
+        if value >= scale * 0.9995:  # 999.6k 显示为 1.0M 而不是 1000k
+            v = value / scale
+            return f"{v:.1f}{unit}" if v < 9.95 else f"{v:.0f}{unit}"
+    return f"{value:.0f}"
+
+
+def format_rates_for_oled(
+    rates: dict[str, InterfaceRates],
+    max_lines: int = 3,
+    packets: bool = False,
+) -> list[str]:
+    """每个接口一行「名称 收 发」（字节/秒，packets=True 时为包/秒），按总流量降序。
+
+    每行不超过 16 个字符，适合 128 像素宽的 OLED。
+    """
+    ordered = sorted(rates.values(), key=lambda r: r.total_bytes_s, reverse=True)
+    lines: list[str] = []
+    for r in ordered[:max_lines]:
+        rx, tx = (r.rx_packets_s, r.tx_packets_s) if packets else (r.rx_bytes_s, r.tx_bytes_s)
+        lines.append(f"{r.name[:6]:<6}{_human_rate(rx):>5}{_human_rate(tx):>5}")
+    return lines
 
 
 def format_time_network_for_oled(net: NetworkInfo, now: Optional[datetime] = None) -> list[str]:
@@ -66,10 +198,13 @@ def format_time_network_for_oled(net: NetworkInfo, now: Optional[datetime] = Non
     if now is None:
         now = datetime.now()
 
-    lines: list[str] = []
     # 时间：HH:MM:SS
-    lines.append(now.strftime("TIME %H:%M:%S"))
+    return [now.strftime("TIME %H:%M:%S"), *format_network_for_oled(net)]
 
+
+def format_network_for_oled(net: NetworkInfo) -> list[str]:
+    """IP 与接口状态两行；只随网络变化，可按 NetworkWatcher.version 缓存。"""
+    lines: list[str] = []
     # IP 行
     if net.ip_address:
         lines.append(f"IP   {net.ip_address}")
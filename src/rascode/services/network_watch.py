@@ -0,0 +1,152 @@
+"""事件驱动的网络状态：订阅 rtnetlink 地址/链路事件，只在内核报告变化时重新枚举网卡。
+
+网络状态很少变化，按秒调用 collect_network_info() 意味着每秒都要完整枚举一次网卡。
+NetworkWatcher 在后台线程里阻塞等待 netlink 组播消息（RTMGRP_LINK 与 IPv4/IPv6
+地址组），收到消息后先排空同一批突发事件再刷新一次；读取方拿到的是缓存的 NetworkInfo。
+非 Linux 或无法打开 netlink 套接字时退回定时轮询。
+
+version 在每次 NetworkInfo 真正变化时加一，显示端据此判断网络相关的行是否需要重画。
+"""
+
+from __future__ import annotations
+
+import select
+import socket
+import threading
+from typing import Callable, Optional
+
+from rascode.utils.logging import get_logger
+
+from .network_info import NetworkInfo, collect_network_info
+
+# <linux/rtnetlink.h> 组播组
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+
+_logger = get_logger("rascode.network")
+
+
+def _open_netlink() -> Optional[socket.socket]:
+    family = getattr(socket, "AF_NETLINK", None)
+    if family is None:
+        return None
+    try:
+        sock = socket.socket(family, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+    except OSError as e:
+        _logger.info("无法订阅 rtnetlink（%s），网络状态改为定时轮询", e)
+        return None
+    sock.setblocking(False)
+    return sock
+
+
+class NetworkWatcher:
+    """缓存的网络状态，由 netlink 事件（或轮询兜底）驱动刷新，线程安全。
+
+    poll_interval_s 是轮询兜底的周期；netlink 可用时也按此周期做一次校正刷新，
+    以防事件丢失（套接字缓冲溢出）。
+    """
+
+    def __init__(
+        self,
+        poll_interval_s: float = 30.0,
+        collect: Callable[[], NetworkInfo] = collect_network_info,
+        use_netlink: bool = True,
+    ) -> None:
+        self.poll_interval_s = poll_interval_s
+        self._collect = collect
+        self._use_netlink = use_netlink
+        self._lock = threading.Lock()
+        self._info = collect()
+        self._version = 0
+        self._sock: Optional[socket.socket] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def version(self) -> int:
+        """网络状态的变化计数，只在 NetworkInfo 真正改变时增加。"""
+        return self._version
+
+    @property
+    def event_driven(self) -> bool:
+        """是否由 netlink 事件驱动（否则为轮询）。"""
+        return self._sock is not None
+
+    def info(self) -> NetworkInfo:
+        return self._info
+
+    def refresh(self) -> bool:
+        """重新枚举网卡；状态有变化时更新缓存并返回 True。"""
+        info = self._collect()
+        with self._lock:
+            if info == self._info:
+                return False
+            self._info = info
+            self._version += 1
+        return True
+
+    def start(self) -> None:
+        """启动后台线程（已在运行时不重复启动）。"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        if self._use_netlink and self._sock is None:
+            self._sock = _open_netlink()
+        self._thread = threading.Thread(target=self._run, name="rascode-netwatch", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self._sock is None:
+                self._stop.wait(self.poll_interval_s)
+            else:
+                self._wait_event()  # 收到事件，或到达校正周期
+            if not self._stop.is_set():
+                self.refresh()
+
+    def _wait_event(self) -> bool:
+        """等待 netlink 消息并排空当前积压；超时或停止时返回 False。"""
+        sock = self._sock
+        # 分段等待，stop() 后最多 1 秒内退出
+        waited = 0.0
+        while waited < self.poll_interval_s and not self._stop.is_set():
+            step = min(1.0, self.poll_interval_s - waited)
+            ready, _, _ = select.select([sock], [], [], step)
+            if ready:
+                self._drain()
+                return True
+            waited += step
+        return False
+
+    def _drain(self) -> None:
+        # 一次地址变更通常伴随多条消息，全部读掉后只刷新一次
+        while True:
+            try:
+                self._sock.recv(65536)
+            except OSError:  # 已读空（EAGAIN），或 ENOBUFS 积压溢出：之后的刷新会取得最新状态
+                return
+
+
+_watcher: Optional[NetworkWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def shared_network_watcher() -> NetworkWatcher:
+    """进程内共享并已启动的 NetworkWatcher。"""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = NetworkWatcher()
+            _watcher.start()
+        return _watcher
@@ -0,0 +1,135 @@
+"""低开销的 /proc 与 sysfs 指标读取：文件描述符常开，每次采样只做一次定位读。
+
+psutil 每次调用都要 open/read/close 并解析整份文件，温度读取还多一次 stat。
+这里在构造时打开 /proc/stat、/proc/meminfo 与温度节点，之后每次采样对已打开的
+描述符 os.preadv 到预分配的缓冲里，只解析用到的字段：
+- /proc/stat 只读第一行（全部 CPU 合计）；
+- /proc/meminfo 只取 MemTotal 与 MemAvailable；
+- 温度节点为毫摄氏度整数。
+
+某个文件打不开或格式不符时，该指标退回 psutil（PsutilSource），其余指标不受影响。
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .monitoring import CPU_TEMP_PATHS, PsutilSource
+
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+class PinnedFile:
+    """常开的只读文件，read() 从偏移 0 重新读入复用的缓冲。
+
+    grow 为 False 时只读开头 size 字节；为 True 时缓冲装满即翻倍重读，保证读到整个文件。
+    """
+
+    __slots__ = ("path", "_fd", "_buf", "_view", "_grow")
+
+    def __init__(self, path: Path, size: int, grow: bool = False) -> None:
+        self.path = path
+        self._fd = os.open(path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+        self._buf = bytearray(size)
+        self._view = memoryview(self._buf)
+        self._grow = grow
+
+    def read(self) -> bytearray:
+        """返回文件内容（/proc 文件每次读取都会重新生成内容）。"""
+        n = os.preadv(self._fd, [self._view], 0)
+        while self._grow and n == len(self._buf):
+            self._buf = bytearray(2 * len(self._buf))
+            self._view = memoryview(self._buf)
+            n = os.preadv(self._fd, [self._view], 0)
+        return self._buf[:n]
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def open_pinned(path: Path, size: int, grow: bool = False) -> Optional[PinnedFile]:
+    """打开并试读一次；文件不可用时返回 None，由调用方退回 psutil。"""
+    try:
+        f = PinnedFile(path, size, grow)
+        f.read()
+    except (OSError, AttributeError):  # 文件不存在、无权限，或平台没有 preadv
+        return None
+    return f
+
+
+class ProcfsSource:
+    """直接读取 /proc 与 sysfs 的指标来源，接口与 PsutilSource 相同，线程安全。"""
+
+    def __init__(
+        self,
+        stat_path: Path = Path("/proc/stat"),
+        meminfo_path: Path = Path("/proc/meminfo"),
+        temp_paths: Sequence[Path] = tuple(CPU_TEMP_PATHS),
+        fallback: Optional[PsutilSource] = None,
+    ) -> None:
+        self.fallback = fallback or PsutilSource()
+        self._lock = threading.Lock()
+        # 第一行 "cpu  ..." 不超过 256 字节；MemAvailable 位于第 3 行
+        self._stat = open_pinned(stat_path, 256)
+        self._meminfo = open_pinned(meminfo_path, 256)
+        self._temp = next((f for f in (open_pinned(p, 16) for p in temp_paths) if f), None)
+
+    @property
+    def pinned(self) -> tuple[str, ...]:
+        """当前常开的文件路径（其余指标走 psutil）。"""
+        files = (self._stat, self._meminfo, self._temp)
+        return tuple(str(f.path) for f in files if f is not None)
+
+    def cpu_busy_total(self) -> tuple[float, float]:
+        """(忙碌时间, 总时间)（秒），口径与 PsutilSource 一致。"""
+        if self._stat is not None:
+            with self._lock:
+                data = self._stat.read()
+            line, newline, _ = data.partition(b"\n")
+            fields = line.split()
+            if newline and len(fields) >= 6 and fields[0] == b"cpu":
+                ticks = [int(v) for v in fields[1:11]]
+                total = sum(ticks[:8])  # guest/guest_nice 已计入 user/nice
+                idle = ticks[3] + ticks[4]  # idle + iowait
+                return (total - idle) / _CLK_TCK, total / _CLK_TCK
+        return self.fallback.cpu_busy_total()
+
+    def mem_percent(self) -> float:
+        if self._meminfo is not None:
+            with self._lock:
+                data = self._meminfo.read()
+            total = available = None
+            for line in data.split(b"\n"):
+                if line.startswith(b"MemTotal:"):
+                    total = int(line.split()[1])
+                elif line.startswith(b"MemAvailable:"):
+                    available = int(line.split()[1])
+                    break
+            if total and available is not None:
+                return round((total - available) / total * 100, 1)
+        return self.fallback.mem_percent()
+
+    def cpu_temp_c(self) -> Optional[float]:
+        if self._temp is not None:
+            with self._lock:
+                data = self._temp.read()
+            try:
+                return int(data) / 1000.0
+            except ValueError:
+                pass
+        return self.fallback.cpu_temp_c()
+
+    def disk_percent(self, path: str) -> float:
+        return self.fallback.disk_percent(path)
+
+    def close(self) -> None:
+        with self._lock:
+            for f in (self._stat, self._meminfo, self._temp):
+                if f is not None:
+                    f.close()
+            self._stat = self._meminfo = self._temp = None
@@ -0,0 +1,375 @@
+"""多周期仪表盘调度器：每个数据源按自己的周期运行，节拍对齐到墙上时钟，屏幕只在输入变化时重画。
+
+原先的循环是「做完所有工作再 sleep(1.0)」：每轮的耗时累加到周期里，时钟显示会漂移、
+跳秒，而且磁盘用量与时间按同样的频率刷新。这里：
+
+- Source 的第 k 次运行安排在墙上时钟的 k·period + offset 时刻（period=1 即每个整秒），
+  下一次到期时间总是从「当前时刻之后的下一个对齐点」算起，处理耗时不会累积成漂移；
+  处理太慢错过的节拍直接跳过，不会补跑。
+- 每个 Source 的值与上一次不同时版本号加一；Screen 声明自己依赖哪些 Source，
+  只有依赖的版本变化时才调用 draw。
+- 一轮中有屏幕重画时，最后调用一次 commit（例如 ScreenCompositor.commit），
+  让多块屏在同一次提交中更新。
+- 可选的自适应模式（AdaptiveRefresh）：数据源持续没有「显著变化」时周期逐级翻倍，
+  出现显著变化或外部活动（如 MCP 写屏）时立即恢复原周期；空闲超时后可调暗或关闭 OLED，
+  并定期在日志中报告本进程的 CPU 占用。何为显著由 Source.significant 决定。
+
+用法::
+
+    scheduler = DashboardScheduler(
+        sources=[Source("time", 1.0, datetime.now), Source("stats", 2.0, monitor.collect)],
+        screens=[Screen("left", ("stats",), lambda v: compositor.stage_left(fmt(v["stats"])))],
+        commit=compositor.commit,
+    )
+    scheduler.run()  # 阻塞，直到 stop() 或 KeyboardInterrupt
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+from rascode.utils.logging import get_logger
+from rascode.utils.timing import stage_timings
+
+from .monitoring import ProcessCpuMeter
+
+# 到期判断的容差：定时器提前几毫秒醒来时也视为到期
+_EPSILON_S = 0.002
+
+# 自适应模式下的空闲状态
+IDLE_ACTIVE = "active"
+IDLE_DIMMED = "dimmed"
+IDLE_BLANKED = "blanked"
+
+_logger = get_logger("rascode.scheduler")
+
+
+@dataclass
+class Source:
+    """一个定时刷新的数据源。read 的返回值与上一次不同（!=）时视为变化。"""
+
+    name: str
+    period_s: float
+    read: Callable[[], Any]
+    offset_s: float = 0.0  # 相对对齐点的偏移，例如把慢速源错开到整秒之后
+    adaptive: bool = True  # 自适应模式下周期是否随空闲放大
+    # (旧值, 新值) -> 这次变化是否算作活动；None 表示任何变化都算
+    significant: Optional[Callable[[Any, Any], bool]] = None
+
+
+def quiet_change(old: Any, new: Any) -> bool:
+    """Source.significant 的取值之一：变化照常重画，但不算作活动（如时钟、趋势图版本号）。"""
+    return False
+
+
+@dataclass
+class Screen:
+    """一块屏（或屏上的一个区域）：inputs 中任一数据源变化时调用 draw(当前值)。"""
+
+    name: str
+    inputs: tuple[str, ...]
+    draw: Callable[[Mapping[str, Any]], None]
+
+
+@dataclass
+class AdaptiveConfig:
+    """自适应刷新参数（秒）。"""
+
+    max_scale: int = 8  # 周期最多放大的倍数
+    calm_s: float = 30.0  # 每持续这么久没有显著变化，周期翻倍一次
+    poll_s: float = 1.0  # 降频等待期间轮询外部活动的间隔
+    dim_after_s: Optional[float] = None  # 空闲多久后调暗 OLED；None 表示不调暗
+    blank_after_s: Optional[float] = None  # 空闲多久后关闭 OLED 显示；None 表示不关闭
+    report_interval_s: float = 300.0  # 在日志中报告本进程 CPU 占用的间隔
+
+    @classmethod
+    def from_env(cls) -> Optional["AdaptiveConfig"]:
+        """RASCODE_DASHBOARD_ADAPTIVE=0 时返回 None（关闭自适应）；
+        RASCODE_OLED_DIM_AFTER / RASCODE_OLED_BLANK_AFTER 为调暗/关闭 OLED 前的空闲秒数。
+        """
+        if os.environ.get("RASCODE_DASHBOARD_ADAPTIVE", "1").strip() in ("0", "false", "no"):
+            return None
+        return cls(
+            dim_after_s=_env_seconds("RASCODE_OLED_DIM_AFTER", 300.0),
+            blank_after_s=_env_seconds("RASCODE_OLED_BLANK_AFTER", None),
+        )
+
+
+def _env_seconds(name: str, default: Optional[float]) -> Optional[float]:
+    """读取秒数；未设置时取默认值，0 或负数表示关闭。"""
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        return default
+    return value if value > 0 else None
+
+
+@dataclass
+class AdaptiveStats:
+    """自适应刷新的状态快照。"""
+
+    scale: int
+    state: str
+    idle_s: float
+    wakeups: int  # 从降频或调暗状态恢复全速的次数
+    self_cpu_percent: float  # 最近一个报告周期内本进程的 CPU 占用（100% 为一个核）
+
+
+class AdaptiveRefresh:
+    """根据内容是否变化决定刷新倍率，空闲超时后切换 OLED 状态。
+
+    activity 为外部活动探针（如 ActivityProbe.poll），返回 True 表示有人在用；
+    on_state 在空闲状态（IDLE_ACTIVE / IDLE_DIMMED / IDLE_BLANKED）变化时调用。
+    """
+
+    def __init__(
+        self,
+        config: Optional[AdaptiveConfig] = None,
+        activity: Optional[Callable[[], bool]] = None,
+        on_state: Optional[Callable[[str], None]] = None,
+        cpu_meter: Optional[ProcessCpuMeter] = None,
+    ) -> None:
+        self.config = config or AdaptiveConfig()
+        self._activity = activity
+        self._on_state = on_state
+        self._cpu = cpu_meter or ProcessCpuMeter()
+        self._last_activity: Optional[float] = None
+        self._scale = 1
+        self._state = IDLE_ACTIVE
+        self._wakeups = 0
+        self._self_cpu = 0.0
+        self._next_report: Optional[float] = None
+        self._now = 0.0
+
+    @property
+    def scale(self) -> int:
+        return self._scale
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def observe(self, now: float, significant: bool) -> int:
+        """记录一轮的结果（是否有显著变化），返回之后使用的周期倍率。"""
+        if self._activity is not None and self._activity():
+            significant = True
+        last = self._last_activity
+        if last is None or significant or now < last:
+            if last is not None and (self._scale > 1 or self._state != IDLE_ACTIVE):
+                self._wakeups += 1
+            self._last_activity = last = now
+        self._now = now
+        cfg = self.config
+        idle = now - last
+        steps = min(int(idle // cfg.calm_s), 30) if cfg.calm_s > 0 else 0
+        self._scale = max(1, min(cfg.max_scale, 2**steps))
+        self._set_state(self._idle_state(idle))
+        self._report(now)
+        return self._scale
+
+    def stats(self) -> AdaptiveStats:
+        idle = self._now - self._last_activity if self._last_activity is not None else 0.0
+        return AdaptiveStats(
+            scale=self._scale,
+            state=self._state,
+            idle_s=idle,
+            wakeups=self._wakeups,
+            self_cpu_percent=self._self_cpu,
+        )
+
+    def _idle_state(self, idle: float) -> str:
+        cfg = self.config
+        if cfg.blank_after_s is not None and idle >= cfg.blank_after_s:
+            return IDLE_BLANKED
+        if cfg.dim_after_s is not None and idle >= cfg.dim_after_s:
+            return IDLE_DIMMED
+        return IDLE_ACTIVE
+
+    def _set_state(self, state: str) -> None:
+        if state == self._state:
+            return
+        self._state = state
+        _logger.info("仪表盘空闲状态: %s", state)
+        if self._on_state is not None:
+            try:
+                self._on_state(state)
+            except Exception:
+                _logger.exception("切换空闲状态 %s 失败", state)
+
+    def _report(self, now: float) -> None:
+        if self._next_report is None:
+            self._next_report = now + self.config.report_interval_s
+            return
+        if now < self._next_report:
+            return
+        self._next_report = now + self.config.report_interval_s
+        self._self_cpu = self._cpu.sample()
+        _logger.info(
+            "仪表盘进程 CPU %.1f%%（刷新倍率 x%d，状态 %s）",
+            self._self_cpu,
+            self._scale,
+            self._state,
+        )
+
+
+class _SourceState:
+    __slots__ = ("source", "value", "version", "due")
+
+    def __init__(self, source: Source) -> None:
+        self.source = source
+        self.value: Any = None
+        self.version = 0
+        self.due = -math.inf  # 第一轮立即运行
+
+
+class _ScreenState:
+    __slots__ = ("screen", "seen")
+
+    def __init__(self, screen: Screen) -> None:
+        self.screen = screen
+        self.seen: Optional[tuple[int, ...]] = None
+
+
+def next_aligned(now: float, period_s: float, offset_s: float = 0.0) -> float:
+    """now 之后（不含 now）的下一个对齐时刻 k·period + offset。"""
+    return (math.floor((now - offset_s) / period_s) + 1) * period_s + offset_s
+
+
+class DashboardScheduler:
+    """按墙上时钟对齐的多周期调度器。tick() 单步执行，run() 在当前线程循环。"""
+
+    def __init__(
+        self,
+        sources: Iterable[Source],
+        screens: Iterable[Screen],
+        commit: Optional[Callable[[], Any]] = None,
+        clock: Callable[[], float] = time.time,
+        adaptive: Optional[AdaptiveRefresh] = None,
+    ) -> None:
+        self._sources = {s.name: _SourceState(s) for s in sources}
+        self._screens = [_ScreenState(s) for s in screens]
+        for st in self._screens:
+            missing = [name for name in st.screen.inputs if name not in self._sources]
+            if missing:
+                raise ValueError(f"屏幕 {st.screen.name} 依赖未定义的数据源: {missing}")
+        self._commit = commit
+        self._clock = clock
+        self._adaptive = adaptive
+        self._stop = threading.Event()
+        max_period = max((s.source.period_s for s in self._sources.values()), default=1.0)
+        self._max_period = max_period * (adaptive.config.max_scale if adaptive else 1)
+
+    def values(self) -> dict[str, Any]:
+        """各数据源的最新值。"""
+        return {name: st.value for name, st in self._sources.items()}
+
+    def version(self, name: str) -> int:
+        """数据源的变化计数。"""
+        return self._sources[name].version
+
+    def next_due(self) -> float:
+        return min((st.due for st in self._sources.values()), default=math.inf)
+
+    def period(self, name: str) -> float:
+        """数据源当前生效的周期（自适应模式下含倍率）。"""
+        return self._period(self._sources[name].source)
+
+    def tick(self, now: Optional[float] = None) -> list[str]:
+        """运行 now 时刻到期的数据源，重画输入有变化的屏幕，返回重画的屏幕名。"""
+        t0 = time.perf_counter()
+        if now is None:
+            now = self._clock()
+        significant = False
+        for st in self._sources.values():
+            if st.due > now + _EPSILON_S:
+                continue
+            src = st.source
+            # 提前醒来（now 略早于 due）时从 due 起对齐，否则同一节拍会在 x.999 与 x+1 各运行一次
+            st.due = next_aligned(max(now, st.due), self._period(src), src.offset_s)
+            try:
+                value = src.read()
+            except Exception:
+                _logger.exception("数据源 %s 读取失败，沿用上一次的值", src.name)
+                continue
+            if st.version == 0 or value != st.value:
+                if st.version and (src.significant is None or src.significant(st.value, value)):
+                    significant = True
+                st.value = value
+                st.version += 1
+
+        redrawn: list[str] = []
+        values: Optional[dict[str, Any]] = None
+        for sc in self._screens:
+            versions = tuple(self._sources[name].version for name in sc.screen.inputs)
+            if versions == sc.seen:
+                continue
+            sc.seen = versions
+            if values is None:
+                values = self.values()
+            try:
+                sc.screen.draw(values)
+            except Exception:
+                _logger.exception("屏幕 %s 绘制失败", sc.screen.name)
+                continue
+            redrawn.append(sc.screen.name)
+        if redrawn and self._commit is not None:
+            try:
+                self._commit()
+            except Exception:
+                _logger.exception("提交失败")
+        if self._adaptive is not None:
+            self._adapt(now, significant)
+        stage_timings.record("dashboard", "tick", time.perf_counter() - t0)
+        return redrawn
+
+    def run(self, wait: Optional[Callable[[float], bool]] = None) -> None:
+        """循环执行直到 stop()；wait(秒) 返回 True 表示应当停止（默认等待停止事件）。"""
+        wait = wait or self._stop.wait
+        try:
+            while not self._stop.is_set():
+                delay = self.next_due() - self._clock()
+                if delay > self._max_period + 1.0:
+                    # 墙上时钟被往回调（如 NTP 校时）：按当前时刻重新对齐，而不是空等
+                    self._reschedule()
+                    continue
+                if delay > 0:
+                    if self._adaptive is not None:
+                        # 降频期间分段等待，外部活动（MCP 写屏）最多 poll_s 秒内生效
+                        delay = min(delay, self._adaptive.config.poll_s)
+                    if wait(delay):
+                        break
+                    if self._adaptive is not None:
+                        self._adapt(self._clock(), False)
+                if self.next_due() > self._clock() + _EPSILON_S:
+                    continue  # 提前醒来
+                self.tick()
+        except KeyboardInterrupt:
+            pass
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _period(self, src: Source) -> float:
+        if self._adaptive is None or not src.adaptive:
+            return src.period_s
+        return src.period_s * self._adaptive.scale
+
+    def _adapt(self, now: float, significant: bool) -> None:
+        before = self._adaptive.scale
+        if self._adaptive.observe(now, significant) < before:
+            # 恢复全速：按缩短后的周期重新对齐，不必等完放大的周期
+            self._reschedule(now)
+
+    def _reschedule(self, now: Optional[float] = None) -> None:
+        if now is None:
+            now = self._clock()
+        for st in self._sources.values():
+            st.due = next_aligned(now, self._period(st.source), st.source.offset_s)
@@ -1,6 +1,16 @@
 """通用工具函数与类。"""
 
 from .logging import get_logger, init_logging
+from .lru import CacheStats, LruCache
+from .timing import TimingRegistry, format_summary, stage_timings
 
-__all__ = ["get_logger", "init_logging"]
+__all__ = [
+    "CacheStats",
+    "LruCache",
+    "TimingRegistry",
+    "format_summary",
+    "get_logger",
+    "init_logging",
+    "stage_timings",
+]
 
@@ -0,0 +1,57 @@
+"""跨进程的「有人在用」信号：MCP 服务写屏时更新标记文件的修改时间，仪表盘轮询它。
+
+MCP 服务、显示守护进程与仪表盘脚本是不同的进程。标记文件只用 mtime 传递信号：
+写方一次 os.utime（文件不存在时创建），读方每次一次 os.stat，不需要额外的连接或线程。
+路径：RASCODE_ACTIVITY_FILE > $XDG_RUNTIME_DIR/rascode-activity > /tmp/rascode-activity。
+本模块只依赖标准库，不拖慢 MCP 服务启动。
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Optional
+
+
+def activity_path() -> Path:
+    env = os.environ.get("RASCODE_ACTIVITY_FILE", "").strip()
+    if env:
+        return Path(env)
+    runtime = os.environ.get("XDG_RUNTIME_DIR", "").strip()
+    base = Path(runtime) if runtime else Path("/tmp")
+    return base / "rascode-activity"
+
+
+def touch_activity(path: Optional[Path] = None) -> None:
+    """记录一次活动；写不了标记文件时静默忽略（不影响写屏本身）。"""
+    path = path or activity_path()
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        try:
+            path.touch()
+        except OSError:
+            pass
+    except OSError:
+        pass
+
+
+class ActivityProbe:
+    """轮询标记文件：poll() 在 mtime 比上一次新时返回 True。构造时的状态作为基线。"""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or activity_path()
+        self._mtime = self._stat()
+
+    def poll(self) -> bool:
+        mtime = self._stat()
+        if mtime > self._mtime:
+            self._mtime = mtime
+            return True
+        return False
+
+    def _stat(self) -> int:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return 0
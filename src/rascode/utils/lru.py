@@ -0,0 +1,94 @@
+"""按内存预算淘汰的 LRU 缓存。"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    """缓存命中统计快照。"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+    max_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LruCache(Generic[V]):
+    """以「字节预算」而不是条目数为上限的 LRU 缓存，线程安全。
+
+    cost 返回单个值的估算字节数；超出 max_bytes 时从最久未用的条目开始淘汰。
+    单个值本身超过预算时不缓存。
+    """
+
+    def __init__(self, max_bytes: int, cost: Callable[[V], int]) -> None:
+        self._max_bytes = max_bytes
+        self._cost = cost
+        self._data: OrderedDict[Hashable, tuple[V, int]] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return item[0]
+
+    def put(self, key: Hashable, value: V) -> None:
+        size = self._cost(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self._max_bytes:
+                return
+            self._data[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self._bytes -= evicted
+                self._evictions += 1
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], V]) -> V:
+        """命中则返回缓存值，否则调用 factory 生成并写入缓存。"""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._data),
+                bytes=self._bytes,
+                max_bytes=self._max_bytes,
+            )
@@ -0,0 +1,187 @@
+"""分阶段耗时统计：每块屏每个阶段一个定长对数直方图，开销低，可常开。
+
+记录一次耗时只做一次二分查找和几次整数加法；直方图桶数固定（约 19% 分辨率，
+覆盖 1µs～60s），内存不随运行时间增长。帧率与带宽按最近 64 帧的时间戳与字节数计算。
+
+用法::
+
+    t0 = time.perf_counter()
+    ...
+    stage_timings.record("main", "render", time.perf_counter() - t0)
+    stage_timings.record_frame("main", bytes_sent)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Callable
+
+_MIN_S = 1e-6
+_RATIO = 2**0.25
+_BOUNDS: list[float] = []
+_b = _MIN_S
+while _b < 60.0:
+    _BOUNDS.append(_b)
+    _b *= _RATIO
+_BOUNDS.append(float("inf"))
+
+_RECENT_FRAMES = 64
+
+
+class StageHistogram:
+    """定长对数直方图；分位数取所在桶的上界（不超过观测最大值）。"""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = array("L", bytes(array("L").itemsize * len(_BOUNDS)))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.counts[bisect_left(_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= target:
+                return min(_BOUNDS[i], self.max)
+        return self.max
+
+
+@dataclass
+class StageSummary:
+    """单个阶段的耗时摘要（毫秒）。"""
+
+    count: int
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    avg_ms: float
+
+
+@dataclass
+class ScreenSummary:
+    """单块屏（或后端调用类别）的摘要。"""
+
+    stages: dict[str, StageSummary] = field(default_factory=dict)
+    frames: int = 0
+    fps: float = 0.0
+    bytes_per_s: float = 0.0
+
+
+class _FrameRing:
+    """最近若干帧的 (时间戳, 字节数)，用于估算帧率与带宽。"""
+
+    __slots__ = ("times", "sizes", "index", "total")
+
+    def __init__(self) -> None:
+        self.times = [0.0] * _RECENT_FRAMES
+        self.sizes = [0] * _RECENT_FRAMES
+        self.index = 0
+        self.total = 0
+
+    def add(self, t: float, nbytes: int) -> None:
+        i = self.index % _RECENT_FRAMES
+        self.times[i] = t
+        self.sizes[i] = nbytes
+        self.index += 1
+        self.total += 1
+
+    def rates(self) -> tuple[float, float]:
+        n = min(self.index, _RECENT_FRAMES)
+        if n < 2:
+            return 0.0, 0.0
+        oldest = (self.index - n) % _RECENT_FRAMES
+        newest = (self.index - 1) % _RECENT_FRAMES
+        span = self.times[newest] - self.times[oldest]
+        if span <= 0:
+            return 0.0, 0.0
+        # 最旧一帧作为区间起点，其字节不计入
+        sent = sum(self.sizes[:n]) - self.sizes[oldest]
+        return (n - 1) / span, sent / span
+
+
+class TimingRegistry:
+    """按 (屏幕, 阶段) 保存直方图，线程安全。"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stages: dict[tuple[str, str], StageHistogram] = {}
+        self._frames: dict[str, _FrameRing] = {}
+
+    def record(self, screen: str, stage: str, seconds: float) -> None:
+        key = (screen, stage)
+        with self._lock:
+            hist = self._stages.get(key)
+            if hist is None:
+                hist = self._stages[key] = StageHistogram()
+            hist.add(seconds)
+
+    def record_frame(self, screen: str, nbytes: int) -> None:
+        """记录一帧提交（跳过的帧 nbytes 为 0）。"""
+        now = self._clock()
+        with self._lock:
+            ring = self._frames.get(screen)
+            if ring is None:
+                ring = self._frames[screen] = _FrameRing()
+            ring.add(now, nbytes)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._frames.clear()
+
+    def summary(self) -> dict[str, ScreenSummary]:
+        with self._lock:
+            out: dict[str, ScreenSummary] = {}
+            for (screen, stage), hist in self._stages.items():
+                out.setdefault(screen, ScreenSummary()).stages[stage] = StageSummary(
+                    count=hist.count,
+                    p50_ms=hist.percentile(0.50) * 1000,
+                    p95_ms=hist.percentile(0.95) * 1000,
+                    max_ms=hist.max * 1000,
+                    avg_ms=hist.total / hist.count * 1000,
+                )
+            for screen, ring in self._frames.items():
+                item = out.setdefault(screen, ScreenSummary())
+                item.frames = ring.total
+                item.fps, item.bytes_per_s = ring.rates()
+            return out
+
+
+def format_summary(summary: dict[str, ScreenSummary]) -> str:
+    """多行文本报告，每块屏一行帧率/带宽，每个阶段一行分位数。"""
+    if not summary:
+        return "暂无耗时数据"
+    lines: list[str] = []
+    for screen in sorted(summary):
+        item = summary[screen]
+        head = f"[{screen}]"
+        if item.frames:
+            head += f" {item.frames} 帧  {item.fps:.2f} fps  {item.bytes_per_s / 1024:.1f} KB/s"
+        lines.append(head)
+        for stage, s in item.stages.items():
+            lines.append(
+                f"  {stage:<10} n={s.count:<6d} p50 {s.p50_ms:7.2f}ms  "
+                f"p95 {s.p95_ms:7.2f}ms  max {s.max_ms:7.2f}ms"
+            )
+    return "\n".join(lines)
+
+
+# 进程内共享的默认实例：显示类与 display_backend 都记录到这里
+stage_timings = TimingRegistry()
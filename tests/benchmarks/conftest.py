@@ -0,0 +1,61 @@
+"""基准测试夹具：默认跳过，pytest --bench 时运行；--bench-save 写入基线。"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from .harness import BenchResult, load_baselines, measure, regressions, save_baselines, speed_change
+
+_results: list[BenchResult] = []
+
+
+def _enabled(config: pytest.Config) -> bool:
+    return (
+        config.getoption("--bench")
+        or config.getoption("--bench-save")
+        or os.environ.get("RASCODE_BENCH", "").strip() in ("1", "true", "yes")
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if _enabled(config):
+        return
+    skip = pytest.mark.skip(reason="基准测试默认跳过，使用 pytest --bench 运行")
+    for item in items:
+        if "benchmarks" in item.nodeid.split("::")[0]:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def baselines() -> dict[str, dict]:
+    return load_baselines()
+
+
+@pytest.fixture
+def bench(request: pytest.FixtureRequest, baselines: dict[str, dict]):
+    """bench(name, fn, **kwargs) 运行一项基准，并断言确定性指标未相对基线回退。"""
+
+    def run(name: str, fn, **kwargs) -> BenchResult:
+        result = measure(name, fn, **kwargs)
+        _results.append(result)
+        if not request.config.getoption("--bench-save"):
+            problems = regressions(result, baselines.get(name))
+            assert not problems, f"{name} 相对基线回退: " + "; ".join(problems)
+        return result
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    if not _results:
+        return
+    stored = load_baselines()
+    terminalreporter.section("rascode benchmarks")
+    for result in _results:
+        change = speed_change(result, stored.get(result.name))
+        terminalreporter.write_line(result.summary() + (f"  vs 基线 {change}" if change else ""))
+    if config.getoption("--bench-save"):
+        save_baselines(_results)
+        terminalreporter.write_line("基线已写入 tests/benchmarks/baselines.json")
@@ -0,0 +1,143 @@
+"""基准测试工具：吞吐、延迟分位数、内存分配与总线字节数，以及基线的保存与比较。"""
+
+from __future__ import annotations
+
+import json
+import platform
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+
+# 与基线比较时的容差：总线字节数是确定的，必须不增加；分配量允许少量抖动；
+# 耗时与机器相关，只报告变化不判定失败
+ALLOC_TOLERANCE = 0.25
+ALLOC_SLACK_BYTES = 1024
+
+
+@dataclass
+class BenchResult:
+    """一项基准的测量结果。"""
+
+    name: str
+    rounds: int
+    ops_per_sec: float
+    p50_us: float
+    p95_us: float
+    p99_us: float
+    alloc_peak_bytes: int  # 单次调用内的峰值临时分配
+    bus_bytes_per_op: Optional[float] = None  # 仅涉及虚拟屏的基准
+
+    def summary(self) -> str:
+        text = (
+            f"{self.name:<28} {self.ops_per_sec:>10.1f} ops/s  p50 {self.p50_us:>9.1f}us  "
+            f"p95 {self.p95_us:>9.1f}us  p99 {self.p99_us:>9.1f}us  "
+            f"alloc {self.alloc_peak_bytes:>8d}B"
+        )
+        if self.bus_bytes_per_op is not None:
+            text += f"  bus {self.bus_bytes_per_op:>9.1f}B/op"
+        return text
+
+
+def _percentile(sorted_ns: list[int], q: float) -> float:
+    index = min(len(sorted_ns) - 1, int(round(q * (len(sorted_ns) - 1))))
+    return sorted_ns[index] / 1000.0
+
+
+def measure(
+    name: str,
+    fn: Callable[[int], object],
+    rounds: int = 200,
+    warmup: int = 10,
+    alloc_rounds: int = 20,
+    bus_bytes: Optional[Callable[[], int]] = None,
+) -> BenchResult:
+    """测量 fn(i)。i 为调用序号，便于基准在相邻两帧之间制造变化。"""
+    for i in range(warmup):
+        fn(i)
+
+    before = bus_bytes() if bus_bytes is not None else 0
+    samples: list[int] = []
+    start = time.perf_counter_ns()
+    for i in range(warmup, warmup + rounds):
+        t0 = time.perf_counter_ns()
+        fn(i)
+        samples.append(time.perf_counter_ns() - t0)
+    total_s = (time.perf_counter_ns() - start) / 1e9
+    bus_per_op = (bus_bytes() - before) / rounds if bus_bytes is not None else None
+
+    tracemalloc.start()
+    try:
+        peak = 0
+        base = warmup + rounds
+        for i in range(base, base + alloc_rounds):
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            fn(i)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+
+    samples.sort()
+    return BenchResult(
+        name=name,
+        rounds=rounds,
+        ops_per_sec=rounds / total_s if total_s > 0 else float("inf"),
+        p50_us=_percentile(samples, 0.50),
+        p95_us=_percentile(samples, 0.95),
+        p99_us=_percentile(samples, 0.99),
+        alloc_peak_bytes=peak,
+        bus_bytes_per_op=bus_per_op,
+    )
+
+
+def load_baselines(path: Path = BASELINE_PATH) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return data.get("results", {})
+
+
+def save_baselines(results: list[BenchResult], path: Path = BASELINE_PATH) -> None:
+    """合并写入基线文件（同名覆盖），附带机器信息便于解读耗时。"""
+    merged = load_baselines(path)
+    for r in results:
+        merged[r.name] = {
+            k: round(v, 1) if isinstance(v, float) else v
+            for k, v in asdict(r).items()
+            if k != "name"
+        }
+    data = {
+        "machine": f"{platform.machine()} {platform.python_implementation()} "
+        f"{platform.python_version()}",
+        "results": dict(sorted(merged.items())),
+    }
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def regressions(result: BenchResult, baseline: Optional[dict]) -> list[str]:
+    """与基线比较，返回确定性指标的回退说明（空列表表示无回退）。"""
+    if not baseline:
+        return []
+    problems = []
+    old_bus = baseline.get("bus_bytes_per_op")
+    if old_bus is not None and result.bus_bytes_per_op is not None:
+        if round(result.bus_bytes_per_op, 1) > old_bus:  # 基线保留一位小数
+            problems.append(f"总线字节 {old_bus:.1f} → {result.bus_bytes_per_op:.1f} B/op")
+    old_alloc = baseline.get("alloc_peak_bytes")
+    if old_alloc is not None:
+        limit = old_alloc * (1 + ALLOC_TOLERANCE) + ALLOC_SLACK_BYTES
+        if result.alloc_peak_bytes > limit:
+            problems.append(f"峰值分配 {old_alloc} → {result.alloc_peak_bytes} B")
+    return problems
+
+
+def speed_change(result: BenchResult, baseline: Optional[dict]) -> str:
+    """相对基线的吞吐变化，例如 "+12%"；无基线时为空串。"""
+    if not baseline or not baseline.get("ops_per_sec"):
+        return ""
+    change = result.ops_per_sec / baseline["ops_per_sec"] - 1
+    return f"{change:+.0%}"
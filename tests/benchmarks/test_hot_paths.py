@@ -0,0 +1,150 @@
+"""热点路径基准：指标采集与格式化、文本栅格化、图像转换与虚拟屏上的总线字节数。
+
+运行：pytest tests/benchmarks --bench；更新基线：pytest tests/benchmarks --bench-save
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+from PIL import Image
+
+from rascode.services.monitoring import (
+    PsutilSource,
+    SystemMonitor,
+    SystemStats,
+    format_stats_for_oled,
+    shared_sampler,
+)
+from rascode.services.network_info import (
+    InterfaceRateTracker,
+    NetworkInfo,
+    collect_network_info,
+    format_time_network_for_oled,
+)
+
+_NOW = datetime(2026, 1, 1, 12, 0, 0)
+_NET = NetworkInfo(ip_address="192.168.1.20", is_up=True, active_interface="wlan0")
+
+
+@pytest.fixture(scope="module")
+def virtual_lcd():
+    pytest.importorskip("luma.lcd")
+    from rascode.hardware.display.virtual import VirtualLcdDisplay
+
+    lcd = VirtualLcdDisplay()
+    lcd.init()
+    return lcd
+
+
+@pytest.fixture(scope="module")
+def virtual_oled():
+    pytest.importorskip("luma.oled")
+    from rascode.hardware.display.virtual import VirtualDualOledDisplay
+
+    oled = VirtualDualOledDisplay()
+    oled.init()
+    return oled
+
+
+def _stats(i: int) -> SystemStats:
+    return SystemStats(
+        cpu_percent=i % 100, cpu_temp_c=40 + i % 10, mem_percent=41.5, disk_percent=63.0
+    )
+
+
+def test_format_stats_for_oled(bench):
+    bench("format_stats_for_oled", lambda i: format_stats_for_oled(_stats(i)), rounds=2000)
+
+
+def test_format_time_network_for_oled(bench):
+    bench(
+        "format_time_network_for_oled",
+        lambda i: format_time_network_for_oled(_NET, _NOW),
+        rounds=2000,
+    )
+
+
+def test_system_monitor_collect(bench):
+    # 每轮先丢弃共享采样器的缓存，测的是一次真实采集，而不是 TTL 缓存命中
+    monitor = SystemMonitor()
+    sampler = shared_sampler()
+
+    def collect(i: int) -> None:
+        sampler.invalidate()
+        monitor.collect()
+
+    bench("SystemMonitor.collect", collect, rounds=200)
+
+
+def _read_all(source) -> None:
+    source.cpu_busy_total()
+    source.mem_percent()
+    source.cpu_temp_c()
+
+
+def test_metric_source_psutil(bench):
+    source = PsutilSource()
+    bench("source.psutil", lambda i: _read_all(source), rounds=500)
+
+
+def test_metric_source_procfs(bench):
+    from rascode.services.procfs import ProcfsSource
+
+    source = ProcfsSource()
+    if not source.pinned:
+        pytest.skip("需要 Linux /proc")
+    bench("source.procfs", lambda i: _read_all(source), rounds=500)
+    source.close()
+
+
+def test_collect_network_info(bench):
+    bench("collect_network_info", lambda i: collect_network_info(), rounds=200)
+
+
+def test_interface_rate_tracker(bench):
+    tracker = InterfaceRateTracker()
+    tracker.sample()
+    bench("InterfaceRateTracker.sample", lambda i: tracker.sample(), rounds=500)
+    tracker.close()
+
+
+def test_lcd_show_lines(bench, virtual_lcd):
+    lcd = virtual_lcd
+
+    def frame(i: int) -> None:
+        lcd.show_lines(["Rascode Dashboard", "", f"uptime {i} s", f"load {i % 7}.00"])
+
+    bench("lcd.show_lines", frame, rounds=100, bus_bytes=lambda: lcd.bus_stats().total_bytes)
+
+
+def test_lcd_render_image(bench, virtual_lcd):
+    source = Image.radial_gradient("L").resize((640, 480)).convert("RGB")
+    bench("lcd.render_image", lambda i: virtual_lcd.render_image(source), rounds=100)
+
+
+def test_lcd_show_image(bench, virtual_lcd):
+    lcd = virtual_lcd
+    images = [
+        Image.radial_gradient("L").resize((640, 480)).convert("RGB"),
+        Image.linear_gradient("L").resize((640, 480)).convert("RGB"),
+    ]
+    bench(
+        "lcd.show_image",
+        lambda i: lcd.show_image(images[i % 2]),
+        rounds=20,
+        alloc_rounds=4,
+        bus_bytes=lambda: lcd.bus_stats().total_bytes,
+    )
+
+
+def test_oled_show_lines(bench, virtual_oled):
+    from rascode.hardware.display import OledDisplayId
+
+    oled = virtual_oled
+
+    def frame(i: int) -> None:
+        oled.show_lines(OledDisplayId.LEFT, format_stats_for_oled(_stats(i)))
+
+    bench("oled.show_lines", frame, rounds=200, bus_bytes=lambda: oled.bus_stats().total_bytes)
@@ -2,8 +2,118 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # 项目根目录 = tests/ 的上一级
 _root = Path(__file__).resolve().parents[1]
 _src = _root / "src"
 if _src.exists() and str(_src) not in sys.path:
     sys.path.insert(0, str(_src))
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("rascode")
+    group.addoption("--bench", action="store_true", help="运行 tests/benchmarks 下的基准测试")
+    group.addoption(
+        "--bench-save", action="store_true", help="运行基准测试并把结果写入基线文件"
+    )
+
+
+class RecordingSerial:
+    """记录 command/data 调用的假串行接口，用于构造 luma 设备。"""
+
+    def __init__(self) -> None:
+        self.commands: list[tuple[int, ...]] = []
+        self.data_bytes = 0
+        self.data_calls = 0
+
+    def command(self, *cmd: int) -> None:
+        self.commands.append(tuple(cmd))
+
+    def data(self, data) -> None:
+        self.data_bytes += len(data)
+        self.data_calls += 1
+
+    def reset(self) -> None:
+        self.commands.clear()
+        self.data_bytes = 0
+        self.data_calls = 0
+
+    def cleanup(self) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_lcd_factory():
+    """构造基于 RecordingSerial 的已初始化主屏，调用返回 (display, serial)。"""
+    pytest.importorskip("luma.lcd")
+    from luma.lcd.device import st7789
+
+    from rascode.hardware.display import LcdHatMainDisplay
+
+    def build(config=None):
+        serial = RecordingSerial()
+
+        class _FakeLcd(LcdHatMainDisplay):
+            def _create_device(self):
+                return st7789(serial, width=240, height=320, backlight=lambda on: None)
+
+        lcd = _FakeLcd(config)
+        lcd.init()
+        serial.reset()
+        return lcd, serial
+
+    return build
+
+
+@pytest.fixture
+def fake_lcd(fake_lcd_factory):
+    """默认配置的假主屏，返回 (display, serial)。"""
+    return fake_lcd_factory()
+
+
+@pytest.fixture
+def fake_oled():
+    """基于 RecordingSerial 的已初始化双 OLED，返回 (display, {side: serial})。"""
+    pytest.importorskip("luma.oled")
+    from luma.oled.device import ssd1306
+
+    from rascode.hardware.display import DualOledDisplay, OledDisplayId
+
+    serials = {OledDisplayId.LEFT: RecordingSerial(), OledDisplayId.RIGHT: RecordingSerial()}
+    oled = DualOledDisplay()
+    oled._left = ssd1306(serials[OledDisplayId.LEFT])
+    oled._right = ssd1306(serials[OledDisplayId.RIGHT])
+    oled.clear()
+    for serial in serials.values():
+        serial.reset()
+    return oled, serials
+
+
+@pytest.fixture
+def virtual_backend(monkeypatch):
+    """display_backend 在本进程内使用虚拟屏（RASCODE_DISPLAY_BACKEND=virtual）。"""
+    pytest.importorskip("luma.lcd")
+    pytest.importorskip("luma.oled")
+    from rascode import display_backend
+
+    monkeypatch.setenv("RASCODE_DISPLAY_BACKEND", "virtual")
+    monkeypatch.setenv("RASCODE_DISPLAY_DAEMON", "0")
+    monkeypatch.delenv("RASCODE_DISABLE_MAIN_LCD", raising=False)
+    for name, value in (
+        ("_lcd", None),
+        ("_oled", None),
+        ("_compositor", None),
+        ("_init_error", None),
+        ("_displays_initialized", False),
+    ):
+        monkeypatch.setattr(display_backend, name, value)
+    yield display_backend
+    if display_backend._compositor is not None:
+        display_backend._compositor.close()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_activity_file(monkeypatch, tmp_path):
+    """MCP 工具会更新活动标记文件，测试中指向临时目录，不影响本机运行的仪表盘。"""
+    monkeypatch.setenv("RASCODE_ACTIVITY_FILE", str(tmp_path / "activity"))
@@ -0,0 +1,83 @@
+"""三联屏合成提交测试：SPI 与 I²C 并行，双 OLED 串行。"""
+
+import threading
+import time
+
+import pytest
+
+
+def _slow(serial, delay, log, name):
+    original = serial.data
+
+    def data(payload):
+        if len(payload) > 16:
+            log.append((name, threading.current_thread().name))
+            time.sleep(delay)
+        original(payload)
+
+    serial.data = data
+
+
+def test_commit_runs_lcd_and_oleds_in_parallel(fake_lcd, fake_oled):
+    from rascode.hardware.display import OledDisplayId, ScreenCompositor
+
+    lcd, lcd_serial = fake_lcd
+    oled, oled_serials = fake_oled
+    log: list = []
+    _slow(lcd_serial, 0.2, log, "main")
+    _slow(oled_serials[OledDisplayId.LEFT], 0.1, log, "left")
+    _slow(oled_serials[OledDisplayId.RIGHT], 0.1, log, "right")
+
+    compositor = ScreenCompositor(lcd, oled)
+    try:
+        compositor.stage_main(["Rascode Dashboard"])
+        compositor.stage_left(["CPU: 50.0%"])
+        compositor.stage_right(["TIME 12:00:00"])
+        report = compositor.commit()
+    finally:
+        compositor.close()
+
+    assert set(report.screens) == {"main", "left", "right"}
+    # 两条总线并行：总耗时接近较慢的一条，而不是三者之和
+    assert report.total_s < sum(report.screens.values())
+    oled_threads = {t for name, t in log if name in ("left", "right")}
+    assert len(oled_threads) == 1  # 双 OLED 在同一线程背靠背写入
+    assert "main=" in report.summary() and "total=" in report.summary()
+
+
+def test_commit_reports_errors(fake_lcd, fake_oled):
+    """一块屏写入失败：另一条总线照常写完，commit() 抛出 DisplayError，报告记录该错误。"""
+    from rascode.hardware.display import CommitError, OledDisplayId, ScreenCompositor
+    from rascode.hardware.display.base import DisplayError
+
+    lcd, lcd_serial = fake_lcd
+    oled, oled_serials = fake_oled
+
+    def broken(payload):
+        raise OSError("I2C bus error")
+
+    oled_serials[OledDisplayId.LEFT].data = broken
+    compositor = ScreenCompositor(lcd, oled)
+    try:
+        compositor.stage_main(["Rascode Dashboard"])
+        compositor.stage_left(["CPU: 50.0%"])
+        with pytest.raises(DisplayError) as excinfo:
+            compositor.commit()
+    finally:
+        compositor.close()
+
+    assert isinstance(excinfo.value, CommitError)
+    report = excinfo.value.report
+    assert "I2C bus error" in report.errors["oled"]
+    assert "main" in report.screens and "left" not in report.screens
+    assert lcd_serial.data_bytes > 0
+
+
+def test_staging_without_display_is_rejected(fake_oled):
+    from rascode.hardware.display import ScreenCompositor
+    from rascode.hardware.display.base import DisplayError
+
+    oled, _ = fake_oled
+    compositor = ScreenCompositor(oled=oled)
+    with pytest.raises(DisplayError):
+        compositor.stage_main(["no lcd"])
@@ -0,0 +1,113 @@
+"""显示守护进程与本地 IPC 协议测试（本地后端用假实现替代硬件）。"""
+
+import socket
+import threading
+
+import pytest
+
+from rascode.daemon.protocol import (
+    Opcode,
+    ProtocolError,
+    Screen,
+    decode_lines,
+    encode,
+    encode_lines,
+    read_frame,
+)
+
+
+def test_frame_roundtrip():
+    a, b = socket.socketpair()
+    try:
+        a.sendall(encode(Opcode.SHOW_LINES, Screen.LEFT, encode_lines(["CPU: 1%", "温度 40"])))
+        op, screen, payload = read_frame(b)
+        assert (op, screen) == (Opcode.SHOW_LINES, Screen.LEFT)
+        assert decode_lines(payload) == ["CPU: 1%", "温度 40"]
+    finally:
+        a.close()
+        b.close()
+
+
+def test_bad_magic_is_rejected():
+    a, b = socket.socketpair()
+    try:
+        a.sendall(b"XX" + encode(Opcode.PING)[2:])
+        with pytest.raises(ProtocolError):
+            read_frame(b)
+    finally:
+        a.close()
+        b.close()
+
+
+@pytest.fixture
+def running_daemon(tmp_path, monkeypatch):
+    """在临时套接字上运行守护进程，本地后端替换为记录调用的假实现。"""
+    from rascode import display_backend
+    from rascode.daemon import DisplayDaemon
+
+    calls = []
+
+    def fake_show(lines):
+        calls.append(("main", lines))
+        return "ok"
+
+    def fake_clear(screen):
+        calls.append(("clear", screen))
+        return "ok"
+
+    monkeypatch.setattr(display_backend, "_local_show_main_text", fake_show)
+    monkeypatch.setattr(display_backend, "_local_clear_screen", fake_clear)
+    monkeypatch.setattr(display_backend, "_local_only", False)  # 测试结束后恢复为 False
+    path = tmp_path / "display.sock"
+    daemon = DisplayDaemon(path, init_devices=False)
+    daemon.start()
+    monkeypatch.setattr(display_backend, "_local_only", False)  # start() 会置位，测试进程仍作客户端
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("RASCODE_DISPLAY_SOCKET", str(path))
+    yield daemon, calls
+    daemon.shutdown()
+    thread.join(timeout=5)
+
+
+def test_backend_forwards_to_daemon(running_daemon):
+    from rascode import display_backend
+
+    daemon, calls = running_daemon
+    assert display_backend.daemon_available()
+    assert display_backend.show_main_text(["hello", "world"]) == "ok"
+    assert display_backend.clear_screen("all") == "ok"
+    assert calls == [("main", ["hello", "world"]), ("clear", "all")]
+
+
+def test_daemon_refuses_second_instance(running_daemon):
+    from rascode.daemon import DisplayDaemon
+
+    daemon, _ = running_daemon
+    with pytest.raises(RuntimeError):
+        DisplayDaemon(daemon.socket_path, init_devices=False).start()
+
+
+def test_backend_stays_local_without_daemon(tmp_path, monkeypatch):
+    from rascode import display_backend
+
+    monkeypatch.setenv("RASCODE_DISPLAY_SOCKET", str(tmp_path / "missing.sock"))
+    assert display_backend._daemon_client() is None
+    assert not display_backend.daemon_available()
+
+
+def test_backend_falls_back_to_local_with_stale_socket(tmp_path, monkeypatch):
+    """守护进程退出后残留的套接字文件连接被拒绝：走本地设备，而不是报告守护进程不可用。"""
+    from rascode import display_backend
+
+    path = tmp_path / "stale.sock"
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(path))
+    sock.close()  # 文件留在原处，但没有进程监听
+    assert path.exists()
+    monkeypatch.setenv("RASCODE_DISPLAY_SOCKET", str(path))
+    monkeypatch.delenv("RASCODE_DISPLAY_DAEMON", raising=False)
+    monkeypatch.setattr(display_backend, "_local_show_main_text", lambda lines: "local")
+    assert display_backend._daemon_client() is None
+    assert not display_backend.daemon_available()
+    assert display_backend.show_main_text(["hello"]) == "local"
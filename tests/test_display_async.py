@@ -0,0 +1,88 @@
+"""display_backend 异步接口测试（假的慢速设备）。"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    from rascode import display_backend
+
+    monkeypatch.setenv("RASCODE_DISPLAY_DAEMON", "0")
+    return display_backend
+
+
+def test_event_loop_stays_responsive(backend, monkeypatch):
+    def slow(lines):
+        time.sleep(0.2)
+        return "ok"
+
+    monkeypatch.setattr(backend, "_local_show_main_text", slow)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        result = await backend.show_main_text_async(["x"])
+        task.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(run())
+    assert result == "ok"
+    assert ticks >= 5
+
+
+def test_timeout_returns_message(backend, monkeypatch):
+    release = threading.Event()
+
+    def stuck(lines):
+        release.wait(5)
+        return "ok"
+
+    monkeypatch.setattr(backend, "_local_show_right_oled", stuck)
+    try:
+        result = asyncio.run(backend.show_right_oled_async(["x"], timeout=0.05))
+    finally:
+        release.set()
+    assert "超时" in result
+
+
+def test_concurrent_lanes_initialise_devices_once(virtual_backend, monkeypatch):
+    """SPI 与 I²C 通道同时发起首次写屏：设备只初始化一次，另一通道等待初始化完成。"""
+    import rascode.hardware.display as display
+
+    backend = virtual_backend
+    create_oled = display.create_oled_display
+    created = []
+
+    def slow_oled():
+        oled = create_oled()
+        init = oled.init
+
+        def slow_init():
+            time.sleep(0.05)  # 拉长初始化窗口，让另一通道的调用落在其中
+            init()
+
+        oled.init = slow_init
+        created.append(oled)
+        return oled
+
+    monkeypatch.setattr(display, "create_oled_display", slow_oled)
+
+    async def run():
+        return await asyncio.gather(
+            backend.show_main_text_async(["main"]),
+            backend.show_left_oled_async(["left"]),
+        )
+
+    assert asyncio.run(run()) == ["ok", "ok"]
+    assert len(created) == 1
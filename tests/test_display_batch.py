@@ -0,0 +1,72 @@
+"""批量写屏测试：一次请求刷新多块屏并返回每屏耗时。"""
+
+import pytest
+
+
+@pytest.fixture
+def local_backend(monkeypatch, fake_lcd, fake_oled):
+    """display_backend 使用假主屏与假双 OLED。"""
+    from rascode import display_backend
+    from rascode.hardware.display import ScreenCompositor
+
+    lcd, lcd_serial = fake_lcd
+    oled, oled_serials = fake_oled
+    compositor = ScreenCompositor(lcd, oled)
+    monkeypatch.setenv("RASCODE_DISPLAY_DAEMON", "0")
+    monkeypatch.delenv("RASCODE_DISABLE_MAIN_LCD", raising=False)
+    monkeypatch.setattr(display_backend, "_lcd", lcd)
+    monkeypatch.setattr(display_backend, "_oled", oled)
+    monkeypatch.setattr(display_backend, "_compositor", compositor)
+    monkeypatch.setattr(display_backend, "_displays_initialized", True)
+    yield display_backend, lcd_serial, oled_serials
+    compositor.close()
+
+
+def test_show_screens_commits_subset(local_backend):
+    from rascode.hardware.display import OledDisplayId
+
+    backend, lcd_serial, oled_serials = local_backend
+    result = backend.show_screens(main=["Build #42", "passed"], left=["CPU: 3%"])
+    assert result.startswith("ok ")
+    assert "main=" in result and "left=" in result and "total=" in result
+    assert "right=" not in result
+    assert lcd_serial.data_bytes > 0
+    assert oled_serials[OledDisplayId.LEFT].data_bytes > 0
+    assert oled_serials[OledDisplayId.RIGHT].data_bytes == 0
+
+
+def test_show_screens_requires_content(local_backend):
+    backend, _, _ = local_backend
+    assert "未指定" in backend.show_screens()
+
+
+def test_batch_payload_roundtrip():
+    from rascode.daemon.protocol import Screen, decode_batch, encode_batch
+
+    screens = {Screen.MAIN: ["a", "b"], Screen.RIGHT: ["12:00"], Screen.LEFT: []}
+    assert decode_batch(encode_batch(screens)) == screens
+
+
+def test_batch_stages_independently_of_other_callers(local_backend):
+    """批量写屏使用独立暂存区：不会提交或清掉其他调用方已暂存的帧。"""
+    from rascode import display_backend
+    from rascode.hardware.display import OledDisplayId
+
+    backend, lcd_serial, oled_serials = local_backend
+    display_backend._compositor.stage_main(["staged by another batch"])
+    assert backend.show_screens(left=["CPU: 3%"]).startswith("ok ")
+    assert lcd_serial.data_bytes == 0
+    assert oled_serials[OledDisplayId.LEFT].data_bytes > 0
+    report = display_backend._compositor.commit()
+    assert "main" in report.screens and lcd_serial.data_bytes > 0
+
+
+def test_batch_with_only_unavailable_screens_is_an_error(local_backend, monkeypatch):
+    from rascode import display_backend
+
+    backend, _, _ = local_backend
+    monkeypatch.setattr(display_backend, "_oled", None)
+    result = backend.show_screens(left=["CPU: 3%"], right=["12:00"])
+    assert not result.startswith("ok")
+    assert "left" in result and "right" in result
+    assert backend.show_screens(main=["Build #42"], left=["CPU: 3%"]).startswith("ok ")
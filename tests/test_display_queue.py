@@ -0,0 +1,113 @@
+"""写屏命令队列测试：同屏合并、屏障顺序与并发串行。"""
+
+import threading
+
+from rascode.display_queue import DisplayCommandQueue
+
+
+def _blocked_queue():
+    """返回 (queue, gate)：队列工作线程卡在第一条命令上，直到 gate.set()。"""
+    queue = DisplayCommandQueue()
+    gate = threading.Event()
+    started = threading.Event()
+
+    def hold():
+        started.set()
+        gate.wait(5)
+        return "ok"
+
+    queue.submit(None, hold)
+    assert started.wait(5)
+    return queue, gate
+
+
+def test_pending_updates_coalesce_per_screen():
+    queue, gate = _blocked_queue()
+    done = []
+    futures = [
+        queue.submit("main", lambda i=i: done.append(("main", i)) or f"main{i}") for i in range(3)
+    ]
+    futures.append(queue.submit("left", lambda: done.append(("left", 0)) or "left0"))
+    assert queue.stats().depth == 2
+    gate.set()
+
+    assert [f.result(5) for f in futures] == ["main2", "main2", "main2", "left0"]
+    assert done == [("main", 2), ("left", 0)]
+    stats = queue.stats()
+    assert stats.superseded == 2
+    assert stats.depth == 0
+
+
+def test_barrier_keeps_order():
+    queue, gate = _blocked_queue()
+    order = []
+    a = queue.submit("main", lambda: order.append("a") or "ok")
+    c = queue.submit(None, lambda: order.append("clear") or "ok")
+    b = queue.submit("main", lambda: order.append("b") or "ok")
+    gate.set()
+    for f in (a, c, b):
+        f.result(5)
+    assert order == ["a", "clear", "b"]
+    assert queue.stats().superseded == 0
+
+
+def test_backend_serializes_calls_per_bus(monkeypatch):
+    from rascode import display_backend
+
+    monkeypatch.setenv("RASCODE_DISPLAY_DAEMON", "0")
+    lock = threading.Lock()
+    active = {"spi": 0, "i2c": 0}
+    peak = {"spi": 0, "i2c": 0}
+
+    def fake(bus):
+        def show(lines):
+            with lock:
+                active[bus] += 1
+                peak[bus] = max(peak[bus], active[bus])
+            threading.Event().wait(0.01)
+            with lock:
+                active[bus] -= 1
+            return "ok"
+
+        return show
+
+    monkeypatch.setattr(display_backend, "_local_show_main_text", fake("spi"))
+    monkeypatch.setattr(display_backend, "_local_show_left_oled", fake("i2c"))
+    monkeypatch.setattr(display_backend, "_local_show_right_oled", fake("i2c"))
+    calls = [
+        display_backend.show_main_text,
+        display_backend.show_left_oled,
+        display_backend.show_right_oled,
+    ]
+    results = []
+    threads = [
+        threading.Thread(target=lambda i=i: results.append(calls[i % 3](["x"])))
+        for i in range(9)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert results == ["ok"] * 9
+    assert peak == {"spi": 1, "i2c": 1}
+
+
+def test_cross_lane_barrier_orders_both_lanes():
+    queue = DisplayCommandQueue(lanes=("spi", "i2c"))
+    gate = threading.Event()
+    order = []
+
+    def hold():
+        gate.wait(5)
+        order.append("spi-busy")
+        return "ok"
+
+    queue.submit(None, hold, lanes=("spi",))
+    left = queue.submit("left", lambda: order.append("left") or "ok", lanes=("i2c",))
+    left.result(5)
+    barrier = queue.submit(None, lambda: order.append("all") or "ok")
+    after = queue.submit("left", lambda: order.append("left2") or "ok", lanes=("i2c",))
+    gate.set()
+    barrier.result(5)
+    after.result(5)
+    assert order == ["left", "spi-busy", "all", "left2"]
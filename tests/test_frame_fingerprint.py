@@ -0,0 +1,58 @@
+"""帧指纹跳帧测试：内容不变时不产生总线传输。"""
+
+from rascode.hardware.display.framebuffer import frame_digest
+
+
+def test_frame_digest_depends_on_pixels():
+    """像素不同指纹不同，像素相同指纹相同。"""
+    from PIL import Image
+
+    a = Image.new("1", (128, 64))
+    b = a.copy()
+    assert frame_digest(a) == frame_digest(b)
+    b.putpixel((0, 0), 1)
+    assert frame_digest(a) != frame_digest(b)
+
+
+def test_frame_digest_includes_palette():
+    """调色板图像索引相同、调色板不同时指纹不同，抖动缓存不会把两者当成同一帧。"""
+    from PIL import Image
+
+    from rascode.hardware.display.dither import dither_cached
+
+    dark = Image.new("P", (16, 8))
+    dark.putpalette([0, 0, 0] * 256)
+    light = dark.copy()
+    light.putpalette([255, 255, 255] * 256)
+    assert dark.tobytes() == light.tobytes()
+    assert frame_digest(dark) != frame_digest(light)
+    assert dither_cached(dark, (16, 8)).tobytes() != dither_cached(light, (16, 8)).tobytes()
+
+
+def test_lcd_skips_identical_frames(fake_lcd):
+    """主屏重复显示相同内容时计入 frames_skipped，且无 SPI 传输。"""
+    lcd, serial = fake_lcd
+    lcd.show_lines(["Rascode Dashboard", ""])
+    sent = lcd.transfer_stats().frames_sent
+    serial.reset()
+    for _ in range(3):
+        lcd.show_lines(["Rascode Dashboard", ""])
+    stats = lcd.transfer_stats()
+    assert serial.commands == [] and serial.data_bytes == 0
+    assert stats.frames_skipped == 3
+    assert stats.frames_sent == sent
+
+
+def test_oled_skips_identical_frames(fake_oled):
+    """OLED 相同文本只传一次，另一侧不受影响。"""
+    from rascode.hardware.display import OledDisplayId
+
+    oled, serials = fake_oled
+    oled.show_lines(OledDisplayId.LEFT, ["CPU:  1.0%"])
+    calls = serials[OledDisplayId.LEFT].data_calls
+    assert calls > 0
+    oled.show_lines(OledDisplayId.LEFT, ["CPU:  1.0%"])
+    left = oled.transfer_stats(OledDisplayId.LEFT)
+    assert left.frames_skipped == 1
+    assert serials[OledDisplayId.LEFT].data_calls == calls
+    assert serials[OledDisplayId.RIGHT].data_calls == 0
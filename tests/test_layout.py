@@ -0,0 +1,167 @@
+"""声明式版面测试：小部件脏标记、只重绘变化的部分，以及脏区提示驱动的局部刷新。"""
+
+import pytest
+from PIL import Image
+
+from rascode.hardware.display import Layout, ProgressWidget, TextWidget
+from rascode.hardware.display.base import DisplayError
+from rascode.hardware.display.framebuffer import pack_pages, rect_segments
+from rascode.panels import stats_layout, update_stats_layout
+from rascode.services.monitoring import SystemStats
+
+
+def _stats(cpu: float = 12.0, disk: float = 40.0) -> SystemStats:
+    return SystemStats(cpu_percent=cpu, cpu_temp_c=45.0, mem_percent=30.0, disk_percent=disk)
+
+
+def test_compose_redraws_only_changed_widgets(fake_oled):
+    """只有值变化的行被重绘；整帧与按文本行渲染的结果逐像素一致。"""
+    from rascode.hardware.display import OledDisplayId
+    from rascode.services.monitoring import format_stats_for_oled
+
+    oled, _ = fake_oled
+    layout = stats_layout()
+    update_stats_layout(layout, _stats())
+    _, rects = layout.compose()
+    assert len(rects) == 4
+    assert update_stats_layout(layout, _stats()) == []
+    assert layout.compose()[1] == []
+    assert update_stats_layout(layout, _stats(cpu=99.0)) == ["cpu"]
+    frame, rects = layout.compose()
+    assert rects == [(0, 0, 128, 10)]
+    expected = oled.render_lines(OledDisplayId.LEFT, format_stats_for_oled(_stats(cpu=99.0)))
+    assert frame.tobytes() == expected.tobytes()
+
+
+def test_progress_dirty_only_when_pixels_change():
+    layout = Layout((104, 8))
+    bar = layout.add("bar", ProgressWidget((0, 0, 104, 8)))  # 内条 100 像素
+    layout.update(bar=50.0)
+    layout.compose()
+    assert layout.update(bar=50.2) == []
+    assert not bar.dirty
+    assert layout.update(bar=51.0) == ["bar"]
+
+
+def test_rect_segments_cover_pages_and_merge():
+    segs = rect_segments([(0, 0, 10, 10), (12, 4, 20, 8), (100, 60, 140, 70)], 128, 64, merge_gap=6)
+    assert segs == [(0, 0, 20), (1, 0, 10), (7, 100, 128)]
+
+
+def test_oled_commit_with_dirty_hint_writes_only_hinted_pages(fake_oled):
+    from rascode.hardware.display import OledDisplayId
+
+    oled, serials = fake_oled
+    layout = stats_layout()
+    update_stats_layout(layout, _stats())
+    oled.commit_frame(OledDisplayId.LEFT, *layout.compose())
+    serial = serials[OledDisplayId.LEFT]
+    serial.reset()
+    update_stats_layout(layout, _stats(disk=41.0))
+    frame, rects = layout.compose()
+    oled.commit_frame(OledDisplayId.LEFT, frame, dirty=rects)
+    assert 0 < serial.data_bytes <= 2 * 128  # DSK 行跨第 3、4 页
+    assert oled._shadows[OledDisplayId.LEFT] == pack_pages(frame)
+    serial.reset()
+    oled.commit_frame(OledDisplayId.LEFT, frame, dirty=[])
+    assert serial.data_bytes == 0
+
+
+def test_lcd_commit_with_dirty_hint_sends_hinted_rects(fake_lcd):
+    lcd, serial = fake_lcd
+    layout = Layout((240, 320), mode="RGB", fill="white", background="black")
+    layout.add("title", TextWidget((0, 0, 240, 14), line_height=14))
+    layout.add("clock", TextWidget((0, 100, 120, 114), line_height=14))
+    layout.update(title="Rascode", clock="12:00:00")
+    lcd.commit_frame(*layout.compose())  # 首帧没有影子帧，按整帧比对
+    serial.reset()
+    layout.update(clock="12:00:01")
+    frame, rects = layout.compose()
+    lcd.commit_frame(frame, dirty=rects)
+    assert rects == [(0, 100, 120, 114)]
+    pixels = 120 * 14 * 3
+    assert pixels <= serial.data_bytes < pixels + 16  # 另有列/行地址参数
+    assert lcd._shadow.tobytes() == frame.tobytes()
+    assert lcd.transfer_stats().partial_frames >= 1
+    blank = Image.new("RGB", (240, 320), "black")
+    serial.reset()
+    lcd.commit_frame(blank, dirty=[])
+    assert serial.data_bytes == 0
+
+
+def test_oled_idle_handler_dims_and_blanks(fake_oled):
+    from rascode.hardware.display import OledDisplayId
+    from rascode.hardware.display.oled_dual import DEFAULT_CONTRAST
+    from rascode.panels import DIM_CONTRAST, oled_idle_handler
+    from rascode.services.scheduler import IDLE_ACTIVE, IDLE_BLANKED, IDLE_DIMMED
+
+    oled, serials = fake_oled
+    on_state = oled_idle_handler(oled)
+    on_state(IDLE_DIMMED)
+    on_state(IDLE_BLANKED)
+    on_state(IDLE_ACTIVE)
+    for side in OledDisplayId:
+        assert serials[side].commands == [
+            (0x81, DIM_CONTRAST),
+            (0xAF,),
+            (0xAE,),
+            (0x81, DEFAULT_CONTRAST),
+            (0xAF,),
+        ]
+
+
+def _fail_once(monkeypatch, serial) -> None:
+    """serial 的下一次数据写入抛出 OSError（模拟一次总线错误）。"""
+    data = serial.data
+    calls = []
+
+    def flaky(payload):
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError("bus error")
+        data(payload)
+
+    monkeypatch.setattr(serial, "data", flaky)
+
+
+def test_failed_oled_commit_falls_back_to_full_diff(monkeypatch):
+    """提交中途失败后影子缓冲作废：后续按提示提交仍会补写失败帧漏掉的区域。"""
+    from rascode.hardware.display import OledDisplayId
+    from rascode.hardware.display.virtual import VirtualDualOledDisplay
+
+    oled = VirtualDualOledDisplay()
+    oled.init()
+    layout = stats_layout()
+    update_stats_layout(layout, _stats())
+    oled.commit_frame(OledDisplayId.LEFT, *layout.compose())
+    _fail_once(monkeypatch, oled.serials[OledDisplayId.LEFT])
+    update_stats_layout(layout, _stats(cpu=99.0))
+    with pytest.raises((OSError, DisplayError)):
+        oled.commit_frame(OledDisplayId.LEFT, *layout.compose())
+    for disk in (41.0, 42.0, 43.0):
+        update_stats_layout(layout, _stats(cpu=99.0, disk=disk))
+        frame, rects = layout.compose()
+        assert rects == [(0, 30, 128, 40)]  # 只有 DSK 行带提示，CPU 行靠整帧比对补写
+        oled.commit_frame(OledDisplayId.LEFT, frame, dirty=rects)
+        assert oled.framebuffer(OledDisplayId.LEFT).tobytes() == frame.tobytes()
+
+
+def test_failed_lcd_commit_falls_back_to_full_diff(monkeypatch):
+    from rascode.hardware.display.virtual import VirtualLcdDisplay
+
+    lcd = VirtualLcdDisplay()
+    lcd.init()
+    layout = Layout((240, 320), mode="RGB", fill="white", background="black")
+    layout.add("title", TextWidget((0, 0, 240, 14), line_height=14))
+    layout.add("clock", TextWidget((0, 100, 120, 114), line_height=14))
+    layout.update(title="Rascode", clock="12:00:00")
+    lcd.commit_frame(*layout.compose())
+    _fail_once(monkeypatch, lcd.serial)
+    layout.update(title="Rascode!")
+    with pytest.raises((OSError, DisplayError)):
+        lcd.commit_frame(*layout.compose())
+    for second in range(1, 4):
+        layout.update(clock=f"12:00:0{second}")
+        frame, rects = layout.compose()
+        lcd.commit_frame(frame, dirty=rects)
+        assert lcd.framebuffer().tobytes() == frame.tobytes()
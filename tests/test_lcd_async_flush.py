@@ -0,0 +1,59 @@
+"""主屏后台刷屏线程测试：调用方不阻塞、最新帧优先。"""
+
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def gated_async_lcd(fake_lcd_factory, monkeypatch):
+    """像素数据写入时停在闸门上，直到测试放行；返回 (lcd, 传输开始事件, 闸门)。"""
+    from rascode.hardware.display import LcdConfig
+
+    lcd, serial = fake_lcd_factory(LcdConfig(async_flush=True))
+    lcd.flush(timeout=5)  # init() 提交的清屏帧先传完
+    original = serial.data
+    transferring = threading.Event()
+    gate = threading.Event()
+
+    def gated_data(data):
+        if len(data) > 64:  # 只拦住像素数据，命令参数照常
+            transferring.set()
+            gate.wait(5)
+        original(data)
+
+    monkeypatch.setattr(serial, "data", gated_data)
+    yield lcd, transferring, gate
+    gate.set()
+    lcd.shutdown()
+
+
+def test_show_lines_returns_before_transfer(gated_async_lcd):
+    """异步模式下传输未结束时调用方照常返回，旧帧被替换，最终上屏的是最后一帧。"""
+    lcd, transferring, gate = gated_async_lcd
+    before = lcd.transfer_stats()
+    lcd.show_lines(["frame 0"])
+    assert transferring.wait(5)
+    # 刷屏线程停在闸门上：下面的调用能返回，说明调用方不等待传输
+    for i in range(1, 10):
+        lcd.show_lines([f"frame {i}"])
+    assert not gate.is_set()
+    assert lcd.wait_idle(timeout=0) is False
+
+    gate.set()
+    lcd.flush(timeout=5)
+    stats = lcd.transfer_stats()
+    assert stats.frames_superseded - before.frames_superseded == 8  # frame 1..8
+    assert stats.frames_sent - before.frames_sent == 2  # frame 0 与 frame 9
+    assert lcd._shadow.tobytes() == lcd.render_lines(["frame 9"]).tobytes()
+
+    lcd.show_lines(["frame 9"])
+    lcd.flush(timeout=5)
+    assert lcd.transfer_stats().frames_skipped == stats.frames_skipped + 1  # 与已上屏内容相同
+
+
+def test_wait_idle_in_sync_mode(fake_lcd):
+    """同步模式下 wait_idle/flush 直接返回。"""
+    lcd, _ = fake_lcd
+    assert lcd.wait_idle(timeout=0) is True
+    lcd.flush()
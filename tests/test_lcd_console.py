@@ -0,0 +1,48 @@
+"""主屏控制台模式（硬件垂直滚动）测试。"""
+
+import pytest
+
+VSCRDEF, VSCSAD, NORON = 0x33, 0x37, 0x13
+
+
+def _commands(serial, op):
+    return [c for c in serial.commands if c == (op,)]
+
+
+def test_append_line_writes_one_band(fake_lcd):
+    """每追加一行只传一条行带，写满后每行附带一次滚动起始行命令。"""
+    lcd, serial = fake_lcd
+    lcd.append_line("boot")
+    assert _commands(serial, VSCRDEF)
+    rows = 320 // 14
+    for i in range(1, rows):
+        lcd.append_line(f"line {i}")
+    assert len(lcd.console_lines()) == rows
+
+    serial.reset()
+    lcd.append_line("overflow")
+    band_bytes = 240 * 14 * 3
+    assert serial.data_bytes == band_bytes + 8 + 2  # 像素 + 窗口参数 + VSCSAD 参数
+    assert len(_commands(serial, VSCSAD)) == 1
+    assert lcd.console_lines()[0] == "line 1"
+    assert lcd.console_lines()[-1] == "overflow"
+
+
+def test_show_lines_exits_console(fake_lcd):
+    """普通显示会退出滚动模式并整屏重绘。"""
+    lcd, serial = fake_lcd
+    lcd.append_line("tail")
+    serial.reset()
+    lcd.show_lines(["Rascode Dashboard"])
+    assert _commands(serial, NORON)
+    assert lcd.console_lines() == []
+    assert lcd.transfer_stats().last_bytes_sent == 240 * 320 * 3 + 11
+
+
+def test_console_requires_rotation_zero(fake_lcd_factory):
+    from rascode.hardware.display import LcdConfig
+    from rascode.hardware.display.base import DisplayError
+
+    lcd, _ = fake_lcd_factory(LcdConfig(rotation=90))
+    with pytest.raises(DisplayError):
+        lcd.append_line("x")
@@ -0,0 +1,44 @@
+"""主屏脏矩形局部刷新测试（假 SPI 接口，不依赖硬件）。"""
+
+from PIL import Image
+
+from rascode.hardware.display.framebuffer import dirty_rects
+
+
+def test_dirty_rects_identical_frames_is_empty():
+    """两帧相同时无需重传。"""
+    a = Image.new("RGB", (240, 320), "black")
+    assert dirty_rects(a, a.copy()) == []
+
+
+def test_dirty_rects_separates_distant_changes():
+    """相距较远的两处变化拆成两个矩形，而不是一个大框。"""
+    old = Image.new("RGB", (240, 320), "black")
+    new = old.copy()
+    new.putpixel((5, 2), (255, 255, 255))
+    new.putpixel((200, 300), (255, 255, 255))
+    rects = dirty_rects(old, new, band_rows=16)
+    assert rects == [(5, 2, 6, 3), (200, 300, 201, 301)]
+    assert dirty_rects(None, new) == [(0, 0, 240, 320)]
+
+
+def test_show_lines_sends_only_changed_rows(fake_lcd):
+    """只改一行时传输量远小于整帧，并记录节省的字节数。"""
+    lcd, serial = fake_lcd
+    lcd.show_lines(["Rascode", "12:00:00"])
+    serial.reset()
+    lcd.show_lines(["Rascode", "12:00:01"])
+    stats = lcd.transfer_stats()
+    full = 240 * 320 * 3
+    assert 0 < serial.data_bytes < full // 10
+    assert stats.last_bytes_saved > full * 9 // 10
+    assert stats.partial_frames >= 1
+
+
+def test_clear_after_clear_sends_nothing(fake_lcd):
+    """init 之后再次 clear 不产生像素传输。"""
+    lcd, serial = fake_lcd
+    lcd.clear()
+    assert serial.data_bytes == 0
+    lcd.show_image(Image.new("RGB", (100, 100), "red"))
+    assert serial.data_bytes > 0
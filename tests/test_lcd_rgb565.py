@@ -0,0 +1,29 @@
+"""主屏 RGB565 快速通道测试。"""
+
+import pytest
+from PIL import Image
+
+np = pytest.importorskip("numpy")
+
+
+def test_to_rgb565_packs_big_endian():
+    """纯色转换结果符合 RGB565 位布局，且为大端字节序。"""
+    from rascode.hardware.display.rgb565 import to_rgb565, window_bytes
+
+    img = Image.new("RGB", (4, 2), (255, 0, 0))
+    img.putpixel((1, 0), (0, 255, 0))
+    img.putpixel((2, 0), (0, 0, 255))
+    pixels = to_rgb565(img)
+    assert pixels.shape == (2, 4)
+    assert [int(v) for v in pixels[0, :3]] == [0xF800, 0x07E0, 0x001F]
+    assert bytes(window_bytes(pixels, (0, 0, 1, 1))) == b"\xf8\x00"
+
+
+def test_rgb565_mode_sends_two_bytes_per_pixel(fake_lcd_factory):
+    """启用 RGB565 后设置 COLMOD=0x05，整帧按每像素 2 字节计。"""
+    from rascode.hardware.display import LcdConfig
+
+    lcd, serial = fake_lcd_factory(LcdConfig(rgb565=True))
+    lcd.show_image(Image.new("RGB", (240, 320), "white"))
+    assert serial.data_bytes == 240 * 320 * 2 + 8  # 含 CASET/RASET 参数
+    assert lcd.transfer_stats().last_bytes_sent == 240 * 320 * 2 + 11
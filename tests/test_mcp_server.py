@@ -1,5 +1,8 @@
 """MCP 三联屏工具测试（不依赖真实硬件，仅校验返回类型与内容）。"""
 
+import asyncio
+import threading
+
 import pytest
 
 try:
@@ -13,7 +16,7 @@ def test_show_main_text_returns_str():
     """show_main_text 返回字符串（无硬件时为不可用提示）。"""
     from rascode.mcp.server import _show_main_text
 
-    result = _show_main_text([])
+    result = asyncio.run(_show_main_text([]))
     assert isinstance(result, str)
     assert len(result) > 0
     assert result in ("ok",) or "不可用" in result or "失败" in result
@@ -24,7 +27,7 @@ def test_show_left_oled_returns_str():
     """show_left_oled 返回字符串。"""
     from rascode.mcp.server import _show_left_oled
 
-    result = _show_left_oled([])
+    result = asyncio.run(_show_left_oled([]))
     assert isinstance(result, str)
     assert len(result) > 0
 
@@ -34,7 +37,7 @@ def test_show_right_oled_returns_str():
     """show_right_oled 返回字符串。"""
     from rascode.mcp.server import _show_right_oled
 
-    result = _show_right_oled([])
+    result = asyncio.run(_show_right_oled([]))
     assert isinstance(result, str)
     assert len(result) > 0
 
@@ -44,7 +47,7 @@ def test_clear_screen_returns_str():
     """clear_screen 返回字符串。"""
     from rascode.mcp.server import _clear_screen
 
-    result = _clear_screen("all")
+    result = asyncio.run(_clear_screen("all"))
     assert isinstance(result, str)
     assert len(result) > 0
 
@@ -54,6 +57,55 @@ def test_restore_dashboard_returns_str():
     """restore_dashboard 返回字符串。"""
     from rascode.mcp.server import _restore_dashboard
 
-    result = _restore_dashboard()
+    result = asyncio.run(_restore_dashboard())
     assert isinstance(result, str)
     assert len(result) > 0
+
+
+@pytest.mark.skipif(fastmcp is None, reason="fastmcp not installed")
+def test_tool_calls_overlap_on_slow_devices(monkeypatch):
+    """主屏（SPI）与 OLED（I²C）都很慢时，并发的工具调用在时间上重叠执行。"""
+    from fastmcp import Client
+
+    from rascode import display_backend
+    from rascode.mcp.server import mcp
+
+    monkeypatch.setenv("RASCODE_DISPLAY_DAEMON", "0")
+
+    started = {"main": threading.Event(), "left": threading.Event()}
+    workers: dict[str, str] = {}
+
+    def slow(name: str, other: str):
+        def write(lines):
+            workers[name] = threading.current_thread().name
+            started[name].set()
+            # 两次写屏并发执行时对方也已开始；串行执行时只能等到超时
+            return "ok" if started[other].wait(5) else "serialized"
+
+        return write
+
+    monkeypatch.setattr(display_backend, "_local_show_main_text", slow("main", "left"))
+    monkeypatch.setattr(display_backend, "_local_show_left_oled", slow("left", "main"))
+
+    async def run():
+        async with Client(mcp) as client:
+            return await asyncio.gather(
+                client.call_tool("show_main_text", {"lines": ["a"]}),
+                client.call_tool("show_left_oled", {"lines": ["b"]}),
+            )
+
+    results = asyncio.run(run())
+    assert [r.data for r in results] == ["ok", "ok"]
+    # 各自在所在总线通道的工作线程上执行
+    assert workers["main"].endswith("-spi") and workers["left"].endswith("-i2c")
+
+
+@pytest.mark.skipif(fastmcp is None, reason="fastmcp not installed")
+def test_tools_succeed_on_virtual_displays(virtual_backend):
+    """虚拟屏下工具调用真正成功，而不只是返回错误提示。"""
+    from rascode.mcp.server import _clear_screen, _show_screens
+
+    result = asyncio.run(_show_screens(main=["Hello"], left=["CPU: 1%"], right=["12:00"]))
+    assert result.startswith("ok ")
+    assert asyncio.run(_clear_screen("all")) == "ok"
+    assert virtual_backend._lcd.framebuffer().getbbox() is None
@@ -0,0 +1,105 @@
+"""指标环形缓冲、后台采集器与趋势图小部件测试。"""
+
+import math
+from array import array
+
+from PIL import Image
+
+from rascode.hardware.display import Sparkline
+from rascode.services import MetricRing, MetricsCollector, SystemStats
+
+
+def test_ring_overwrites_oldest_and_keeps_order():
+    """超出容量后覆盖最旧的采样，last() 按时间顺序返回。"""
+    ring = MetricRing(4)
+    for t in range(6):
+        ring.append(float(t), t * 10.0)
+    assert len(ring) == 4
+    assert ring.last(10) == [20.0, 30.0, 40.0, 50.0]
+    assert ring.last(2) == [40.0, 50.0]
+    out = array("d", bytes(8 * 3))
+    assert ring.copy_last(out) == 3 and list(out) == [30.0, 40.0, 50.0]
+
+
+def test_ring_window_stats_skip_missing_samples():
+    """窗口统计按时间或个数截取，缺失的采样（None）不计入。"""
+    ring = MetricRing(8)
+    for t, v in enumerate([5.0, None, 1.0, 9.0, 3.0]):
+        ring.append(float(t), v)
+    assert ring.latest() == 3.0
+    w = ring.window(seconds=2.0)  # t=2..4
+    assert (w.count, w.min, w.max, w.avg) == (3, 1.0, 9.0, 13.0 / 3)
+    assert ring.window(n=4).count == 3
+    empty = MetricRing(2).window(seconds=10)
+    assert empty.count == 0 and math.isnan(empty.avg)
+
+
+class _FixedSampler:
+    def __init__(self) -> None:
+        self.cpu = 0.0
+
+    def sample(self) -> SystemStats:
+        self.cpu += 10.0
+        return SystemStats(
+            cpu_percent=self.cpu, cpu_temp_c=None, mem_percent=50.0, disk_percent=1.0
+        )
+
+
+def test_collector_records_all_metrics():
+    """sample_once() 写入全部指标；第一次采样没有网络速率。"""
+    now = [0.0]
+    collector = MetricsCollector(_FixedSampler(), capacity=16, clock=lambda: now[0])
+    for _ in range(3):
+        collector.sample_once()
+        now[0] += 1.0
+    assert collector.last("cpu", 3) == [10.0, 20.0, 30.0]
+    assert collector.window("mem", seconds=60).avg == 50.0
+    assert collector.series["temp"].latest() is None
+    assert collector.series["net_rx"].window().count == 2
+
+
+def test_sparkline_draws_latest_sample_at_right_edge():
+    """折线最新的采样在最右列，满量程在顶端、零在底端。"""
+    ring = MetricRing(64)
+    ring.append(0.0, 0.0)
+    ring.append(1.0, 100.0)
+    image = Image.new("1", (32, 16))
+    assert Sparkline(32, 16).draw(image, (0, 0), ring) == 2
+    assert image.getpixel((31, 0)) == 255
+    assert image.getpixel((30, 15)) == 255
+    assert image.getpixel((0, 15)) == 0
+
+
+def test_sparkline_autoscale_ignores_stale_buffer_values():
+    """自动缩放只看本次的采样：上一帧留在缓冲尾部的大值不影响量程。"""
+    sparkline = Sparkline(32, 16, hi=None)
+    busy = MetricRing(64)
+    for t in range(10):
+        busy.append(float(t), 1000.0 * t)
+    sparkline.draw(Image.new("1", (32, 16)), (0, 0), busy)
+    quiet = MetricRing(64)
+    quiet.append(0.0, 0.0)
+    quiet.append(1.0, 10.0)
+    image = Image.new("1", (32, 16))
+    sparkline.draw(image, (0, 0), quiet)
+    assert image.getpixel((31, 0)) == 255  # 10 即满量程
+
+
+def test_sparkline_redraw_does_not_copy_buffers():
+    """重画不切片复制取值缓冲与坐标列表（240 列的切片约 5KB）。"""
+    import tracemalloc
+
+    ring = MetricRing(240)
+    for t in range(240):
+        ring.append(float(t), float(t % 50))
+    image = Image.new("RGB", (240, 80))
+    sparkline = Sparkline(240, 80, hi=None, fill="lime")
+    sparkline.draw(image, (0, 0), ring)
+    tracemalloc.start()
+    try:
+        for _ in range(5):
+            sparkline.draw(image, (0, 0), ring)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 2048
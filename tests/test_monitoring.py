@@ -1,12 +1,22 @@
 """系统状态监控与 OLED 格式化测试。"""
 
+import os
+
+import psutil
 import pytest
 
 from rascode.services.monitoring import (
+    ProcessCpuMeter,
+    PsutilSource,
+    SamplerTtl,
     SystemMonitor,
+    SystemSampler,
     SystemStats,
     format_stats_for_oled,
+    shared_sampler,
+    significant_stats_change,
 )
+from rascode.services.procfs import ProcfsSource
 
 
 def test_format_stats_for_oled_with_temp():
@@ -46,3 +56,133 @@ def test_system_monitor_collect_returns_system_stats():
     assert 0 <= stats.cpu_percent <= 100
     assert 0 <= stats.mem_percent <= 100
     assert 0 <= stats.disk_percent <= 100
+
+
+_REAL_CPU_TIMES = psutil.cpu_times()
+
+
+def _cpu_times(busy: float, idle: float):
+    zeros = dict.fromkeys(_REAL_CPU_TIMES._fields, 0.0)
+    return _REAL_CPU_TIMES._replace(**{**zeros, "user": busy, "idle": idle})
+
+
+def test_sampler_cpu_percent_from_primed_baseline(monkeypatch):
+    """构造时即取得 CPU 基线，第一次采样就是有效的差值；无新节拍时沿用上一次的值。"""
+    ticks = iter([(100.0, 900.0), (130.0, 970.0), (130.0, 970.0)])
+    monkeypatch.setattr(psutil, "cpu_times", lambda: _cpu_times(*next(ticks)))
+    now = [0.0]
+    sampler = SystemSampler(
+        ttl=SamplerTtl(cpu_s=1.0), clock=lambda: now[0], source=PsutilSource()
+    )
+    assert sampler.sample().cpu_percent == 30.0
+    now[0] = 5.0
+    assert sampler.sample().cpu_percent == 30.0
+
+
+class _CountingSource(PsutilSource):
+    def __init__(self) -> None:
+        self.calls = {"mem": 0, "disk": 0}
+
+    def cpu_busy_total(self) -> tuple[float, float]:
+        return 0.0, 1.0  # 固定读数：CPU 过期重读也得到相同的值
+
+    def cpu_temp_c(self):
+        return None
+
+    def mem_percent(self) -> float:
+        self.calls["mem"] += 1
+        return 50.0
+
+    def disk_percent(self, path: str) -> float:
+        self.calls["disk"] += 1
+        return 10.0
+
+
+def test_sampler_caches_each_metric_by_ttl():
+    """TTL 内返回缓存值，各指标按自己的 TTL 过期。"""
+    source = _CountingSource()
+    now = [0.0]
+    sampler = SystemSampler(
+        ttl=SamplerTtl(mem_s=2.0, disk_s=30.0), clock=lambda: now[0], source=source
+    )
+    first = sampler.sample()
+    now[0] = 1.0
+    assert sampler.sample() == first
+    now[0] = 2.5
+    sampler.sample()
+    assert source.calls == {"mem": 2, "disk": 1}
+
+
+def test_shared_sampler_is_process_wide():
+    """SystemMonitor 与 shared_sampler() 共用同一个采样器。"""
+    assert shared_sampler() is shared_sampler("/")
+    ttl = SamplerTtl(disk_s=60.0)
+    assert shared_sampler(ttl=ttl).ttl == ttl
+    shared_sampler(ttl=SamplerTtl())
+    assert isinstance(SystemMonitor().collect(), SystemStats)
+
+
+_STAT = "cpu  {busy} 0 0 {idle} 0 0 0 0 0 0\ncpu0 1 2 3 4 5 6 7 8 9 10\nintr 1\n"
+_MEMINFO = "MemTotal:        1000 kB\nMemFree:          100 kB\nMemAvailable:     250 kB\n"
+
+
+def test_procfs_source_rereads_pinned_files(tmp_path):
+    """常开的描述符每次从头重新读取，文件内容更新后读到的是新值。"""
+    stat, meminfo, temp = tmp_path / "stat", tmp_path / "meminfo", tmp_path / "temp"
+    stat.write_text(_STAT.format(busy=100, idle=300))
+    meminfo.write_text(_MEMINFO)
+    temp.write_text("48250\n")
+    source = ProcfsSource(stat, meminfo, [tmp_path / "missing", temp])
+    try:
+        assert len(source.pinned) == 3
+        tck = os.sysconf("SC_CLK_TCK")
+        assert source.cpu_busy_total() == (100 / tck, 400 / tck)
+        assert source.mem_percent() == 75.0
+        assert source.cpu_temp_c() == 48.25
+        stat.write_text(_STAT.format(busy=150, idle=350))
+        assert source.cpu_busy_total() == (150 / tck, 500 / tck)
+    finally:
+        source.close()
+
+
+def test_procfs_source_falls_back_to_psutil(tmp_path):
+    """文件不存在或格式不符时对应指标退回 psutil。"""
+    bad = tmp_path / "stat"
+    bad.write_text("garbage\n")
+    source = ProcfsSource(bad, tmp_path / "none", [tmp_path / "none"])
+    assert source.pinned == (str(bad),)
+    assert source.cpu_busy_total()[1] > 0
+    assert 0 <= source.mem_percent() <= 100
+    source.close()
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/stat"), reason="需要 Linux /proc")
+def test_procfs_source_matches_psutil():
+    """真实 /proc 上与 psutil 的口径一致。"""
+    procfs, ps = ProcfsSource(), PsutilSource()
+    busy, total = procfs.cpu_busy_total()
+    ps_busy, ps_total = ps.cpu_busy_total()
+    assert abs(total - ps_total) < 1.0 and abs(busy - ps_busy) < 1.0
+    assert abs(procfs.mem_percent() - ps.mem_percent()) < 1.0
+    procfs.close()
+
+
+def test_significant_stats_change_thresholds():
+    base = SystemStats(cpu_percent=20.0, cpu_temp_c=50.0, mem_percent=40.0, disk_percent=60.0)
+    assert significant_stats_change(None, base)
+    assert not significant_stats_change(base, SystemStats(24.0, 51.0, 42.0, 60.4))
+    assert significant_stats_change(base, SystemStats(35.0, 50.0, 40.0, 60.0))
+    assert significant_stats_change(base, SystemStats(20.0, None, 40.0, 60.0))
+
+
+def test_process_cpu_meter_measures_own_cpu():
+    """忙等一段 CPU 时间后，按假时钟计算的占用与消耗的 CPU 时间一致。"""
+    now = [0.0]
+    meter = ProcessCpuMeter(clock=lambda: now[0])
+    start = os.times()
+    while (os.times().user + os.times().system) - (start.user + start.system) < 0.05:
+        pass
+    now[0] = 1.0
+    assert 4.0 <= meter.sample() <= 50.0
+    now[0] = 2.0
+    assert meter.sample() < 4.0
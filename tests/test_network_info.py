@@ -1,13 +1,21 @@
 """网络信息与时间格式化测试。"""
 
+import socket
+import time
 from datetime import datetime
 
-import pytest
+import psutil
 
 from rascode.services.network_info import (
+    InterfaceRates,
+    InterfaceRateTracker,
     NetworkInfo,
+    collect_network_info,
+    format_rates_for_oled,
     format_time_network_for_oled,
+    significant_rates_change,
 )
+from rascode.services.network_watch import NetworkWatcher
 
 
 def test_format_time_network_for_oled_structure():
@@ -27,3 +35,183 @@ def test_format_time_network_for_oled_no_ip():
     lines = format_time_network_for_oled(net)
     assert any("N/A" in line for line in lines)
     assert any("IP" in line for line in lines)
+
+
+def test_collect_network_info_enumerates_once(monkeypatch):
+    """每次采集只枚举一次地址与状态（不再有第二遍兜底枚举）。"""
+    calls = {"addrs": 0, "stats": 0}
+    real_addrs, real_stats = psutil.net_if_addrs, psutil.net_if_stats
+
+    def addrs():
+        calls["addrs"] += 1
+        return real_addrs()
+
+    def stats():
+        calls["stats"] += 1
+        return real_stats()
+
+    monkeypatch.setattr(psutil, "net_if_addrs", addrs)
+    monkeypatch.setattr(psutil, "net_if_stats", stats)
+    collect_network_info()
+    assert calls == {"addrs": 1, "stats": 1}
+
+
+_UP = NetworkInfo(ip_address="10.0.0.2", is_up=True, active_interface="eth0")
+_DOWN = NetworkInfo(ip_address=None, is_up=False, active_interface=None)
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_watcher_version_changes_only_with_network():
+    """version 只在 NetworkInfo 真正变化时增加。"""
+    current = [_UP]
+    watcher = NetworkWatcher(collect=lambda: current[0], use_netlink=False)
+    assert watcher.refresh() is False and watcher.version == 0
+    current[0] = _DOWN
+    assert watcher.refresh() is True
+    assert watcher.version == 1 and watcher.info() == _DOWN
+
+
+def test_watcher_refreshes_on_netlink_message():
+    """套接字上一有消息就刷新（这里用 socketpair 代替 rtnetlink 套接字）。"""
+    current = [_UP]
+    watcher = NetworkWatcher(poll_interval_s=30.0, collect=lambda: current[0], use_netlink=False)
+    events, sender = socket.socketpair()
+    events.setblocking(False)
+    watcher._sock = events
+    watcher.start()
+    try:
+        current[0] = _DOWN
+        sender.send(b"RTM_DELADDR")
+        assert _wait_for(lambda: watcher.version == 1)
+        assert watcher.info() == _DOWN
+    finally:
+        watcher.stop()
+        sender.close()
+
+
+def test_watcher_polls_without_netlink():
+    """无法使用 netlink 时按周期轮询。"""
+    current = [_UP]
+    watcher = NetworkWatcher(poll_interval_s=0.02, collect=lambda: current[0], use_netlink=False)
+    watcher.start()
+    try:
+        assert not watcher.event_driven
+        current[0] = _DOWN
+        assert _wait_for(lambda: watcher.version == 1)
+    finally:
+        watcher.stop()
+
+
+_NET_DEV = """Inter-|   Receive                            |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets
+    lo: {lo} 10 0 0 0 0 0 0 {lo} 10 0 0 0 0 0 0
+  eth0: {rx} {rxp} 0 0 0 0 0 0 {tx} {txp} 0 0 0 0 0 0
+"""
+
+
+def _write_net_dev(path, rx, tx, rxp=0, txp=0, lo=0):
+    path.write_text(_NET_DEV.format(rx=rx, tx=tx, rxp=rxp, txp=txp, lo=lo))
+
+
+def test_rate_tracker_per_interface_rates(tmp_path):
+    """按接口计算字节/包速率；第一次采样只建立基线，回环接口默认不统计。"""
+    dev = tmp_path / "net_dev"
+    now = [0.0]
+    _write_net_dev(dev, rx=1000, tx=500, rxp=10, txp=5)
+    tracker = InterfaceRateTracker(clock=lambda: now[0], net_dev=dev)
+    assert tracker.sample() == {}
+    now[0] = 2.0
+    _write_net_dev(dev, rx=5000, tx=900, rxp=30, txp=9, lo=99999)
+    rates = tracker.sample()
+    assert rates == {"eth0": InterfaceRates("eth0", 2000.0, 200.0, 10.0, 2.0)}
+    tracker.close()
+
+
+def test_rate_tracker_handles_wraparound_and_reset(tmp_path):
+    """32 位计数回绕按回绕计算；其余计数变小视为接口重建，从 0 起算。"""
+    dev = tmp_path / "net_dev"
+    now = [0.0]
+    _write_net_dev(dev, rx=2**32 - 100, tx=10_000_000_000)
+    tracker = InterfaceRateTracker(clock=lambda: now[0], net_dev=dev)
+    tracker.sample()
+    now[0] = 1.0
+    _write_net_dev(dev, rx=50, tx=300)
+    rates = tracker.sample()["eth0"]
+    assert rates.rx_bytes_s == 150.0
+    assert rates.tx_bytes_s == 300.0
+    tracker.close()
+
+
+def _write_ifaces(path, counters):
+    """按 {接口: (rx 字节, tx 字节)} 写出 /proc/net/dev 格式的文件。"""
+    lines = _NET_DEV.splitlines()[:2]
+    for name, (rx, tx) in counters.items():
+        lines.append(f"  {name}: {rx} 0 0 0 0 0 0 0 {tx} 0 0 0 0 0 0 0")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_rate_tracker_rebaselines_reappearing_interface(tmp_path):
+    """接口消失一次后以小计数重新出现：先重新建立基线，不把整笔新计数算作一秒的流量。"""
+    dev = tmp_path / "net_dev"
+    now = [0.0]
+    _write_ifaces(dev, {"eth0": (1000, 0), "wg0": (5_000_000_000, 0)})
+    tracker = InterfaceRateTracker(clock=lambda: now[0], net_dev=dev)
+    tracker.sample()
+    now[0] = 1.0
+    _write_ifaces(dev, {"eth0": (2000, 0)})
+    assert set(tracker.sample()) == {"eth0"}
+    now[0] = 2.0
+    _write_ifaces(dev, {"eth0": (3000, 0), "wg0": (100_000, 0)})
+    assert set(tracker.sample()) == {"eth0"}  # wg0 只建立基线
+    now[0] = 3.0
+    _write_ifaces(dev, {"eth0": (4000, 0), "wg0": (150_000, 0)})
+    assert tracker.sample()["wg0"].rx_bytes_s == 50_000.0
+    tracker.close()
+
+
+def test_rate_tracker_forgets_removed_interfaces(tmp_path):
+    """短暂存在的 veth 接口删除后不留下基线，跟踪表不随接口增删增长。"""
+    dev = tmp_path / "net_dev"
+    now = [0.0]
+    _write_ifaces(dev, {"eth0": (0, 0)})
+    tracker = InterfaceRateTracker(clock=lambda: now[0], net_dev=dev)
+    tracker.sample()
+    for i in range(3):
+        now[0] += 1.0
+        _write_ifaces(dev, {"eth0": (0, 0), f"veth{i}": (10, 10)})
+        tracker.sample()
+        now[0] += 1.0
+        _write_ifaces(dev, {"eth0": (0, 0)})
+        tracker.sample()
+    assert set(tracker._prev) == {"eth0"}
+    tracker.close()
+
+
+def test_format_rates_for_oled_fits_width():
+    """按总流量降序，每行不超过 16 个字符。"""
+    rates = {
+        "wlan0": InterfaceRates("wlan0", 1_234_567.0, 45_000.0, 900.0, 80.0),
+        "eth0": InterfaceRates("eth0", 999.0, 12.0, 3.0, 1.0),
+    }
+    lines = format_rates_for_oled(rates)
+    assert lines[0].startswith("wlan0") and "1.2M" in lines[0] and "45k" in lines[0]
+    assert lines[1].startswith("eth0") and "999" in lines[1]
+    assert all(len(line) <= 16 for line in lines)
+    assert "900" in format_rates_for_oled(rates, packets=True)[0]
+
+
+def test_significant_rates_change_ignores_idle_jitter():
+    def rates(rx: float) -> dict[str, InterfaceRates]:
+        return {"eth0": InterfaceRates("eth0", rx, 0.0, 0.0, 0.0)}
+
+    assert significant_rates_change(None, rates(0.0))
+    assert not significant_rates_change(rates(300.0), rates(2_000.0))
+    assert not significant_rates_change(rates(1e6), rates(1.1e6))
+    assert significant_rates_change(rates(1_000.0), rates(500_000.0))
+    assert significant_rates_change(rates(0.0), {})
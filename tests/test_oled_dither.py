@@ -0,0 +1,51 @@
+"""OLED 图像显示与抖动测试。"""
+
+import pytest
+from PIL import Image
+
+from rascode.hardware.display.dither import dither, dither_cache_stats, dither_cached
+
+
+def _gradient(w=256, h=128):
+    img = Image.new("L", (w, h))
+    img.putdata([x * 255 // (w - 1) for _ in range(h) for x in range(w)])
+    return img
+
+
+@pytest.mark.parametrize("method", ["threshold", "bayer", "floyd-steinberg"])
+def test_dither_output_is_1bpp_screen_size(method):
+    pytest.importorskip("numpy")
+    out = dither(_gradient(), (128, 64), method)
+    assert out.mode == "1" and out.size == (128, 64)
+    lit = sum(1 for v in out.tobytes() for b in range(8) if v >> b & 1)
+    if method == "threshold":
+        assert 0.45 < lit / (128 * 64) < 0.55
+    else:
+        # 抖动后的亮点密度约等于平均灰度（约一半）
+        assert 0.4 < lit / (128 * 64) < 0.6
+
+
+def test_bayer_is_ordered_pattern():
+    """均匀 50% 灰度经 Bayer 抖动后呈规则棋盘状，亮点正好一半。"""
+    pytest.importorskip("numpy")
+    out = dither(Image.new("L", (128, 64), 128), (128, 64), "bayer")
+    assert out.getpixel((0, 0)) != out.getpixel((1, 0))
+    assert sum(1 for y in range(64) for x in range(128) if out.getpixel((x, y))) == 4096
+
+
+def test_dither_cached_hits_for_same_source():
+    icon = _gradient(32, 32)
+    first = dither_cached(icon, (128, 64), "floyd-steinberg")
+    before = dither_cache_stats()
+    second = dither_cached(icon.copy(), (128, 64), "floyd-steinberg")
+    assert second is first
+    assert dither_cache_stats().hits == before.hits + 1
+
+
+def test_show_image_on_oled(fake_oled):
+    from rascode.hardware.display import OledDisplayId
+
+    oled, serials = fake_oled
+    oled.show_image((OledDisplayId.LEFT, _gradient()))
+    assert serials[OledDisplayId.LEFT].data_bytes > 0
+    assert oled.transfer_stats(OledDisplayId.LEFT).frames_sent >= 2
@@ -0,0 +1,60 @@
+"""OLED 页级增量刷新测试。"""
+
+from PIL import Image, ImageDraw
+
+from rascode.hardware.display.framebuffer import pack_pages, page_segments
+
+
+def test_pack_pages_matches_ssd1306_layout():
+    """页格式：第 p 页第 x 列字节的第 k 位对应像素 (x, 8p + k)。"""
+    img = Image.new("1", (128, 64))
+    img.putpixel((3, 0), 1)
+    img.putpixel((3, 9), 1)
+    img.putpixel((127, 63), 1)
+    packed = pack_pages(img)
+    assert len(packed) == 1024
+    assert packed[3] == 0x01
+    assert packed[128 + 3] == 0x02
+    assert packed[7 * 128 + 127] == 0x80
+    assert sum(1 for b in packed if b) == 3
+
+
+def test_page_segments_merges_close_columns():
+    old = bytes(256)
+    new = bytearray(old)
+    new[10] = new[12] = 1  # 第 0 页相近两列 → 一段
+    new[128 + 100] = 1  # 第 1 页
+    new[128 + 0] = 1  # 第 1 页远处 → 另一段
+    assert page_segments(old, bytes(new), 128, merge_gap=6) == [
+        (0, 10, 13),
+        (1, 0, 1),
+        (1, 100, 101),
+    ]
+
+
+def test_oled_writes_only_changed_segment(fake_oled):
+    """只改时间行时，写入字节数远小于整帧 1024 字节。"""
+    from rascode.hardware.display import OledDisplayId
+
+    oled, serials = fake_oled
+    oled.show_lines(OledDisplayId.RIGHT, ["TIME 12:00:00", "IP   10.0.0.2"])
+    serials[OledDisplayId.RIGHT].reset()
+    oled.show_lines(OledDisplayId.RIGHT, ["TIME 12:00:01", "IP   10.0.0.2"])
+    stats = oled.transfer_stats(OledDisplayId.RIGHT)
+    assert 0 < stats.last_bytes_sent < 64
+    assert stats.last_bytes_saved > 900
+    assert serials[OledDisplayId.RIGHT].data_bytes < 64
+
+
+def test_oled_delta_reproduces_full_frame(fake_oled):
+    """增量写入后的影子缓冲与整帧打包一致。"""
+    from rascode.hardware.display import OledDisplayId
+
+    oled, _ = fake_oled
+    oled.show_lines(OledDisplayId.LEFT, ["CPU:  1.0%", "MEM: 10.0%"])
+    oled.show_lines(OledDisplayId.LEFT, ["CPU: 99.0%", "MEM: 10.0%", "DSK: 50.0%"])
+    expected = Image.new("1", (128, 64))
+    draw = ImageDraw.Draw(expected)
+    for i, line in enumerate(["CPU: 99.0%", "MEM: 10.0%", "DSK: 50.0%"]):
+        draw.text((0, i * 10), line, fill=255)
+    assert oled._shadows[OledDisplayId.LEFT] == pack_pages(expected)
@@ -0,0 +1,244 @@
+"""多周期仪表盘调度器测试：对齐墙上时钟、不漂移、按输入变化重画。"""
+
+import pytest
+
+from rascode.services.scheduler import (
+    DashboardScheduler,
+    Screen,
+    Source,
+    next_aligned,
+    quiet_change,
+)
+
+
+class _FakeClock:
+    """墙上时钟；wait() 推进时间并额外加上唤醒延迟，模拟定时器抖动。"""
+
+    def __init__(self, start: float, wake_latency: float = 0.003) -> None:
+        self.now = start
+        self.wake_latency = wake_latency
+
+    def __call__(self) -> float:
+        return self.now
+
+    def wait(self, seconds: float) -> bool:
+        self.now += seconds + self.wake_latency
+        return False
+
+
+def _run_ticks(scheduler: DashboardScheduler, clock: _FakeClock, until: float) -> None:
+    def wait(seconds: float) -> bool:
+        clock.wait(seconds)
+        return clock.now >= until
+
+    scheduler.run(wait)
+
+
+def test_next_aligned():
+    assert next_aligned(10.2, 1.0) == 11.0
+    assert next_aligned(11.0, 1.0) == 12.0
+    assert next_aligned(61.0, 30.0) == 90.0
+    assert next_aligned(10.2, 1.0, offset_s=0.5) == 10.5
+
+
+def test_ticks_align_to_wall_clock_without_drift():
+    """每轮处理耗时 0.3s，节拍仍落在每个整秒，60 秒内不跳秒也不漂移。"""
+    clock = _FakeClock(start=1000.4)
+    seen: list[float] = []
+
+    def read_time() -> float:
+        seen.append(clock.now)
+        clock.now += 0.3  # 模拟采集与渲染耗时
+        return seen[-1]
+
+    scheduler = DashboardScheduler([Source("time", 1.0, read_time)], [], clock=clock)
+    _run_ticks(scheduler, clock, until=1060.5)
+    seconds = [int(t) for t in seen[1:]]
+    assert seconds == list(range(1001, 1061))
+    assert all(t - int(t) < 0.01 for t in seen[1:])
+
+
+def test_early_wake_runs_each_tick_once():
+    """定时器每次提前 1ms 醒来（落在容差内）：每个整秒只运行一次，不会在 x.999 与 x+1 重复。"""
+    clock = _FakeClock(start=100.5, wake_latency=-0.001)
+    seen: list[float] = []
+    waits = []
+    source = Source("time", 1.0, lambda: seen.append(clock.now))
+    scheduler = DashboardScheduler([source], [], clock=clock)
+
+    def wait(seconds: float) -> bool:
+        waits.append(seconds)
+        clock.wait(seconds)
+        return clock.now >= 130.5 or len(waits) > 100  # 上限：退化时不会原地空转
+
+    scheduler.run(wait)
+    assert [round(t) for t in seen[1:]] == list(range(101, 131))
+
+
+def test_sources_run_on_their_own_periods():
+    """慢速数据源按自己的周期运行，并对齐到周期的整数倍。"""
+    clock = _FakeClock(start=0.5, wake_latency=0.0)
+    calls = {"fast": [], "disk": []}
+    sources = [
+        Source("fast", 1.0, lambda: calls["fast"].append(clock.now)),
+        Source("disk", 30.0, lambda: calls["disk"].append(clock.now)),
+    ]
+    _run_ticks(DashboardScheduler(sources, [], clock=clock), clock, until=90.5)
+    assert len(calls["fast"]) == 91
+    assert calls["disk"] == [0.5, 30.0, 60.0, 90.0]
+
+
+def test_screens_redraw_only_when_inputs_change():
+    """屏幕只在依赖的数据源变化时重画；有重画的轮次才提交一次。"""
+    values = {"time": 0, "disk": 42}
+    draws: list[str] = []
+    commits: list[int] = []
+    scheduler = DashboardScheduler(
+        [
+            Source("time", 1.0, lambda: values["time"]),
+            Source("disk", 1.0, lambda: values["disk"]),
+        ],
+        [
+            Screen("clock", ("time",), lambda v: draws.append(f"clock={v['time']}")),
+            Screen("disk", ("disk",), lambda v: draws.append(f"disk={v['disk']}")),
+        ],
+        commit=lambda: commits.append(1),
+    )
+    assert scheduler.tick(0.0) == ["clock", "disk"]
+    assert scheduler.tick(1.0) == []
+    values["time"] = 1
+    assert scheduler.tick(2.0) == ["clock"]
+    assert draws == ["clock=0", "disk=42", "clock=1"]
+    assert len(commits) == 2
+    assert scheduler.version("disk") == 1
+
+
+def test_failing_source_keeps_previous_value():
+    """数据源抛异常时沿用上一次的值，调度继续。"""
+    results = iter([1, RuntimeError("boom"), 3])
+
+    def read():
+        r = next(results)
+        if isinstance(r, Exception):
+            raise r
+        return r
+
+    scheduler = DashboardScheduler([Source("x", 1.0, read)], [])
+    scheduler.tick(0.0)
+    scheduler.tick(1.0)
+    assert scheduler.values() == {"x": 1}
+    scheduler.tick(2.0)
+    assert scheduler.values() == {"x": 3}
+
+
+def test_unknown_screen_input_is_rejected():
+    with pytest.raises(ValueError):
+        DashboardScheduler([], [Screen("s", ("missing",), lambda v: None)])
+
+
+def _adaptive_scheduler(values, clock, **kwargs):
+    from rascode.services.scheduler import AdaptiveConfig, AdaptiveRefresh
+
+    reads: list[float] = []
+
+    def read_level():
+        reads.append(clock.now)
+        return values["level"]
+
+    refresh = AdaptiveRefresh(AdaptiveConfig(max_scale=8, calm_s=10.0), **kwargs)
+    scheduler = DashboardScheduler(
+        [
+            Source("time", 1.0, lambda: clock.now, significant=quiet_change),
+            Source("level", 1.0, read_level, significant=lambda a, b: abs(a - b) >= 5),
+        ],
+        [],
+        clock=clock,
+        adaptive=refresh,
+    )
+    return scheduler, refresh, reads
+
+
+def test_adaptive_backs_off_when_flat_and_snaps_back():
+    """内容平稳时周期逐级翻倍到上限；显著变化后立即恢复 1 秒周期。"""
+    clock = _FakeClock(start=0.0, wake_latency=0.0)
+    values = {"level": 10}
+    scheduler, refresh, reads = _adaptive_scheduler(values, clock)
+    _run_ticks(scheduler, clock, until=120.0)
+    assert refresh.scale == 8
+    assert scheduler.period("level") == 8.0
+    assert len(reads) < 40  # 全速运行为 121 次
+    values["level"] = 11  # 小幅变化：重画但不唤醒
+    _run_ticks(scheduler, clock, until=140.0)
+    assert refresh.scale == 8
+    values["level"] = 50
+    _run_ticks(scheduler, clock, until=170.0)
+    assert refresh.stats().wakeups == 1
+    assert scheduler.version("level") == 3
+    woke = next(t for t in reads if t > 140.0)
+    assert [t for t in reads if woke < t <= woke + 5] == [woke + k for k in range(1, 6)]
+
+
+def test_clock_source_keeps_ticking_every_second_when_backed_off():
+    """仪表盘的时钟数据源不参与降频：其余数据源放大到 8 倍周期时，秒数仍逐秒更新。"""
+    from rascode.panels import clock_source
+    from rascode.services.scheduler import AdaptiveConfig, AdaptiveRefresh
+
+    clock = _FakeClock(start=0.0, wake_latency=0.0)
+    seen: list[float] = []
+    refresh = AdaptiveRefresh(AdaptiveConfig(max_scale=8, calm_s=10.0))
+    scheduler = DashboardScheduler(
+        [
+            clock_source(lambda: seen.append(clock.now) or clock.now),
+            Source("level", 1.0, lambda: 10),
+        ],
+        [],
+        clock=clock,
+        adaptive=refresh,
+    )
+    _run_ticks(scheduler, clock, until=120.0)
+    assert scheduler.period("level") == 8.0
+    assert scheduler.period("time") == 1.0
+    assert [t for t in seen if t > 100.0] == [float(t) for t in range(101, 120)]
+
+
+def test_external_activity_wakes_and_idle_states_switch():
+    """外部活动（MCP 写屏）恢复全速；空闲超时后依次调暗、关闭，活动后恢复。"""
+    from rascode.services.scheduler import (
+        IDLE_ACTIVE,
+        IDLE_BLANKED,
+        IDLE_DIMMED,
+        AdaptiveConfig,
+        AdaptiveRefresh,
+    )
+
+    pending = {"activity": False}
+
+    def probe() -> bool:
+        hit, pending["activity"] = pending["activity"], False
+        return hit
+
+    states: list[str] = []
+    config = AdaptiveConfig(calm_s=10.0, dim_after_s=60.0, blank_after_s=120.0)
+    refresh = AdaptiveRefresh(config, activity=probe, on_state=states.append)
+    for t in range(0, 130):
+        refresh.observe(float(t), significant=False)
+    assert states == [IDLE_DIMMED, IDLE_BLANKED]
+    assert refresh.scale == 8
+    pending["activity"] = True
+    assert refresh.observe(130.0, significant=False) == 1
+    assert states[-1] == IDLE_ACTIVE
+
+
+def test_activity_probe_sees_touches(tmp_path):
+    import os
+
+    from rascode.utils.activity import ActivityProbe, touch_activity
+
+    marker = tmp_path / "activity"
+    probe = ActivityProbe(marker)
+    assert not probe.poll()
+    touch_activity(marker)
+    assert probe.poll()
+    assert not probe.poll()
+    os.utime(marker, ns=(0, os.stat(marker).st_mtime_ns + 1_000_000))
+    assert probe.poll()
@@ -0,0 +1,49 @@
+"""分阶段耗时直方图与报告测试。"""
+
+import pytest
+
+from rascode.utils.timing import StageHistogram, TimingRegistry, format_summary
+
+
+def test_histogram_percentiles_are_close():
+    hist = StageHistogram()
+    for ms in range(1, 101):
+        hist.add(ms / 1000)
+    assert hist.count == 100
+    assert hist.max == pytest.approx(0.1)
+    assert hist.percentile(0.5) == pytest.approx(0.050, rel=0.2)
+    assert hist.percentile(0.95) == pytest.approx(0.095, rel=0.2)
+    assert hist.percentile(1.0) == pytest.approx(0.1)
+
+
+def test_frame_rate_and_bandwidth_use_recent_frames():
+    now = [0.0]
+    registry = TimingRegistry(clock=lambda: now[0])
+    for i in range(200):
+        now[0] = i * 0.5  # 2 fps
+        registry.record_frame("left", 100)
+    registry.record("left", "transfer", 0.004)
+    summary = registry.summary()["left"]
+    assert summary.frames == 200
+    assert summary.fps == pytest.approx(2.0)
+    assert summary.bytes_per_s == pytest.approx(200.0)
+    assert summary.stages["transfer"].count == 1
+    assert "2.00 fps" in format_summary(registry.summary())
+
+
+def test_displays_record_stages(virtual_backend):
+    from rascode.utils.timing import stage_timings
+
+    backend = virtual_backend
+    backend.show_main_text(["warm"])  # 初始化设备后再清零
+    stage_timings.reset()
+    assert backend.show_main_text(["Hello"]) == "ok"
+    assert backend.show_left_oled(["CPU: 1%"]) == "ok"
+    summary = stage_timings.summary()
+    assert {"render", "diff", "transfer"} <= set(summary["main"].stages)
+    assert summary["main"].frames == 1
+    assert {"render", "diff", "transfer"} <= set(summary["left"].stages)
+    assert {"main", "left"} <= set(summary["backend"].stages)
+    report = backend.timing_report(reset=True)
+    assert "[main]" in report and "p95" in report
+    assert stage_timings.summary() == {}
@@ -0,0 +1,47 @@
+"""MCP 服务启动测试：延迟导入与后台设备预热。"""
+
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+_SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def test_server_import_defers_heavy_modules():
+    code = (
+        "import sys, rascode.mcp.server; "
+        "print(','.join(m for m in ('fastmcp', 'PIL', 'luma', 'psutil') if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": str(_SRC)},
+    )
+    assert out.stdout.strip() == ""
+
+
+def test_warm_up_and_first_call_share_one_init(monkeypatch, tmp_path):
+    from rascode import display_backend
+
+    monkeypatch.setenv("RASCODE_DISPLAY_SOCKET", str(tmp_path / "missing.sock"))
+    monkeypatch.setattr(display_backend, "_displays_initialized", False)
+    monkeypatch.setattr(display_backend, "_oled", object())
+    monkeypatch.setattr(display_backend, "_init_error", None)
+    calls = []
+
+    def fake_init():
+        calls.append(threading.current_thread().name)
+        time.sleep(0.1)
+        display_backend._displays_initialized = True
+        return True
+
+    monkeypatch.setattr(display_backend, "_init_displays_locked", fake_init)
+    thread = display_backend.start_warm_up()
+    time.sleep(0.02)
+    assert display_backend._ensure_displays()  # 首次调用等待预热线程完成
+    thread.join(5)
+    assert calls == ["rascode-display-warmup"]
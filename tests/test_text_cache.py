@@ -0,0 +1,60 @@
+"""行位图缓存测试。"""
+
+import pytest
+from PIL import Image, ImageChops, ImageDraw
+
+from rascode.hardware.display.text import TextRenderer
+from rascode.utils.lru import LruCache
+
+
+def test_lru_cache_evicts_by_byte_budget():
+    """超出字节预算时淘汰最久未用的条目。"""
+    cache = LruCache(max_bytes=10, cost=len)
+    cache.put("a", "xxxx")
+    cache.put("b", "xxxx")
+    assert cache.get("a") == "xxxx"  # a 变为最近使用
+    cache.put("c", "xxxx")
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert stats.evictions == 1 and stats.bytes == 8
+    assert stats.hits == 1 and stats.misses == 1
+
+
+_SAMPLES = [
+    "CPU:  12.5%",
+    "MEM: 55.3% (1.2G/3.8G)",
+    "Hello, World!",
+    "wlan0 UP  rx 12.3KB/s",
+    "Rascode Dashboard",
+    "IP 192.168.1.42",
+    "j,g_y' \"quoted\" [x]{y}",
+    ",./;:!?@#$%^&*-+=|\\~`",
+    "AV WA Ty Yo fi 7,",
+]
+
+
+@pytest.mark.parametrize("text", _SAMPLES)
+@pytest.mark.parametrize("mode, fill", [("1", 255), ("L", 255), ("RGB", "white")])
+def test_cached_lines_match_imagedraw_output(mode, fill, text):
+    """缓存的整行贴到画布上与 ImageDraw.text 直接绘制逐像素一致（含标点与字距调整）。"""
+    renderer = TextRenderer(mode="1" if mode == "1" else "L")
+    expected = Image.new(mode, (240, 40))
+    ImageDraw.Draw(expected).text((0, 10), text, fill=fill)
+    for _ in range(2):  # 第二次命中缓存
+        actual = Image.new(mode, (240, 40))
+        renderer.draw_lines(actual, ["", text], line_height=10, fill=fill)
+        assert ImageChops.difference(expected, actual).getbbox() is None
+    assert renderer.stats().hits == 1
+
+
+def test_repeated_lines_hit_cache(fake_oled):
+    """相同文本第二次渲染命中缓存，不再栅格化。"""
+    from rascode.hardware.display import OledDisplayId
+
+    oled, _ = fake_oled
+    oled.show_lines(OledDisplayId.LEFT, ["CPU:  1.0%", "MEM: 20.0%"])
+    before = oled.text_cache_stats()
+    oled.show_lines(OledDisplayId.RIGHT, ["CPU:  1.0%", "MEM: 20.0%"])
+    after = oled.text_cache_stats()
+    assert after.hits - before.hits == 2
+    assert after.misses == before.misses
@@ -0,0 +1,85 @@
+"""虚拟显示设备测试：显存模拟与真实帧逐像素一致，并统计总线流量。"""
+
+import pytest
+from PIL import Image
+
+pytest.importorskip("luma.lcd")
+pytest.importorskip("luma.oled")
+
+
+@pytest.fixture
+def virtual_lcd():
+    from rascode.hardware.display.virtual import VirtualLcdDisplay
+
+    lcd = VirtualLcdDisplay()
+    lcd.init()
+    lcd.reset_bus_stats()
+    return lcd
+
+
+def test_lcd_framebuffer_matches_partial_updates(virtual_lcd):
+    lcd = virtual_lcd
+    lcd.show_lines(["Rascode", "CPU 12%"])
+    assert lcd.framebuffer().tobytes() == lcd.render_lines(["Rascode", "CPU 12%"]).tobytes()
+    full = lcd.bus_stats()
+    lcd.reset_bus_stats()
+
+    lcd.show_lines(["Rascode", "CPU 13%"])
+    assert lcd.framebuffer().tobytes() == lcd.render_lines(["Rascode", "CPU 13%"]).tobytes()
+    delta = lcd.bus_stats()
+    assert 0 < delta.data_bytes < full.data_bytes
+    assert delta.modeled_s < full.modeled_s
+
+
+def test_lcd_rgb565_framebuffer_is_quantized():
+    pytest.importorskip("numpy")
+    from rascode.hardware.display import LcdConfig
+    from rascode.hardware.display.virtual import VirtualLcdDisplay
+
+    lcd = VirtualLcdDisplay(LcdConfig(rgb565=True))
+    lcd.init()
+    image = Image.radial_gradient("L").resize((240, 320)).convert("RGB")
+    lcd.show_image(image)
+    expected = image.point(lambda v: v & 0xF8)
+    r, g, b = lcd.framebuffer().split()
+    er, _, eb = expected.split()
+    assert r.tobytes() == er.tobytes() and b.tobytes() == eb.tobytes()
+    assert g.tobytes() == image.getchannel("G").point(lambda v: v & 0xFC).tobytes()
+
+
+def test_lcd_console_scroll_shows_newest_lines(virtual_lcd):
+    lcd = virtual_lcd
+    rows = 320 // 14
+    for i in range(rows + 3):
+        lcd.append_line(f"line {i}")
+    band = Image.new("RGB", (240, 14), "black")
+    lcd._text.draw_lines(band, [lcd.console_lines()[0]], 14, fill="white")
+    assert lcd.console_lines()[0] == "line 3"
+    assert lcd.framebuffer().crop((0, 0, 240, 14)).tobytes() == band.tobytes()
+
+
+def test_oled_framebuffers_and_bus_traffic():
+    from rascode.hardware.display import OledDisplayId
+    from rascode.hardware.display.virtual import VirtualDualOledDisplay
+
+    oled = VirtualDualOledDisplay()
+    oled.init()
+    oled.reset_bus_stats()
+    oled.show_lines(OledDisplayId.LEFT, ["CPU: 3%", "MEM: 41%"])
+    expected = oled.render_lines(OledDisplayId.LEFT, ["CPU: 3%", "MEM: 41%"])
+    assert oled.framebuffer(OledDisplayId.LEFT).tobytes() == expected.tobytes()
+    assert oled.framebuffer(OledDisplayId.RIGHT).getbbox() is None
+    left = oled.bus_stats(OledDisplayId.LEFT)
+    assert left.data_bytes > 0 and left.transactions >= 2
+    assert oled.bus_stats(OledDisplayId.RIGHT).total_bytes == 0
+    assert oled.bus_stats().modeled_s == pytest.approx(left.modeled_s)
+
+
+def test_backend_runs_on_virtual_displays(virtual_backend):
+    backend = virtual_backend
+    assert backend.show_main_text(["Hello"]) == "ok"
+    assert backend.restore_dashboard() == "ok"
+    assert backend._lcd.framebuffer().getbbox() is not None
+    from rascode.hardware.display import OledDisplayId
+
+    assert backend._oled.framebuffer(OledDisplayId.LEFT).getbbox() is not None